@@ -0,0 +1,375 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+from sqlmodel import Session, create_engine
+from wakfu_items_api.database import load_items
+from wakfu_items_api.profiling import IngestProfile
+from wakfu_items_api.request.bill_of_materials import bill_of_materials
+from wakfu_items_api.request.build_optimizer import BuildOptimizer
+from wakfu_items_api.request.item_catalog import ItemCatalog
+from wakfu_items_api.request.item_document import item_document
+from wakfu_items_api.request.items_by_name import items_by_name
+from wakfu_items_api.request.stat_matrix import STAT_MATRIX_FILENAME, StatMatrix
+from wakfu_items_api.snapshot import SNAPSHOT_FILENAME, Snapshot
+from wakfu_items_api.synthetic import ACTIONS, ITEM_TYPES, SyntheticData
+from scripts.generate_database import ITEMS_CATEGORIES, generate_database
+
+VERSION = "0.0.0"
+"""Version of the synthetic files."""
+
+RESULTS_DIRECTORY = ".benchmarks"
+"""Default directory where the results are saved, one file per commit."""
+
+THRESHOLD = 0.1
+"""Relative change from which a comparison is reported as slower or faster."""
+
+
+def measure(function: Callable[[], Any], repeat: int) -> list[float]:
+    """
+    Runs a function `repeat` times after a warm-up run (mapper configuration,
+    caches...), and returns the duration of each timed run.
+    """
+    function()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def benchmark_transforms(
+    payloads: dict[str, list], repeat: int
+) -> dict[str, list[float]]:
+    """Converts every element of each category through the models and into rows."""
+    results = {}
+    for category, cls in ITEMS_CATEGORIES.items():
+        elements = payloads[category]
+        results[f"from_wakfu_api/{category}"] = measure(
+            lambda cls=cls, elements=elements: [
+                cls.from_wakfu_api(element) for element in elements
+            ],
+            repeat,
+        )
+        results[f"rows_from_wakfu_api/{category}"] = measure(
+            lambda cls=cls, elements=elements: [
+                cls.rows_from_wakfu_api(element) for element in elements
+            ],
+            repeat,
+        )
+    return results
+
+
+def benchmark_ingest(
+    input_directory: Path, output_directory: Path, repeat: int, workers: int
+) -> dict[str, list[float]]:
+    """
+    Builds the database from the synthetic files, timing the whole build,
+    each stage (see `IngestProfile`) and how long each stage of the ingest
+    pipeline was busy. The database of the last run is kept.
+    """
+    results = {}
+    for _ in range(repeat):
+        for path in output_directory.glob("database.*"):
+            path.unlink()
+        profile = IngestProfile()
+        start = time.perf_counter()
+        with (
+            contextlib.redirect_stdout(io.StringIO()),
+            contextlib.redirect_stderr(io.StringIO()),
+        ):
+            generate_database(
+                VERSION,
+                str(output_directory),
+                "sqlite:///",
+                input_path=str(input_directory),
+                verbose=False,
+                workers=workers,
+                profile=profile,
+            )
+        results.setdefault("ingest", []).append(time.perf_counter() - start)
+        report = profile.report()
+        for stage, seconds in report["stages"].items():
+            results.setdefault(f"ingest/{stage}", []).append(seconds)
+        for stage, times in report["pipeline"].get("stages", {}).items():
+            results.setdefault(f"ingest/pipeline/{stage}", []).append(times["busy"])
+    return results
+
+
+def benchmark_queries(
+    directory: Path, items: int, repeat: int, seed: int
+) -> dict[str, list[float]]:
+    """Times the common read queries on the database built by `benchmark_ingest`."""
+    rng = random.Random(seed)
+    ids = rng.sample(range(1, items + 1), min(items, 100))
+    engine = create_engine(f"sqlite:///{directory / 'database.db'}")
+    catalog = ItemCatalog.from_database(engine)
+    matrix = StatMatrix.load(directory / STAT_MATRIX_FILENAME)
+    optimizer = BuildOptimizer.from_database(
+        engine, matrix_path=directory / STAT_MATRIX_FILENAME
+    )
+    snapshot = Snapshot(directory / SNAPSHOT_FILENAME)
+    weights = {action: rng.random() for action in rng.sample(range(1, ACTIONS), 5)}
+    item_type_id = rng.randint(1, ITEM_TYPES)
+
+    queries = {
+        "load_items/ids": lambda session: load_items(session, ids=ids),
+        "load_items/item_type": lambda session: load_items(
+            session, item_type_id=item_type_id
+        ),
+        "load_items/level_range": lambda session: load_items(
+            session, level_range=(200, 210), language="en", descriptions=False
+        ),
+        "items_by_name": lambda session: [
+            items_by_name(session, query)
+            for query in ("epee", "cape du bouftou", "anne", "dofus ecarl")
+        ],
+        "bill_of_materials": lambda session: [
+            bill_of_materials(session, id) for id in ids
+        ],
+        "catalog/filter": lambda session: catalog.filter(
+            level=(150, 200), rarity=[4, 5], itemTypeId=3
+        ),
+        "stat_matrix/scores": lambda session: matrix.scores(weights),
+        "build_optimizer/top10": lambda session: optimizer.optimize(
+            weights, level=200, k=10
+        ),
+        "snapshot/items": lambda session: [snapshot.item(id) for id in ids],
+        "item_document/items": lambda session: [
+            item_document(session, id) for id in ids
+        ],
+    }
+    results = {}
+    with Session(engine) as session:
+        for name, query in queries.items():
+            results[name] = measure(lambda query=query: query(session), repeat)
+            session.expunge_all()
+    snapshot.close()
+    engine.dispose()
+    return results
+
+
+def git_commit() -> tuple[str | None, bool]:
+    """Returns the current commit and whether the working tree has changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def run_benchmarks(
+    items: int,
+    equip_effects: tuple[int, int],
+    use_effects: tuple[int, int],
+    repeat: int,
+    workers: int = 1,
+    seed: int = 0,
+    suites: tuple[str, ...] = ("transforms", "ingest", "queries"),
+) -> dict[str, Any]:
+    """
+    Runs the benchmark suites on synthetic data, entirely offline. Returns
+    the metadata of the run and the durations of each benchmark.
+    """
+    commit, dirty = git_commit()
+    parameters = {
+        "items": items,
+        "equip_effects": list(equip_effects),
+        "use_effects": list(use_effects),
+        "repeat": repeat,
+        "workers": workers,
+        "seed": seed,
+    }
+    data = SyntheticData(
+        items=items, equip_effects=equip_effects, use_effects=use_effects, seed=seed
+    )
+    runs = {}
+    with tempfile.TemporaryDirectory() as directory:
+        input_directory = Path(directory) / "data"
+        output_directory = Path(directory) / "database"
+        output_directory.mkdir()
+        data.write(input_directory, VERSION)
+        if "transforms" in suites:
+            runs.update(benchmark_transforms(data.generate(), repeat))
+        if "ingest" in suites or "queries" in suites:
+            runs.update(
+                benchmark_ingest(
+                    input_directory,
+                    output_directory,
+                    repeat if "ingest" in suites else 1,
+                    workers,
+                )
+            )
+        if "queries" in suites:
+            runs.update(benchmark_queries(output_directory, items, repeat, seed))
+
+    return {
+        "metadata": {
+            "commit": commit,
+            "dirty": dirty,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": parameters,
+        },
+        "results": {
+            name: {"median": statistics.median(durations), "runs": durations}
+            for name, durations in runs.items()
+        },
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    """Prints the median of each benchmark next to the one of a baseline."""
+    print(f"{'benchmark':<45} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current["results"].items():
+        median = result["median"]
+        if name not in baseline["results"]:
+            print(f"{name:<45} {'-':>12} {median * 1000:>10.2f}ms")
+            continue
+        reference = baseline["results"][name]["median"]
+        change = median / reference - 1 if reference else 0.0
+        flag = ""
+        if change > THRESHOLD:
+            flag = "  slower"
+        elif change < -THRESHOLD:
+            flag = "  faster"
+        print(
+            f"{name:<45} {reference * 1000:>10.2f}ms {median * 1000:>10.2f}ms "
+            f"{change:>+8.1%}{flag}"
+        )
+
+
+def main() -> None:
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ingest and the requests on synthetic data, offline."
+    )
+    parser.add_argument(
+        "-n",
+        "--items",
+        type=int,
+        default=8000,
+        help="Number of synthetic items. Default is 8000.",
+    )
+    parser.add_argument(
+        "--equip-effects",
+        type=int,
+        nargs=2,
+        default=(0, 10),
+        metavar=("MIN", "MAX"),
+        help="Range of the number of equip effects per item. Default is 0 10.",
+    )
+    parser.add_argument(
+        "--use-effects",
+        type=int,
+        nargs=2,
+        default=(0, 2),
+        metavar=("MIN", "MAX"),
+        help="Range of the number of (critical) use effects per item. Default is 0 2.",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of runs of each benchmark, the median is kept. Default is 3.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes converting elements into rows. Default is 1.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the synthetic data. Default is 0.",
+    )
+    parser.add_argument(
+        "-s",
+        "--suites",
+        nargs="+",
+        choices=["transforms", "ingest", "queries"],
+        default=["transforms", "ingest", "queries"],
+        help="Benchmark suites to run (default: all)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help=(
+            f"File where the results are saved. Default is `{RESULTS_DIRECTORY}/"
+            "<commit>.json`, suffixed with `-dirty` if the working tree has changes."
+        ),
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        type=str,
+        default=None,
+        help="Results file (or commit saved in the results directory) to compare with.",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        items=args.items,
+        equip_effects=tuple(args.equip_effects),
+        use_effects=tuple(args.use_effects),
+        repeat=args.repeat,
+        workers=args.workers,
+        seed=args.seed,
+        suites=tuple(args.suites),
+    )
+    output = args.output
+    if output is None:
+        metadata = results["metadata"]
+        name = metadata["commit"] or metadata["date"].replace(":", "-")
+        if metadata["dirty"]:
+            name += "-dirty"
+        output = Path(RESULTS_DIRECTORY) / f"{name}.json"
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+    print(f"Results saved to {output}")
+
+    if args.compare is None:
+        for name, result in results["results"].items():
+            print(f"{name:<45} {result['median'] * 1000:>10.2f}ms")
+        return
+    baseline_path = Path(args.compare)
+    if not baseline_path.exists():
+        matches = sorted(Path(RESULTS_DIRECTORY).glob(f"{args.compare}*.json"))
+        if not matches:
+            raise SystemExit(f"No results found for {args.compare}.")
+        baseline_path = matches[0]
+    with baseline_path.open("r", encoding="utf-8") as file:
+        compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
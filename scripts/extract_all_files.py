@@ -1,29 +1,103 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from wakfu_items_api.archive import (
+    COMPRESSIONS,
+    DEFAULT_COMPRESSION,
+    ArchiveWriter,
+    archive_path,
+)
+from wakfu_items_api.cache import DEFAULT_CACHE_DIRECTORY, FileCache
 from wakfu_items_api.categories import Categories
-from wakfu_items_api.extract_file import extract_file
-from wakfu_items_api.version import get_current_version
+from wakfu_items_api.extract_file import create_session, extract_file
+from wakfu_items_api.version import (
+    DEFAULT_VERSION_TTL,
+    VersionResolver,
+    get_current_version,
+)
 import json
 import argparse
 
 
-def extract_all_files(output_directory="."):
+MAX_WORKERS = 8
+"""Default number of categories downloaded in parallel."""
+
+
+def extract_all_files(
+    output_directory=".",
+    cache: FileCache | None = None,
+    version: str | None = None,
+    revalidate: bool = False,
+    max_workers: int = MAX_WORKERS,
+    retries: int = 3,
+    archive: bool = False,
+    compression: str = DEFAULT_COMPRESSION,
+):
     """
     Extracts all files from the Wakfu API and saves them to a specified directory.
+    Files already present in the cache are not downloaded again, unless
+    `revalidate` is set and a conditional request reports they changed
+    (see `extract_file`).
+
+    Categories are downloaded by `max_workers` threads sharing a pooled HTTP
+    session, and each file is written as soon as its download completes.
+    With `archive`, the categories are written as compressed members of a
+    single `wakfu_{version}.zip` archive instead, see `ArchiveWriter`. If
+    any category fails, the archive is discarded and `SystemExit` is raised
+    once the others are done.
     """
     categories = [category.value for category in Categories]
-    version = get_current_version()
+    if version is None:
+        version = get_current_version()
 
     os.makedirs(output_directory, exist_ok=True)
+    writer = None
+    if archive:
+        writer = ArchiveWriter(
+            archive_path(output_directory, version), version, compression=compression
+        )
+
+    def extract(category: str) -> str:
+        """Downloads a category and writes it to the output directory."""
+        data = extract_file(
+            category,
+            version=version,
+            cache=cache,
+            revalidate=revalidate,
+            session=session,
+        )
+        if writer is not None:
+            writer.add(category, data)
+            return f"{writer.path}:{category}.json"
+        filename = os.path.join(output_directory, f"{category}_{version}.json")
+        with open(filename, "w", encoding="utf-8") as extracted_file:
+            json.dump(data, extracted_file, ensure_ascii=False, indent=4)
+        return filename
 
-    for category in categories:
-        try:
-            data = extract_file(category)
-            filename = os.path.join(output_directory, f"{category}_{version}.json")
-            with open(filename, "w", encoding="utf-8") as extracted_file:
-                json.dump(data, extracted_file, ensure_ascii=False, indent=4)
-            print(f"Extracted {category} to {filename}")
-        except Exception as e:
-            print(f"Failed to extract {category}: {e}")
+    with (
+        create_session(pool_size=max_workers, retries=retries) as session,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        futures = {
+            executor.submit(extract, category): category for category in categories
+        }
+        failed = []
+        for future in as_completed(futures):
+            category = futures[future]
+            try:
+                print(f"Extracted {category} to {future.result()}")
+            except (Exception, SystemExit) as e:
+                print(f"Failed to extract {category}: {e}")
+                failed.append(category)
+    if failed:
+        if writer is not None:
+            writer.abort()
+        msg = (
+            f"Failed to extract {len(failed)} categories: {', '.join(sorted(failed))}."
+        )
+        raise SystemExit(msg)
+    if writer is not None:
+        writer.close()
+        print(f"Archived {len(writer.members)} categories to {writer.path}")
     print("All files extracted successfully.")
 
 
@@ -41,8 +115,96 @@ def main() -> None:
         default=".",
         help="Directory where the extracted files will be saved. Default is the current directory.",
     )
+    parser.add_argument(
+        "-c",
+        "--cache-directory",
+        type=str,
+        default=DEFAULT_CACHE_DIRECTORY,
+        help=f"Directory where downloaded files are cached. Default is `{DEFAULT_CACHE_DIRECTORY}`.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always download the files from the Wakfu API (default: False)",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        default=False,
+        help=(
+            "Check the cached files with a conditional request, downloading them "
+            "again only if they changed (default: False)"
+        ),
+    )
+    parser.add_argument(
+        "-v",
+        "--version",
+        type=str,
+        default=None,
+        help="Version of the files to be extracted. Default is the current version.",
+    )
+    parser.add_argument(
+        "--version-ttl",
+        type=float,
+        default=DEFAULT_VERSION_TTL,
+        help=f"Seconds during which the cached current version is reused. Default is {DEFAULT_VERSION_TTL}.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="Use the last cached current version instead of fetching it (default: False)",
+    )
+    parser.add_argument(
+        "-j",
+        "--max-workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Number of categories downloaded in parallel. Default is {MAX_WORKERS}.",
+    )
+    parser.add_argument(
+        "-r",
+        "--retries",
+        type=int,
+        default=3,
+        help="Number of retries of a failed download. Default is 3.",
+    )
+    parser.add_argument(
+        "-a",
+        "--archive",
+        action="store_true",
+        default=False,
+        help=(
+            "Write a single compressed archive with a manifest of checksums "
+            "instead of one JSON file per category (default: False)"
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(COMPRESSIONS),
+        default=DEFAULT_COMPRESSION,
+        help=f"Compression of the archive members (default: {DEFAULT_COMPRESSION})",
+    )
     args = parser.parse_args()
-    extract_all_files(output_directory=args.output_directory)
+    if args.revalidate and args.no_cache:
+        parser.error("--revalidate cannot be used with --no-cache.")
+    resolver = VersionResolver(
+        ttl=args.version_ttl,
+        cache_directory=args.cache_directory,
+        pinned=args.version,
+        offline=args.offline,
+    )
+    extract_all_files(
+        output_directory=args.output_directory,
+        cache=None if args.no_cache else FileCache(args.cache_directory),
+        version=resolver.resolve(),
+        revalidate=args.revalidate,
+        max_workers=args.max_workers,
+        retries=args.retries,
+        archive=args.archive,
+        compression=args.compression,
+    )
 
 
 if __name__ == "__main__":
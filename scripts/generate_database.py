@@ -1,10 +1,59 @@
-import json
+import cProfile
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+from wakfu_items_api.archive import Archive, archive_path
+from wakfu_items_api.cache import DEFAULT_CACHE_DIRECTORY, FileCache
 from wakfu_items_api.categories import Categories
-from wakfu_items_api.database import Action, ItemProperty, ItemType, State, Item
-from wakfu_items_api.extract_file import extract_file, get_current_version
+from wakfu_items_api.database import (
+    Action,
+    ItemProperty,
+    ItemType,
+    State,
+    Item,
+    SourceHash,
+    RecipeCategory,
+    Recipe,
+    RecipeIngredient,
+    RecipeResult,
+    Blueprint,
+    JobItem,
+    ResourceType,
+    Resource,
+    CollectibleResource,
+    HarvestLoot,
+)
+from wakfu_items_api.database.crafting import refresh_bill_of_materials
+from wakfu_items_api.database.texts import LANGUAGES, delete_unused_texts
+from wakfu_items_api.database.indexes import create_indexes
+from wakfu_items_api.database.item_documents import (
+    ALL_LANGUAGES,
+    refresh_item_documents,
+)
+from wakfu_items_api.database.item_summary import refresh_item_summary
+from wakfu_items_api.database.rows import (
+    Rows,
+    RowWriter,
+    chunked,
+    delete_elements,
+    transform,
+)
+from wakfu_items_api.extract_file import stream_file, stream_file_chunks
+from wakfu_items_api.pipeline import QUEUE_SIZE, Pipeline
+from wakfu_items_api.profiling import IngestProfile
+from wakfu_items_api.request.items_by_name import create_items_name_index
+from wakfu_items_api.request.stat_matrix import STAT_MATRIX_FILENAME, StatMatrix
+from wakfu_items_api.snapshot import SNAPSHOT_FILENAME, export_snapshot
+from wakfu_items_api.streaming import (
+    iter_file_chunks,
+    iter_json_array,
+    stream_json_file,
+)
+from wakfu_items_api.version import DEFAULT_VERSION_TTL, VersionResolver
 from pathlib import Path
 import argparse
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import SQLModel, create_engine, select
 from tqdm import tqdm
 
 ITEMS_CATEGORIES = {
@@ -14,23 +63,138 @@ ITEMS_CATEGORIES = {
     Categories.itemProperties: ItemProperty,
     Categories.states: State,
     Categories.items: Item,
+    Categories.recipeCategories: RecipeCategory,
+    Categories.recipes: Recipe,
+    Categories.recipeIngredients: RecipeIngredient,
+    Categories.recipeResults: RecipeResult,
+    Categories.blueprints: Blueprint,
+    Categories.jobsItems: JobItem,
+    Categories.resourceTypes: ResourceType,
+    Categories.resources: Resource,
+    Categories.collectibleResources: CollectibleResource,
+    Categories.harvestLoots: HarvestLoot,
 }
 """Order of categories to be extracted. Used to generate tables in the database."""
 
 
-def add_to_db(item, engine, verbose=True) -> None:
-    """Adds an item to the database. If the item already exists, it skips it."""
-    with Session(engine) as session:
-        try:
-            session.add(item)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            if "UNIQUE constraint failed" in str(e.orig):
-                if verbose:
-                    print(f"Duplicate entry for {item}, skipping.")
-            else:
-                raise e
+BATCH_SIZE = 1000
+"""Number of elements written to the database per transaction."""
+
+
+CHUNK_SIZE = 250
+"""
+Number of elements per chunk going through the ingest pipeline, and sent at
+once to a transformation worker.
+"""
+
+
+def iter_rows(cls, elements: Iterable[dict], validate: bool = False) -> Iterator[Rows]:
+    """Converts elements into rows, in order."""
+    for element in elements:
+        yield from transform(cls, [element], validate=validate)
+
+
+def parse_chunks(
+    chunks: Iterable[tuple[str, bytes | None]],
+) -> Iterator[tuple[str, list[dict] | None]]:
+    """
+    Decodes the content of the `ITEMS_CATEGORIES`, received chunk by chunk
+    and in order, into chunks of `CHUNK_SIZE` elements, passing the end of
+    each category (None) through.
+    """
+    chunks = iter(chunks)
+
+    def content() -> Iterator[bytes]:
+        """Yields the chunks of the current category, up to its end."""
+        for _, chunk in chunks:
+            if chunk is None:
+                return
+            yield chunk
+
+    for category in ITEMS_CATEGORIES:
+        body = content()
+        for elements in chunked(iter_json_array(body), CHUNK_SIZE):
+            yield category, elements
+        # Consume what follows the array, up to the end of the category.
+        for _ in body:
+            pass
+        yield category, None
+
+
+def transform_chunks(
+    chunks: Iterable[tuple[str, list[dict] | None]],
+    executor: ProcessPoolExecutor | None = None,
+    in_flight: int = 2,
+    validate: bool = False,
+) -> Iterator[tuple[str, list[Rows] | None]]:
+    """
+    Converts chunks of elements of the `ITEMS_CATEGORIES` into rows, in
+    order, passing the end of each category (None) through. With an
+    executor, chunks are transformed by its worker processes; at most
+    `in_flight` chunks are submitted at once so that memory stays bounded.
+    """
+    if executor is None:
+        for category, chunk in chunks:
+            if chunk is not None:
+                chunk = transform(ITEMS_CATEGORIES[category], chunk, validate)
+            yield category, chunk
+        return
+
+    pending = deque()
+    for category, chunk in chunks:
+        if chunk is not None:
+            chunk = executor.submit(
+                transform, ITEMS_CATEGORIES[category], chunk, validate
+            )
+        pending.append((category, chunk))
+        while pending and (pending[0][1] is None or len(pending) > in_flight):
+            category, future = pending.popleft()
+            yield category, future if future is None else future.result()
+    for category, future in pending:
+        yield category, future if future is None else future.result()
+
+
+def open_archive(input_path: str | None, version: str) -> Archive | None:
+    """
+    Opens the archive the elements are read from: `input_path` itself if it is
+    a file, or the archive of `version` it holds if it is a directory. Returns
+    None if the elements are read from JSON files or from the Wakfu API.
+    """
+    if input_path is None:
+        return None
+    path = Path(input_path)
+    if not path.is_file():
+        path = archive_path(path, version)
+        if not path.is_file():
+            return None
+    archive = Archive(path)
+    if archive.version != version:
+        archive.close()
+        msg = f"{path} holds version {archive.version}, not {version}."
+        raise ValueError(msg)
+    return archive
+
+
+def stream_elements(
+    category: str,
+    version: str,
+    input_path: str | None = None,
+    archive: Archive | None = None,
+    cache: FileCache | None = None,
+    revalidate: bool = False,
+) -> Iterator[dict]:
+    """
+    Yields the elements of a category one at a time, from `archive` if given
+    (see `open_archive`), else from the JSON files extracted in `input_path`,
+    else from the Wakfu API through `cache` (revalidated if `revalidate`).
+    """
+    if archive is not None:
+        return archive.stream(category)
+    if input_path is None:
+        return stream_file(
+            category, version=version, cache=cache, revalidate=revalidate
+        )
+    return stream_json_file(Path(input_path) / f"{category}_{version}.json")
 
 
 def generate_database(
@@ -39,29 +203,299 @@ def generate_database(
     database_url: str,
     input_path: str = None,
     verbose: bool = True,
+    batch_size: int = BATCH_SIZE,
+    cache: FileCache | None = None,
+    revalidate: bool = False,
+    workers: int = 1,
+    validate: bool = False,
+    summary: bool = True,
+    snapshot: bool = True,
+    snapshot_languages: tuple[str, ...] = LANGUAGES,
+    document_languages: tuple[str, ...] = (ALL_LANGUAGES,),
+    profile: IngestProfile | None = None,
+    queue_size: int = QUEUE_SIZE,
 ) -> None:
     """
     Extracts all files from the Wakfu API and saves them to a specified directory.
+    Files already present in the cache are not downloaded again, unless
+    `revalidate` is set and a conditional request reports they changed
+    (see `extract_file`). Elements are
+    streamed one at a time (from the compressed members when `input_path` is
+    an archive, see `open_archive`), so memory does not grow with the size of the files.
+    Reading, transforming and writing run concurrently as the stages of a
+    `Pipeline`: later categories are read while earlier ones are written, in
+    the order of `ITEMS_CATEGORIES`, with at most `queue_size` chunks (of
+    bytes, elements or rows) waiting between two stages. With more than one
+    worker, elements are converted into rows by a process pool and written
+    by this process. Rows are built directly from the raw data unless
+    `validate` is set, in which case they go through the models.
+    The secondary indexes (and the item summary table unless `summary` is
+    False) are built once every table is loaded, along with a materialized
+    document of each item in each of `document_languages` (see
+    `refresh_item_documents`), and the stat matrix of the equip effects (and
+    the binary snapshot of the texts in `snapshot_languages` unless
+    `snapshot` is False) is written next to the database. The writes
+    are timed per category in `profile`, along with how busy each stage of
+    the pipeline was, in total and per category, see `IngestProfile`.
     """
 
     def generate_filepath(category: str) -> str:
         """
         Generates the file path for the extracted file based on the category and version.
         """
-        return Path(output_path) / f"{category}_{version}.json"
+        return f"{category}_{version}.json"
 
     DATABASE_URL = f"{database_url}{Path(output_path) / 'database.db'}"
     engine = create_engine(DATABASE_URL, echo=False)
     SQLModel.metadata.create_all(engine)
+    archive = open_archive(input_path, version)
+
+    def read() -> Iterator[tuple[str, bytes | None]]:
+        """Yields the content of each category chunk by chunk, then its end."""
+        for category in ITEMS_CATEGORIES:
+            if archive is not None:
+                chunks = archive.iter_chunks(category)
+            elif input_path is None:
+                chunks = stream_file_chunks(
+                    category, version=version, cache=cache, revalidate=revalidate
+                )
+            else:
+                chunks = iter_file_chunks(
+                    Path(input_path) / generate_filepath(category)
+                )
+            for chunk in chunks:
+                yield category, chunk
+            yield category, None
+
+    if profile is None:
+        profile = IngestProfile()
+    writer = RowWriter(engine, batch_size=batch_size, profile=profile)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    if executor is not None:
+        # Start the worker processes before the pipeline threads, so that they
+        # are not forked while another thread holds a lock.
+        executor.submit(int).result()
+    pipeline = Pipeline(
+        "read", read(), sink="write", maxsize=queue_size, tag=lambda chunk: chunk[0]
+    )
+    pipeline.then("parse", parse_chunks)
+    pipeline.then(
+        "transform",
+        lambda chunks: transform_chunks(
+            chunks, executor=executor, in_flight=2 * workers, validate=validate
+        ),
+    )
+    try:
+        with pipeline:
+            chunks = iter(pipeline)
+            for category in ITEMS_CATEGORIES:
+                with profile.category(category):
+                    start = time.perf_counter()
+                    elements, duplicates = 0, 0
+                    progress = tqdm(desc=f"Processing {category}")
+                    for _, transformed in chunks:
+                        if transformed is None:
+                            break
+                        with profile.stage("write"):
+                            for element in transformed:
+                                if writer.add(element):
+                                    elements += 1
+                                    continue
+                                duplicates += 1
+                                if verbose:
+                                    print(
+                                        f"Duplicate entry for {category} element, skipping."
+                                    )
+                        progress.update(len(transformed))
+                    with profile.stage("write"):
+                        writer.flush()
+                    progress.close()
+                    profile.count("elements", elements)
+                    profile.count("duplicates", duplicates)
+
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{category}: {elements} elements in {elapsed:.2f}s "
+                    f"({elements / elapsed if elapsed else 0:.0f} elements/s), "
+                    f"{duplicates} duplicates skipped."
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    profile.record_pipeline(pipeline.report())
+    print(pipeline.summary())
+    if archive is not None:
+        archive.close()
+
+    with profile.stage("indexes"):
+        build_indexes(engine, summary=summary)
+    if document_languages:
+        with profile.stage("documents"), engine.begin() as connection:
+            refresh_item_documents(connection, document_languages)
+    with profile.stage("stat_matrix"):
+        build_stat_matrix(engine, output_path)
+    if snapshot:
+        with profile.stage("snapshot"):
+            export_snapshot(
+                engine,
+                Path(output_path) / SNAPSHOT_FILENAME,
+                version,
+                languages=snapshot_languages,
+            )
 
+
+def build_indexes(engine, summary: bool = True) -> None:
+    """
+    Builds the secondary indexes, the item summary, the crafting bill of
+    materials and the indexes used by the requests once the tables are loaded.
+    """
+    with engine.begin() as connection:
+        if summary:
+            refresh_item_summary(connection)
+        refresh_bill_of_materials(connection)
+        create_indexes(connection)
+        if engine.dialect.name == "sqlite":
+            create_items_name_index(connection)
+
+
+def build_stat_matrix(engine, output_path: str) -> None:
+    """Writes the stat matrix of the equip effects next to the database."""
+    StatMatrix.from_database(engine).save(Path(output_path) / STAT_MATRIX_FILENAME)
+
+
+def update_database(
+    version: str,
+    output_path: str,
+    database_url: str,
+    input_path: str = None,
+    verbose: bool = True,
+    batch_size: int = BATCH_SIZE,
+    cache: FileCache | None = None,
+    revalidate: bool = False,
+    summary: bool = True,
+    snapshot: bool = True,
+    snapshot_languages: tuple[str, ...] = LANGUAGES,
+    document_languages: tuple[str, ...] = (ALL_LANGUAGES,),
+    profile: IngestProfile | None = None,
+) -> None:
+    """
+    Updates an existing database to another version. Each element is compared
+    to the hash of the element it was built from, and only new, changed and
+    removed elements are written. Prints a summary of the changes per table.
+    The documents of the items written or removed are refreshed (those in
+    languages no longer in `document_languages` are deleted), and the derived
+    files written next to the database are rebuilt. The files are read as
+    by `generate_database`. Each stage is timed per category in `profile`,
+    see `IngestProfile`.
+    """
+
+    DATABASE_URL = f"{database_url}{Path(output_path) / 'database.db'}"
+    engine = create_engine(DATABASE_URL, echo=False)
+    SQLModel.metadata.create_all(engine)
+    archive = open_archive(input_path, version)
+
+    classes = {cls.__tablename__: cls for cls in ITEMS_CATEGORIES.values()}
+    with engine.connect() as connection:
+        existing_ids = {
+            name: set(connection.scalars(select(cls.id)))
+            for name, cls in classes.items()
+        }
+        stored_hashes = defaultdict(dict)
+        for name, element_id, element_hash in connection.execute(
+            select(SourceHash.tablename, SourceHash.element_id, SourceHash.hash)
+        ):
+            stored_hashes[name][element_id] = element_hash
+
+    if profile is None:
+        profile = IngestProfile()
+    writer = RowWriter(engine, batch_size=batch_size, profile=profile)
+    seen_ids = defaultdict(set)
+    written_ids = defaultdict(set)
+    changes = defaultdict(Counter)
     for category, cls in ITEMS_CATEGORIES.items():
-        if input_path is None:
-            data = extract_file(category)
-        else:
-            with (Path(input_path) / generate_filepath(category)).open("r") as file:
-                data = json.load(file)
-        for element in tqdm(data, desc=f"Processing {category}"):
-            add_to_db(cls.from_wakfu_api(element), engine, verbose=verbose)
+        with profile.category(category):
+            data = profile.timed(
+                "read",
+                stream_elements(
+                    category,
+                    version,
+                    input_path,
+                    archive=archive,
+                    cache=cache,
+                    revalidate=revalidate,
+                ),
+            )
+
+            name = cls.__tablename__
+            pending = []
+            for rows in tqdm(
+                profile.timed("transform", iter_rows(cls, data)),
+                desc=f"Comparing {category}",
+            ):
+                ((_, _, element_id, element_hash),) = rows[SourceHash.__tablename__]
+                if element_id in seen_ids[name]:
+                    profile.count("duplicates")
+                    if verbose:
+                        print(f"Duplicate entry for {category} element, skipping.")
+                    continue
+                seen_ids[name].add(element_id)
+                profile.count("elements")
+                if stored_hashes[name].get(element_id) == element_hash:
+                    changes[name]["unchanged"] += 1
+                    continue
+                pending.append((element_id, rows))
+
+            written_ids[name].update(id for id, _ in pending)
+            changed = [id for id, _ in pending if id in existing_ids[name]]
+            with profile.stage("delete"), engine.begin() as connection:
+                writer.seen_keys -= delete_elements(connection, cls, changed)
+            with profile.stage("write"):
+                for element_id, rows in pending:
+                    if not writer.add(rows):
+                        if verbose:
+                            print(f"Duplicate entry for {category} element, skipping.")
+                        continue
+                    status = (
+                        "updated" if element_id in existing_ids[name] else "inserted"
+                    )
+                    changes[name][status] += 1
+                writer.flush()
+    if archive is not None:
+        archive.close()
+
+    with profile.stage("delete"):
+        for name, cls in classes.items():
+            removed = existing_ids[name] - seen_ids[name]
+            written_ids[name] |= removed
+            with engine.begin() as connection:
+                writer.seen_keys -= delete_elements(connection, cls, removed)
+            changes[name]["deleted"] += len(removed)
+        with engine.begin() as connection:
+            writer.seen_keys -= delete_unused_texts(connection)
+    with profile.stage("indexes"):
+        build_indexes(engine, summary=summary)
+    with profile.stage("documents"), engine.begin() as connection:
+        refresh_item_documents(
+            connection, document_languages, ids=written_ids[Item.__tablename__]
+        )
+    with profile.stage("stat_matrix"):
+        build_stat_matrix(engine, output_path)
+    if snapshot:
+        with profile.stage("snapshot"):
+            export_snapshot(
+                engine,
+                Path(output_path) / SNAPSHOT_FILENAME,
+                version,
+                languages=snapshot_languages,
+            )
+
+    print(f"Database updated to version {version}:")
+    for name in classes:
+        counts = changes[name]
+        print(
+            f"  {name}: {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged."
+        )
 
 
 def main() -> None:
@@ -78,6 +512,8 @@ def main() -> None:
         default=None,
         help=(
             "If JSON files are already extracted, specify the directory where they are located. "
+            "It can also be an archive written by `extract_all_files --archive`, or a "
+            "directory holding the archive of the version. "
             "By default, the script will extract them directly from the Wakfu API."
         ),
     )
@@ -92,7 +528,7 @@ def main() -> None:
         "-v",
         "--version",
         type=str,
-        default=get_current_version(),
+        default=None,
         help="Version of the files to be extracted. Default is the current version.",
     )
     parser.add_argument(
@@ -109,14 +545,216 @@ def main() -> None:
         default=False,
         help="Show duplicate entry warnings (default: False)",
     )
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help=f"Number of elements written per transaction. Default is {BATCH_SIZE}.",
+    )
+    parser.add_argument(
+        "-c",
+        "--cache-directory",
+        type=str,
+        default=DEFAULT_CACHE_DIRECTORY,
+        help=f"Directory where downloaded files are cached. Default is `{DEFAULT_CACHE_DIRECTORY}`.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always download the files from the Wakfu API (default: False)",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        default=False,
+        help=(
+            "Check the cached files with a conditional request, downloading them "
+            "again only if they changed (default: False)"
+        ),
+    )
+    parser.add_argument(
+        "--version-ttl",
+        type=float,
+        default=DEFAULT_VERSION_TTL,
+        help=f"Seconds during which the cached current version is reused. Default is {DEFAULT_VERSION_TTL}.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="Use the last cached current version instead of fetching it (default: False)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes converting elements into rows. Default is 1.",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        default=False,
+        help="Build the rows through the validated models, slower (default: False)",
+    )
+    parser.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        default=False,
+        help=(
+            "Update the existing database to the given version, only writing the "
+            "elements that changed. Not compatible with --workers, --validate and "
+            "--queue-size (default: False)"
+        ),
+    )
+    parser.add_argument(
+        "--no-summary",
+        action="store_true",
+        default=False,
+        help="Do not refresh the denormalized item summary table (default: False)",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        default=False,
+        help=(
+            "Do not export the memory-mapped binary snapshot of the items "
+            "(default: False)"
+        ),
+    )
+    parser.add_argument(
+        "--snapshot-languages",
+        nargs="+",
+        choices=LANGUAGES,
+        default=list(LANGUAGES),
+        help=(
+            "Languages of the texts exported in the snapshot, e.g. only one for "
+            "a single-language service (default: all)"
+        ),
+    )
+    parser.add_argument(
+        "--document-languages",
+        nargs="+",
+        choices=[ALL_LANGUAGES, *LANGUAGES],
+        default=[ALL_LANGUAGES],
+        help=(
+            "Languages of the materialized item documents, one document per "
+            f"item and language, `{ALL_LANGUAGES}` holding every language "
+            f"(default: {ALL_LANGUAGES})"
+        ),
+    )
+    parser.add_argument(
+        "--no-documents",
+        action="store_true",
+        default=False,
+        help="Do not write the materialized item documents (default: False)",
+    )
+    parser.add_argument(
+        "-q",
+        "--queue-size",
+        type=int,
+        default=QUEUE_SIZE,
+        help=(
+            "Number of chunks (of bytes, elements or rows) each stage of the "
+            f"ingest may run ahead of the next one. Default is {QUEUE_SIZE}."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help=(
+            "Write a JSON report of the time spent per stage and category, the "
+            "rows written and the peak memory to this file (default: None)"
+        ),
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        default=None,
+        help="Dump cProfile statistics of the whole run to this file (default: None)",
+    )
     args = parser.parse_args()
-    generate_database(
-        version=args.version,
-        output_path=args.outdir,
-        database_url=args.database,
-        input_path=args.indir,
-        verbose=args.verbose,
+    if args.update:
+        # The update compares and writes the elements one at a time.
+        unsupported = [
+            option
+            for option, value, default in (
+                ("--workers", args.workers, 1),
+                ("--validate", args.validate, False),
+                ("--queue-size", args.queue_size, QUEUE_SIZE),
+            )
+            if value != default
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --update.")
+    if args.revalidate and args.no_cache:
+        parser.error("--revalidate cannot be used with --no-cache.")
+    resolver = VersionResolver(
+        ttl=args.version_ttl,
+        cache_directory=args.cache_directory,
+        pinned=args.version,
+        offline=args.offline,
     )
+    cache = None if args.no_cache else FileCache(args.cache_directory)
+    version = resolver.resolve()
+    options = {"batch_size": args.batch_size}
+    if not args.update:
+        options.update(
+            workers=args.workers, validate=args.validate, queue_size=args.queue_size
+        )
+    profile = IngestProfile(version=version, update=args.update, **options)
+    document_languages = () if args.no_documents else tuple(args.document_languages)
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        if args.update:
+            update_database(
+                version=version,
+                output_path=args.outdir,
+                database_url=args.database,
+                input_path=args.indir,
+                verbose=args.verbose,
+                batch_size=args.batch_size,
+                cache=cache,
+                revalidate=args.revalidate,
+                summary=not args.no_summary,
+                snapshot=not args.no_snapshot,
+                snapshot_languages=tuple(args.snapshot_languages),
+                document_languages=document_languages,
+                profile=profile,
+            )
+        else:
+            generate_database(
+                version=version,
+                output_path=args.outdir,
+                database_url=args.database,
+                input_path=args.indir,
+                verbose=args.verbose,
+                batch_size=args.batch_size,
+                cache=cache,
+                revalidate=args.revalidate,
+                workers=args.workers,
+                validate=args.validate,
+                summary=not args.no_summary,
+                snapshot=not args.no_snapshot,
+                snapshot_languages=tuple(args.snapshot_languages),
+                document_languages=document_languages,
+                profile=profile,
+                queue_size=args.queue_size,
+            )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            print(f"cProfile statistics written to {args.cprofile}")
+    if args.profile:
+        profile.write(args.profile)
+        print(f"Profile report written to {args.profile}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+import argparse
+import json
+from collections import Counter
+from wakfu_items_api.cache import DEFAULT_CACHE_DIRECTORY, FileCache
+from wakfu_items_api.history import (
+    EFFECT_LISTS,
+    HISTORY_FILENAME,
+    History,
+    changed_fields,
+    effect_changes,
+)
+from wakfu_items_api.version import DEFAULT_VERSION_TTL, VersionResolver
+from scripts.generate_database import ITEMS_CATEGORIES, open_archive, stream_elements
+
+EFFECT_PATHS = tuple(f"definition.{name}" for name in EFFECT_LISTS)
+"""Paths of the item fields listed effect by effect by `print_diff`."""
+
+
+def record_version(
+    history: History,
+    version: str,
+    input_path: str | None = None,
+    cache: FileCache | None = None,
+) -> dict[str, Counter]:
+    """
+    Records a version in the history, reading its elements like
+    `generate_database` does: from an archive or the JSON files extracted
+    in `input_path`, or from the Wakfu API. Returns the changes per category.
+    """
+    archive = open_archive(input_path, version)
+    try:
+        return history.record(
+            version,
+            {
+                category: stream_elements(
+                    category, version, input_path, archive=archive, cache=cache
+                )
+                for category in ITEMS_CATEGORIES
+            },
+            ITEMS_CATEGORIES,
+        )
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+def print_diff(
+    history: History,
+    old: str,
+    new: str,
+    categories: list[str] | None = None,
+    effects: bool = False,
+    fields: bool = False,
+) -> None:
+    """Prints the elements that changed between two versions."""
+    counts = Counter()
+    for change in history.diff(old, new, categories):
+        counts[change.category, change.status] += 1
+        print(f"{change.category} {change.element_id}: {change.status}")
+        by_effect = effects and change.category == "items"
+        if fields and change.status == "changed":
+            for path, (before, after) in sorted(
+                changed_fields(change.before, change.after).items()
+            ):
+                if by_effect and path.startswith(EFFECT_PATHS):
+                    continue
+                print(f"  {path}: {before!r} -> {after!r}")
+        if by_effect:
+            for effect in effect_changes(change):
+                print(f"  {effect.effects} {effect.effect_id}: {effect.status}")
+                if fields and effect.status == "changed":
+                    for path, (before, after) in sorted(
+                        changed_fields(effect.before, effect.after).items()
+                    ):
+                        print(f"    {path}: {before!r} -> {after!r}")
+    print(f"From {old} to {new}:")
+    for category in dict.fromkeys(category for category, _ in counts):
+        print(
+            f"  {category}: {counts[category, 'added']} added, "
+            f"{counts[category, 'changed']} changed, "
+            f"{counts[category, 'removed']} removed."
+        )
+
+
+def main() -> None:
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Record game versions in a multi-version database and query it."
+    )
+    parser.add_argument(
+        "-H",
+        "--history",
+        type=str,
+        default=HISTORY_FILENAME,
+        help=f"Path of the multi-version database. Default is `{HISTORY_FILENAME}`.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser(
+        "record", help="Record a version, only storing what changed."
+    )
+    record.add_argument(
+        "-v",
+        "--version",
+        type=str,
+        default=None,
+        help="Version to record. Default is the current version.",
+    )
+    record.add_argument(
+        "-i",
+        "--indir",
+        type=str,
+        default=None,
+        help=(
+            "Directory of the extracted JSON files, or archive, as for "
+            "`generate-database`. By default, they are read from the Wakfu API."
+        ),
+    )
+    record.add_argument(
+        "-c",
+        "--cache-directory",
+        type=str,
+        default=DEFAULT_CACHE_DIRECTORY,
+        help=f"Directory where downloaded files are cached. Default is `{DEFAULT_CACHE_DIRECTORY}`.",
+    )
+    record.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Always download the files from the Wakfu API (default: False)",
+    )
+    record.add_argument(
+        "--version-ttl",
+        type=float,
+        default=DEFAULT_VERSION_TTL,
+        help=f"Seconds during which the cached current version is reused. Default is {DEFAULT_VERSION_TTL}.",
+    )
+    record.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="Use the last cached current version instead of fetching it (default: False)",
+    )
+
+    commands.add_parser("versions", help="List the recorded versions.")
+
+    as_of = commands.add_parser(
+        "as-of", help="Print the elements of a category as of a version, as JSON."
+    )
+    as_of.add_argument("version", type=str, help="Recorded version.")
+    as_of.add_argument("category", choices=list(ITEMS_CATEGORIES), help="Category.")
+    as_of.add_argument(
+        "ids", type=int, nargs="*", help="Ids of the elements (default: all)"
+    )
+
+    diff = commands.add_parser(
+        "diff", help="Print what changed between two recorded versions."
+    )
+    diff.add_argument("old", type=str, help="Version to compare from.")
+    diff.add_argument("new", type=str, help="Version to compare to.")
+    diff.add_argument(
+        "-k",
+        "--categories",
+        nargs="+",
+        choices=list(ITEMS_CATEGORIES),
+        default=None,
+        help="Categories to compare (default: all)",
+    )
+    diff.add_argument(
+        "-e",
+        "--effects",
+        action="store_true",
+        default=False,
+        help="Break the changes of the items down to their effects (default: False)",
+    )
+    diff.add_argument(
+        "-f",
+        "--fields",
+        action="store_true",
+        default=False,
+        help="Print the old and new value of each changed field (default: False)",
+    )
+    args = parser.parse_args()
+
+    history = History.open(args.history)
+    if args.command == "record":
+        version = VersionResolver(
+            ttl=args.version_ttl,
+            cache_directory=args.cache_directory,
+            pinned=args.version,
+            offline=args.offline,
+        ).resolve()
+        cache = None if args.no_cache else FileCache(args.cache_directory)
+        changes = record_version(history, version, args.indir, cache=cache)
+        print(f"Version {version} recorded in {args.history}:")
+        for category, counts in changes.items():
+            print(
+                f"  {category}: {counts['added']} added, {counts['changed']} changed, "
+                f"{counts['removed']} removed, {counts['unchanged']} unchanged."
+            )
+    elif args.command == "versions":
+        for version in history.versions():
+            print(version)
+    elif args.command == "as-of":
+        elements = history.as_of(args.version, args.category, args.ids or None)
+        print(json.dumps(list(elements.values()), ensure_ascii=False, indent=4))
+    else:
+        print_diff(
+            history,
+            args.old,
+            args.new,
+            categories=args.categories,
+            effects=args.effects,
+            fields=args.fields,
+        )
+
+
+if __name__ == "__main__":
+    main()
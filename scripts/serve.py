@@ -0,0 +1,76 @@
+import argparse
+from wakfu_items_api.server import POOL_SIZE, ItemsAPI, ItemsServer
+from wakfu_items_api.database.texts import LANGUAGES
+
+
+def main() -> None:
+    """
+    Main function to run the script.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve a generated database through a read-only HTTP API."
+    )
+    parser.add_argument(
+        "-d",
+        "--directory",
+        type=str,
+        default=".",
+        help="Directory of the database and its snapshot. Default is `.`.",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address to listen on. Default is 127.0.0.1.",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen on. Default is 8000.",
+    )
+    parser.add_argument(
+        "-l",
+        "--languages",
+        nargs="+",
+        choices=LANGUAGES,
+        default=None,
+        help="Languages of the texts served (default: those of the snapshot)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=POOL_SIZE,
+        help=f"Number of read-only connections kept open. Default is {POOL_SIZE}.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help="Log every request (default: False)",
+    )
+    args = parser.parse_args()
+
+    api = ItemsAPI(
+        args.directory,
+        languages=tuple(args.languages) if args.languages else None,
+        pool_size=args.pool_size,
+    )
+    with ItemsServer((args.host, args.port), api, verbose=args.verbose) as server:
+        host, port = server.server_address[:2]
+        print(
+            f"Serving {len(api.items)} items of version {api.version} "
+            f"on http://{host}:{port}"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import pytest
+from scripts.generate_database import generate_database
+from wakfu_items_api.synthetic import SyntheticData
+
+VERSION = "1.0.0"
+"""Version of the synthetic database."""
+
+
+@pytest.fixture(scope="session")
+def database_directory(tmp_path_factory):
+    """Directory of a database (and its snapshot) generated from synthetic data."""
+    directory = tmp_path_factory.mktemp("database")
+    SyntheticData(items=60, description_rate=0.5).write(directory / "data", VERSION)
+    generate_database(
+        VERSION, str(directory), "sqlite:///", str(directory / "data"), verbose=False
+    )
+    return directory
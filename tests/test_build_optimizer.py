@@ -0,0 +1,114 @@
+import random
+from itertools import product
+import numpy as np
+import pytest
+from wakfu_items_api.request.build_optimizer import RARITY_LIMITS, BuildOptimizer
+from wakfu_items_api.request.item_catalog import ItemCatalog
+from wakfu_items_api.request.stat_matrix import StatMatrix
+
+ITEM_TYPES = {
+    1: (["HEAD"], []),
+    2: (["NECK"], []),
+    3: (["LEFT_HAND", "RIGHT_HAND"], []),
+    4: (["FIRST_WEAPON"], []),
+    5: (["FIRST_WEAPON"], ["SECOND_WEAPON"]),
+    6: (["SECOND_WEAPON"], []),
+}
+"""Positions and disabled positions of the item types: rings and two-handed weapons."""
+
+RARITIES = (1, 3, 4, 5, 5, 7, 7)
+"""Rarities of the items, relic (5) and epic (7) often enough to hit their limits."""
+
+
+def random_optimizer(rng: random.Random, items: int) -> BuildOptimizer:
+    ids = np.arange(1, items + 1, dtype=np.int32)
+    catalog = ItemCatalog(
+        ids,
+        {
+            "level": np.array([rng.randint(1, 50) for _ in ids], dtype=np.int16),
+            "itemTypeId": np.array(
+                [rng.choice(list(ITEM_TYPES)) for _ in ids], dtype=np.int32
+            ),
+            "rarity": np.array([rng.choice(RARITIES) for _ in ids], dtype=np.int8),
+        },
+    )
+    # Integer stats keep the sums exact, negative ones leave some items out.
+    values = np.array(
+        [[rng.randint(-3, 10), rng.randint(-3, 10)] for _ in ids], dtype=np.float64
+    )
+    matrix = StatMatrix(ids, np.array([1, 2], dtype=np.int32), values)
+    return BuildOptimizer(catalog, matrix, ITEM_TYPES)
+
+
+def brute_force(
+    optimizer: BuildOptimizer, weights: dict[int, float], level: int
+) -> dict[frozenset[int], float]:
+    """Score of every valid set of items adding to the score, by enumeration."""
+    scores = optimizer.matrix.scores(weights)
+    catalog = optimizer.catalog
+    items = [
+        (int(id), float(score))
+        for id, score, item_level in zip(catalog.ids, scores, catalog["level"])
+        if score > 0 and item_level <= level
+    ]
+    item_type = dict(zip(catalog.ids.tolist(), catalog["itemTypeId"].tolist()))
+    rarity = dict(zip(catalog.ids.tolist(), catalog["rarity"].tolist()))
+    positions = sorted({p for positions, _ in ITEM_TYPES.values() for p in positions})
+    options = [
+        [None] + [id for id, _ in items if position in ITEM_TYPES[item_type[id]][0]]
+        for position in positions
+    ]
+    score = dict(items)
+
+    builds = {}
+    for chosen in product(*options):
+        equipped = {p: id for p, id in zip(positions, chosen) if id is not None}
+        ids = list(equipped.values())
+        if len(set(ids)) < len(ids):
+            continue
+        if any(
+            disabled in equipped
+            for id in ids
+            for disabled in ITEM_TYPES[item_type[id]][1]
+        ):
+            continue
+        if any(
+            sum(rarity[id] == limited for id in ids) > limit
+            for limited, limit in RARITY_LIMITS.items()
+        ):
+            continue
+        builds[frozenset(ids)] = sum(score[id] for id in ids)
+    return builds
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimize_matches_brute_force(seed):
+    rng = random.Random(seed)
+    optimizer = random_optimizer(rng, rng.randint(5, 14))
+    weights = {1: rng.choice([0.5, 1.0, 2.0]), 2: rng.choice([0.0, 1.0])}
+    level = rng.choice([25, 50])
+    builds = brute_force(optimizer, weights, level)
+    expected = sorted(builds.values(), reverse=True)
+    scores = optimizer.matrix.scores(weights)
+    score = dict(zip(optimizer.catalog.ids.tolist(), scores.tolist()))
+    item_type = dict(
+        zip(optimizer.catalog.ids.tolist(), optimizer.catalog["itemTypeId"].tolist())
+    )
+
+    for k in (1, 3, 10):
+        result = optimizer.optimize(weights, level, k=k)
+        assert result.exact
+        assert [build.score for build in result.builds] == expected[:k]
+        seen = set()
+        for build in result.builds:
+            item_set = frozenset(build.items.values())
+            assert item_set not in seen
+            seen.add(item_set)
+            # The positions are valid and the score is that of the item set.
+            assert len(item_set) == len(build.items)
+            assert all(
+                position in ITEM_TYPES[item_type[id]][0]
+                for position, id in build.items.items()
+            )
+            assert builds[item_set] == build.score
+            assert build.score == sum(score[id] for id in item_set)
@@ -0,0 +1,32 @@
+import pytest
+from wakfu_items_api.database.crafting import bill_of_materials_closure
+
+
+def test_chain():
+    recipes = {1: (2, [(2, 4), (10, 2)]), 2: (1, [(20, 3)])}
+    assert bill_of_materials_closure(recipes) == {
+        1: {10: 1.0, 20: 6.0},
+        2: {20: 3.0},
+    }
+
+
+@pytest.mark.parametrize("order", [(1, 2), (2, 1)])
+def test_two_item_cycle(order):
+    recipes = {1: (1, [(2, 1), (10, 1)]), 2: (1, [(1, 1), (20, 1)])}
+    closure = bill_of_materials_closure({id: recipes[id] for id in order})
+    assert closure == {
+        1: {1: 1.0, 20: 1.0, 10: 1.0},
+        2: {2: 1.0, 10: 1.0, 20: 1.0},
+    }
+
+
+@pytest.mark.parametrize("order", [(3, 1, 2), (1, 2, 3), (2, 3, 1)])
+def test_item_crafted_from_a_cycle(order):
+    recipes = {
+        1: (1, [(2, 1), (10, 1)]),
+        2: (1, [(1, 1), (20, 1)]),
+        3: (1, [(1, 2)]),
+    }
+    closure = bill_of_materials_closure({id: recipes[id] for id in order})
+    assert closure[3] == {1: 2.0, 10: 2.0, 20: 2.0}
+    assert closure[2] == {2: 1.0, 10: 1.0, 20: 1.0}
@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from wakfu_items_api import download as download_module
+from wakfu_items_api import extract_file as extract_file_module
+from wakfu_items_api.cache import FileCache
+from wakfu_items_api.download import Download, DownloadError, download
+from wakfu_items_api.extract_file import extract_file, stream_file_chunks
+
+PAYLOAD = json.dumps(
+    [{"id": id, "name": f"item {id}", "level": id % 230} for id in range(20000)]
+).encode()
+"""Decoded body served, large enough for its compressed form to span many chunks."""
+
+ENCODED = gzip.compress(PAYLOAD)
+
+ETAG = '"v1"'
+
+
+class CDN(BaseHTTPRequestHandler):
+    """
+    Stand-in of the CDN serving `ENCODED` gzip-encoded, honouring `Range` when
+    `If-Range` matches the ETag, answering 304 when `If-None-Match` does, and
+    cutting the connection after `cut` bytes of the body for the first `cuts`
+    requests.
+    """
+
+    cut = len(ENCODED) // 3
+    cuts = 1
+    requests: list[dict[str, str]] = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        start = 0
+        if "Range" in self.headers and self.headers.get("If-Range") == ETAG:
+            start = int(self.headers["Range"].removeprefix("bytes=").split("-")[0])
+        body = ENCODED[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        if start:
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(ENCODED) - 1}/{len(ENCODED)}"
+            )
+        self.end_headers()
+        if type(self).cuts:
+            type(self).cuts -= 1
+            self.wfile.write(body[: self.cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cdn(monkeypatch):
+    monkeypatch.setattr(download_module, "RESUME_BACKOFF", 0)
+    monkeypatch.setattr(CDN, "requests", [])
+    monkeypatch.setattr(CDN, "cuts", 1)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CDN)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_resume_after_cut(cdn, tmp_path):
+    body = download(f"{cdn}items.json", tmp_path / "items.json")
+    assert (tmp_path / "items.json").read_bytes() == PAYLOAD
+    assert len(CDN.requests) == 2
+    assert "Range" not in CDN.requests[0]
+    assert CDN.requests[1]["Range"] == f"bytes={CDN.cut}-"
+    assert CDN.requests[1]["If-Range"] == ETAG
+    assert body.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert not list(tmp_path.glob(".items.json.part*"))
+
+
+def test_resume_from_previous_run(cdn, tmp_path):
+    partial_path = tmp_path / ".items.json.part"
+    with pytest.raises(DownloadError):
+        b"".join(Download(f"{cdn}items.json", partial_path=partial_path, retries=0))
+    assert partial_path.read_bytes() == ENCODED[: CDN.cut]
+
+    payload = b"".join(Download(f"{cdn}items.json", partial_path=partial_path))
+    assert payload == PAYLOAD
+    assert CDN.requests[1]["Range"] == f"bytes={CDN.cut}-"
+    assert not partial_path.exists()
+
+
+def test_stream_from_cache(cdn, tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_file_module, "BASE_URL", cdn)
+    cache = FileCache(tmp_path)
+    assert b"".join(stream_file_chunks("items", "1.0.0", cache)) == PAYLOAD
+    assert cache.payload_path("1.0.0", "items").read_bytes() == PAYLOAD
+
+    requests = len(CDN.requests)
+    assert b"".join(stream_file_chunks("items", "1.0.0", cache)) == PAYLOAD
+    assert len(CDN.requests) == requests
+
+    # A corrupted entry is downloaded again instead of being streamed.
+    cache.payload_path("1.0.0", "items").write_bytes(PAYLOAD[:-1] + b" ")
+    assert b"".join(stream_file_chunks("items", "1.0.0", cache)) == PAYLOAD
+    assert len(CDN.requests) == requests + 1
+    assert cache.load("1.0.0", "items") == PAYLOAD
+
+
+def test_revalidate_unchanged(cdn, tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_file_module, "BASE_URL", cdn)
+    cache = FileCache(tmp_path)
+    assert b"".join(stream_file_chunks("items", "1.0.0", cache)) == PAYLOAD
+    requests = len(CDN.requests)
+
+    chunks = stream_file_chunks("items", "1.0.0", cache, revalidate=True)
+    assert b"".join(chunks) == PAYLOAD
+    assert len(CDN.requests) == requests + 1
+    assert CDN.requests[-1]["If-None-Match"] == ETAG
+
+    assert extract_file("items", "1.0.0", cache, revalidate=True) == json.loads(PAYLOAD)
+    assert len(CDN.requests) == requests + 2
+    assert CDN.requests[-1]["If-None-Match"] == ETAG
+    assert cache.load("1.0.0", "items") == PAYLOAD
+
+
+def test_revalidate_changed(cdn, tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_file_module, "BASE_URL", cdn)
+    cache = FileCache(tmp_path)
+    cache.store("1.0.0", "items", b"[]", {"ETag": '"v0"'})
+
+    chunks = stream_file_chunks("items", "1.0.0", cache, revalidate=True)
+    assert b"".join(chunks) == PAYLOAD
+    assert CDN.requests[0]["If-None-Match"] == '"v0"'
+    assert cache.load("1.0.0", "items") == PAYLOAD
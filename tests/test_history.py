@@ -0,0 +1,118 @@
+from collections import Counter
+from itertools import permutations
+import pytest
+from wakfu_items_api.categories import Categories
+from wakfu_items_api.database import Action
+from wakfu_items_api.history import History
+
+CLASSES = {Categories.actions: Action}
+
+
+def action(id: int, effect: str) -> dict:
+    return {"definition": {"id": id, "effect": effect}, "description": {"fr": effect}}
+
+
+VERSIONS = {
+    "1.0.0": {1: "Kept", 2: "Flip", 3: "Dropped", 5: "Back", 6: "First"},
+    # 2 changes, 3 and 5 are removed, 6 changes.
+    "1.0.1": {1: "Kept", 2: "Flop", 6: "Second"},
+    # 2 changes back, 4 is added.
+    "1.0.2": {1: "Kept", 2: "Flip", 4: "Added", 6: "Second"},
+    # 5 comes back unchanged, 6 changes again.
+    "1.0.3": {1: "Kept", 2: "Flip", 4: "Added", 5: "Back", 6: "Third"},
+}
+"""Effects of the actions of each version, by id."""
+
+
+def elements(version: str) -> dict[int, dict]:
+    return {id: action(id, effect) for id, effect in VERSIONS[version].items()}
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = History.open(tmp_path / "history.db")
+    for version in VERSIONS:
+        history.record(
+            version, {Categories.actions: elements(version).values()}, CLASSES
+        )
+    return history
+
+
+def test_record_counts(tmp_path):
+    history = History.open(tmp_path / "history.db")
+    counts = [
+        history.record(
+            version, {Categories.actions: elements(version).values()}, CLASSES
+        )[Categories.actions]
+        for version in VERSIONS
+    ]
+    assert counts == [
+        Counter(added=5),
+        Counter(unchanged=1, changed=2, removed=2),
+        Counter(unchanged=2, changed=1, added=1),
+        Counter(unchanged=3, changed=1, added=1),
+    ]
+    assert history.versions() == list(VERSIONS)
+
+    with pytest.raises(ValueError):
+        history.record("1.0.3", {Categories.actions: []}, CLASSES)
+    with pytest.raises(ValueError):
+        history.record("1.0.2", {Categories.actions: []}, CLASSES)
+
+
+def test_as_of(history):
+    for version in VERSIONS:
+        assert history.as_of(version, Categories.actions) == elements(version)
+    assert history.as_of("1.0.1", Categories.actions, ids=[2, 3]) == {
+        2: action(2, "Flop")
+    }
+    assert history.as_of("1.0.0", Categories.states) == {}
+
+
+@pytest.mark.parametrize("old, new", list(permutations(VERSIONS, 2)))
+def test_diff(history, old, new):
+    before, after = elements(old), elements(new)
+    expected = []
+    for id in sorted(before.keys() | after.keys()):
+        if id not in before:
+            expected.append((id, "added", None, after[id]))
+        elif id not in after:
+            expected.append((id, "removed", before[id], None))
+        elif before[id] != after[id]:
+            expected.append((id, "changed", before[id], after[id]))
+    changes = list(history.diff(old, new))
+    assert {change.category for change in changes} <= {Categories.actions}
+    assert [change[1:] for change in changes] == expected
+
+
+def test_diff_changed_back(history):
+    assert [change.element_id for change in history.diff("1.0.0", "1.0.1")] == [
+        2,
+        3,
+        5,
+        6,
+    ]
+    # 2 changed and changed back, 5 was removed and came back unchanged.
+    assert [change.element_id for change in history.diff("1.0.0", "1.0.3")] == [
+        3,
+        4,
+        6,
+    ]
+    assert [change.status for change in history.diff("1.0.3", "1.0.0")] == [
+        "added",
+        "removed",
+        "changed",
+    ]
+    assert list(history.diff("1.0.0", "1.0.3", categories=[Categories.states])) == []
+
+
+def test_element_history(history):
+    assert history.element_history(Categories.actions, 2) == [
+        ("1.0.0", "1.0.1", action(2, "Flip")),
+        ("1.0.1", "1.0.2", action(2, "Flop")),
+        ("1.0.2", None, action(2, "Flip")),
+    ]
+    assert history.element_history(Categories.actions, 5) == [
+        ("1.0.0", "1.0.1", action(5, "Back")),
+        ("1.0.3", None, action(5, "Back")),
+    ]
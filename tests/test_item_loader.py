@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+from wakfu_items_api.database.item_loader import EFFECTS, load_items
+
+
+@pytest.fixture
+def session(database_directory):
+    engine = create_engine(f"sqlite:///{database_directory / 'database.db'}")
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(session):
+    """Statements executed by the session, recorded as they run."""
+    executed = []
+    engine = session.get_bind()
+
+    def record(connection, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def walk(items) -> int:
+    """Touches every relationship of the items, returning the number of texts seen."""
+    texts = 0
+    for item in items:
+        texts += item.title is not None
+        texts += item.description is not None
+        parameters = item.definition.item
+        assert parameters.baseParameters is not None
+        assert parameters.useParameters is not None
+        assert parameters.graphicParameters is not None
+        for relationship, _, _ in EFFECTS:
+            for effect in getattr(item.definition, relationship.key):
+                assert effect.definition is not None
+                if effect.description is not None:
+                    texts += effect.description.text is not None
+    return texts
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"language": "en"}, {"ids": range(1, 20)}, {"level_range": (None, 100)}],
+)
+def test_load_items_queries(session, statements, kwargs):
+    items = load_items(session, **kwargs)
+    assert items
+    assert len(statements) == 4
+    assert walk(items)
+    assert len(statements) == 4
@@ -0,0 +1,77 @@
+import re
+import unicodedata
+import pytest
+from sqlmodel import Session, create_engine, select
+from wakfu_items_api.database.items import ItemTitle
+from wakfu_items_api.database.texts import LANGUAGES
+from wakfu_items_api.request.items_by_name import items_by_name
+
+
+@pytest.fixture(scope="module")
+def session(database_directory):
+    engine = create_engine(f"sqlite:///{database_directory / 'database.db'}")
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def folded_words(text: str) -> list[str]:
+    """Words of a text without case and accents, as the name index splits them."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return re.findall(
+        r"\w+", "".join(c for c in decomposed if not unicodedata.combining(c))
+    )
+
+
+def expected(
+    session: Session, query: str, languages: tuple[str, ...] = LANGUAGES
+) -> set[int]:
+    """Ids of the items having a title in which every word of `query` starts a word."""
+    words = folded_words(query)
+    ids = set()
+    for title in session.exec(select(ItemTitle)):
+        for language in languages:
+            title_words = folded_words(getattr(title, language) or "")
+            if all(
+                any(title_word.startswith(word) for title_word in title_words)
+                for word in words
+            ):
+                ids.add(title.id)
+    return ids
+
+
+@pytest.mark.parametrize(
+    "query", ["epee", "ÉPÉE", "Épée", "baton", "glacee", "ecarl", "bouf", "glac ogr"]
+)
+def test_diacritics_and_prefixes(session, query):
+    ids = {item.id for item in items_by_name(session, query, limit=1000)}
+    assert ids
+    assert ids == expected(session, query)
+
+
+def test_accented_titles_match(session):
+    ids = {item.id for item in items_by_name(session, "epee", limit=1000)}
+    titles = session.exec(select(ItemTitle).where(ItemTitle.id.in_(ids))).all()
+    assert titles and all("Épée" in title.fr for title in titles)
+    assert (
+        ids
+        == {item.id for item in items_by_name(session, "Épée", limit=1000)}
+        == {item.id for item in items_by_name(session, "EPEE", limit=1000)}
+    )
+
+
+def test_language(session):
+    assert items_by_name(session, "fr", language="en") == []
+    ids = {item.id for item in items_by_name(session, "fr", language="fr", limit=1000)}
+    assert ids == expected(session, "fr", ("fr",))
+    item = items_by_name(session, "epee", language="pt", limit=1)[0]
+    assert "Épée" in item.pt
+
+
+def test_limit_and_empty_queries(session):
+    assert len(items_by_name(session, "epee", limit=2)) == 2
+    assert items_by_name(session, "") == []
+    assert items_by_name(session, "  ' ") == []
+    assert items_by_name(session, "zzzz") == []
+    with pytest.raises(ValueError):
+        items_by_name(session, "epee", language="de")
@@ -0,0 +1,20 @@
+import time
+from wakfu_items_api.pipeline import Pipeline
+
+
+def test_busy_time_per_tag():
+    def slow(items):
+        for tag, value in items:
+            time.sleep(0.02 if tag == "slow" else 0.0)
+            yield tag, value
+
+    items = [("fast", index) for index in range(5)] + [("slow", 0), ("slow", 1)]
+    with Pipeline("read", items, tag=lambda item: item[0]) as pipeline:
+        pipeline.then("transform", slow)
+        assert list(pipeline) == items
+    stages = pipeline.report()["stages"]
+    transform = stages["transform"]["busy_by_tag"]
+    assert transform.keys() == {"fast", "slow"}
+    assert transform["slow"] >= 0.04 > transform["fast"]
+    assert sum(transform.values()) <= stages["transform"]["busy"] + 1e-3
+    assert stages["sink"]["busy_by_tag"] == {}
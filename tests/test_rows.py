@@ -0,0 +1,133 @@
+import copy
+import pytest
+from wakfu_items_api.categories import Categories
+from wakfu_items_api.database.recipes import RECIPE_SLOTS
+from wakfu_items_api.database.rows import rows_from_instance
+from wakfu_items_api.synthetic import SyntheticData
+from scripts.generate_database import ITEMS_CATEGORIES
+
+DATA = SyntheticData(items=300, description_rate=0.5).generate()
+"""Synthetic payloads of every category."""
+
+
+def edge_cases() -> dict[str, list[dict]]:
+    """Elements missing their optional keys, or with empty or null values."""
+    item = DATA[Categories.items][0]
+    with_effects = next(
+        element
+        for element in DATA[Categories.items]
+        if element["definition"]["equipEffects"]
+    )
+    cases = {category: [] for category in ITEMS_CATEGORIES}
+
+    def variant(category: str, element: dict, change) -> None:
+        element = copy.deepcopy(element)
+        change(element)
+        cases[category].append(element)
+
+    variant(Categories.items, item, lambda element: element.pop("description", None))
+    variant(Categories.items, item, lambda element: element.update(description=None))
+    variant(Categories.items, item, lambda element: element.update(title=None))
+    variant(
+        Categories.items, item, lambda element: element.update(title={"fr": "Épée"})
+    )
+    variant(
+        Categories.items,
+        item,
+        lambda element: element["definition"].update(
+            useEffects=[], useCriticalEffects=[], equipEffects=[]
+        ),
+    )
+    variant(
+        Categories.items,
+        item,
+        lambda element: [
+            element["definition"].pop(effects)
+            for effects in ("useEffects", "useCriticalEffects", "equipEffects")
+        ],
+    )
+    variant(
+        Categories.items,
+        with_effects,
+        lambda element: [
+            effect["effect"].update(description=None)
+            for effect in element["definition"]["equipEffects"]
+        ],
+    )
+    variant(
+        Categories.items,
+        with_effects,
+        lambda element: [
+            effect["effect"].pop("description", None)
+            for effect in element["definition"]["equipEffects"]
+        ],
+    )
+    variant(
+        Categories.items,
+        item,
+        lambda element: element["definition"]["item"].pop("properties"),
+    )
+    variant(
+        Categories.jobsItems,
+        DATA[Categories.jobsItems][0],
+        lambda element: element.pop("description", None),
+    )
+    variant(
+        Categories.jobsItems,
+        DATA[Categories.jobsItems][0],
+        lambda element: element.update(description=None),
+    )
+    variant(
+        Categories.states,
+        DATA[Categories.states][0],
+        lambda element: element.update(description=None),
+    )
+    variant(
+        Categories.actions,
+        DATA[Categories.actions][0],
+        lambda element: element.pop("description"),
+    )
+    variant(
+        Categories.itemTypes,
+        DATA[Categories.itemTypes][20],
+        lambda element: element["definition"].update(
+            parentId=None, equipmentPositions=[], equipmentDisabledPositions=[]
+        ),
+    )
+    return cases
+
+
+EDGE_CASES = edge_cases()
+
+
+@pytest.mark.parametrize("category", list(ITEMS_CATEGORIES))
+def test_rows_match_the_validated_models(category):
+    cls = ITEMS_CATEGORIES[category]
+    elements = DATA[category] + EDGE_CASES[category]
+    assert elements
+    for element in elements:
+        rows = cls.rows_from_wakfu_api(element)
+        assert rows[cls.__tablename__]
+        assert rows_from_instance(cls.from_wakfu_api(element)) == rows, element
+
+
+@pytest.mark.parametrize(
+    "category, order",
+    [
+        (Categories.recipeIngredients, "ingredientOrder"),
+        (Categories.recipeResults, "productOrder"),
+    ],
+)
+def test_recipe_slots(category, order):
+    cls = ITEMS_CATEGORIES[category]
+    element = DATA[category][0]
+    last = {**element, order: RECIPE_SLOTS - 1}
+    assert cls.rows_from_wakfu_api(last)[cls.__tablename__][0][0] == (
+        element["recipeId"] * RECIPE_SLOTS + RECIPE_SLOTS - 1
+    )
+    for build in (cls.from_wakfu_api, cls.rows_from_wakfu_api):
+        for value in (RECIPE_SLOTS, -1):
+            with pytest.raises(ValueError):
+                build({**element, order: value})
+        with pytest.raises(KeyError):
+            build({key: value for key, value in element.items() if key != order})
@@ -0,0 +1,75 @@
+import http.client
+import json
+import threading
+import pytest
+from wakfu_items_api.server import ItemsAPI, ItemsServer
+
+
+@pytest.fixture(scope="module")
+def server(database_directory):
+    api = ItemsAPI(database_directory)
+    server = ItemsServer(("127.0.0.1", 0), api)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    api.close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+def test_item(server):
+    status, headers, body = get(server, "/items/1")
+    assert status == 200
+    assert headers["ETag"] == server.api.etag
+    assert json.loads(body)["definition"]["item"]["id"] == 1
+
+
+@pytest.mark.parametrize(
+    "path", ["/version", "/items/1", "/items?ids=1,2", "/items?limit=5"]
+)
+def test_not_modified(server, path):
+    status, headers, body = get(server, path, {"If-None-Match": server.api.etag})
+    assert status == 304
+    assert headers["ETag"] == server.api.etag
+    assert body == b""
+    status, _, _ = get(server, path, {"If-None-Match": '"other"'})
+    assert status == 200
+
+
+@pytest.mark.parametrize("path", ["/unknown", "/items/999999", "/items/1/2"])
+@pytest.mark.parametrize("etag", [None, "current"])
+def test_not_found(server, path, etag):
+    headers = {} if etag is None else {"If-None-Match": server.api.etag}
+    status, headers, body = get(server, path, headers)
+    assert status == 404
+    assert "ETag" not in headers
+    assert "error" in json.loads(body)
+
+
+@pytest.mark.parametrize(
+    "path", ["/items/abc", "/items?limit=0", "/items/search", "/items?ids=a"]
+)
+@pytest.mark.parametrize("etag", [None, "current"])
+def test_bad_request(server, path, etag):
+    headers = {} if etag is None else {"If-None-Match": server.api.etag}
+    status, _, body = get(server, path, headers)
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_documents_in_any_order(server, database_directory):
+    api = ItemsAPI(database_directory, languages=("pt", "es", "en", "fr"))
+    try:
+        assert api._load_documents(api.languages)
+    finally:
+        api.close()
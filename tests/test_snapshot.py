@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from sqlmodel import create_engine
+from wakfu_items_api.database.item_documents import item_layouts
+from wakfu_items_api.database.texts import LANGUAGES
+from wakfu_items_api.request.item_catalog import CATALOG_COLUMNS, ItemCatalog
+from wakfu_items_api.snapshot import (
+    COLUMNS,
+    SNAPSHOT_FILENAME,
+    Snapshot,
+    export_snapshot,
+    snapshot_arrays,
+)
+
+
+@pytest.fixture(scope="module")
+def engine(database_directory):
+    engine = create_engine(f"sqlite:///{database_directory / 'database.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("languages", [LANGUAGES, ("fr",), ("en", "pt")])
+def test_round_trip(engine, tmp_path, languages):
+    path = tmp_path / SNAPSHOT_FILENAME
+    export_snapshot(engine, path, "1.2.3", languages=languages)
+    snapshot = Snapshot(path)
+    try:
+        assert snapshot.version == "1.2.3"
+        assert snapshot.languages == languages
+        with engine.connect() as connection:
+            arrays = snapshot_arrays(connection, languages)
+            items = item_layouts(connection, languages, snapshot.ids.tolist())
+        assert snapshot.arrays.keys() == arrays.keys()
+        for name, array in arrays.items():
+            assert snapshot.arrays[name].dtype == array.dtype, name
+            np.testing.assert_array_equal(snapshot.arrays[name], array, err_msg=name)
+
+        assert snapshot.ids.tolist() == list(items)
+        for id, item in items.items():
+            assert snapshot.item(id) == item
+        assert 0 not in snapshot
+        with pytest.raises(KeyError):
+            snapshot.item(0)
+    finally:
+        snapshot.close()
+
+
+def test_columns_match_catalog(engine, database_directory):
+    catalog = ItemCatalog.from_database(engine)
+    snapshot = Snapshot(database_directory / SNAPSHOT_FILENAME)
+    try:
+        assert COLUMNS.keys() - CATALOG_COLUMNS.keys() == {"gfxId", "femaleGfxId"}
+        np.testing.assert_array_equal(snapshot.ids, catalog.ids)
+        for name, (_, dtype) in CATALOG_COLUMNS.items():
+            assert snapshot[name].dtype == dtype
+            np.testing.assert_array_equal(snapshot[name], catalog[name], err_msg=name)
+        np.testing.assert_array_equal(snapshot["gfxId"], catalog.ids * 10)
+    finally:
+        snapshot.close()
+
+
+def test_not_a_snapshot(tmp_path):
+    path = tmp_path / SNAPSHOT_FILENAME
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        Snapshot(path)
@@ -0,0 +1,61 @@
+import json
+import random
+import pytest
+from wakfu_items_api.streaming import iter_json_array
+
+ELEMENTS = [
+    1,
+    -12,
+    1.5,
+    -0.25,
+    2e10,
+    1.5e-7,
+    -3e21,
+    0,
+    123456789012345678901234567890,
+    True,
+    False,
+    None,
+    "",
+    'épée, "quotée" ✓ 🗡',
+    [],
+    {},
+    [1, 2.5, [3e3]],
+    {"id": 1, "title": {"fr": "Épée", "en": None}, "params": [0.5, -1e3]},
+]
+"""Elements covering every JSON type, with bare numbers of each form."""
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": "), (" ,\n ", " : ")])
+def test_every_chunk_size(separators):
+    data = json.dumps(ELEMENTS, separators=separators, ensure_ascii=False).encode()
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_array(split(data, size))) == ELEMENTS, size
+
+
+def test_random_chunks():
+    rng = random.Random(0)
+    for _ in range(200):
+        elements = [rng.choice(ELEMENTS) for _ in range(rng.randint(0, 30))]
+        data = json.dumps(elements, ensure_ascii=False).encode()
+        cuts = sorted(rng.sample(range(1, len(data)), min(len(data) - 1, 10)))
+        chunks = [data[start:end] for start, end in zip([0, *cuts], [*cuts, len(data)])]
+        assert list(iter_json_array(chunks)) == elements
+
+
+@pytest.mark.parametrize(
+    "chunks", [[b"[1.", b"5]"], [b"[1e", b"3, 2]"], [b"[-", b"1E+", b"2]"]]
+)
+def test_number_split_at_chunk_boundary(chunks):
+    assert list(iter_json_array(chunks)) == json.loads(b"".join(chunks))
+
+
+@pytest.mark.parametrize("data", [b"", b"{}", b"[1 2]", b"[1,", b"[1.", b"[1.]"])
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_invalid(data, size):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(split(data, size)))
@@ -0,0 +1,132 @@
+import copy
+import json
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlmodel import SQLModel, create_engine
+from scripts.generate_database import generate_database, update_database
+from wakfu_items_api.categories import Categories
+from wakfu_items_api.database import BillOfMaterials, SourceHash
+from wakfu_items_api.database.item_documents import EFFECTS
+from wakfu_items_api.database.recipes import BlueprintRecipe
+from wakfu_items_api.request.stat_matrix import STAT_MATRIX_FILENAME
+from wakfu_items_api.snapshot import SNAPSHOT_FILENAME
+from wakfu_items_api.synthetic import SyntheticData
+
+ALLOCATED = (SourceHash, BlueprintRecipe, BillOfMaterials)
+"""Models whose id is allocated by the database, and so depends on the writes."""
+
+
+def copied(effects: list[dict], offset: int) -> list[dict]:
+    """Copy of a list of effects, with their definition ids moved by `offset`."""
+    effects = copy.deepcopy(effects)
+    for effect in effects:
+        effect["effect"]["definition"]["id"] += offset
+    return effects
+
+
+def changed(payloads: dict[str, list]) -> dict[str, list]:
+    """
+    Copy of the payloads with elements removed, added and changed, in the
+    items and in a few other categories.
+    """
+    payloads = copy.deepcopy(payloads)
+    items = {item["definition"]["item"]["id"]: item for item in payloads["items"]}
+    del items[3], items[4]
+    items[10]["definition"]["item"]["level"] += 1
+    definition = items[11]["definition"]
+    definition["equipEffects"] = definition["equipEffects"][::-1] + copied(
+        items[20]["definition"]["equipEffects"], 100000
+    )
+    items[12]["definition"]["useEffects"] = []
+    items[13].pop("description", None)
+    items[14]["title"]["fr"] = "Épée renommée"
+    added = copy.deepcopy(items[1])
+    added["definition"]["item"]["id"] = 61
+    for kind in ("useEffects", "useCriticalEffects", "equipEffects"):
+        added["definition"][kind] = copied(added["definition"][kind], 200000)
+    items[61] = added
+    payloads["items"] = list(items.values())
+
+    payloads[Categories.actions][0]["description"]["en"] = "Renamed action"
+    payloads[Categories.states].pop()
+    payloads[Categories.itemTypes][5]["definition"]["equipmentPositions"] = ["BACK"]
+    return payloads
+
+
+def write(payloads: dict[str, list], directory, version: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for category, data in payloads.items():
+        with (directory / f"{category}_{version}.json").open("w") as file:
+            json.dump(data, file, ensure_ascii=False)
+
+
+def contents(directory) -> dict[str, list]:
+    """
+    Rows of every table of the database of `directory`, sorted, without
+    the ids allocated while writing: the ids of `ALLOCATED` are left out and the
+    effect ids are replaced by the id of their item and their rank in it.
+    """
+    engine = create_engine(f"sqlite:///{directory / 'database.db'}")
+    tables = {}
+    with engine.connect() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            tables[table.name] = [
+                row._asdict() for row in connection.execute(select(table))
+            ]
+    engine.dispose()
+
+    for cls in ALLOCATED:
+        for row in tables[cls.__tablename__]:
+            del row["id"]
+
+    for effect, definition, description in EFFECTS.values():
+        ranks = {}
+        for row in sorted(tables[effect.__tablename__], key=lambda row: row["id"]):
+            item = row["itemdefinition_id"]
+            ranks[row["id"]] = (item, sum(key[0] == item for key in ranks.values()))
+        for row in tables[effect.__tablename__]:
+            row["id"] = ranks[row["id"]]
+        for row in tables[definition.__tablename__]:
+            row["effect_id"] = ranks[row["effect_id"]]
+        for row in tables[description.__tablename__]:
+            row["id"] = ranks[row["id"]]
+    return {
+        name: sorted(rows, key=lambda row: repr(sorted(row.items())))
+        for name, rows in tables.items()
+    }
+
+
+@pytest.mark.parametrize("seed", [None, 1])
+def test_update_matches_fresh_build(tmp_path, seed):
+    data = SyntheticData(items=60, description_rate=0.5)
+    first = data.generate()
+    if seed is None:
+        second = changed(first)
+    else:
+        second = SyntheticData(items=70, description_rate=0.5, seed=seed).generate()
+    write(first, tmp_path / "data", "1.0.0")
+    write(second, tmp_path / "data", "1.0.1")
+
+    updated, fresh = tmp_path / "updated", tmp_path / "fresh"
+    updated.mkdir()
+    fresh.mkdir()
+    data_path = str(tmp_path / "data")
+    generate_database("1.0.0", str(updated), "sqlite:///", data_path, verbose=False)
+    update_database("1.0.1", str(updated), "sqlite:///", data_path, verbose=False)
+    generate_database("1.0.1", str(fresh), "sqlite:///", data_path, verbose=False)
+
+    updated_tables, fresh_tables = contents(updated), contents(fresh)
+    assert updated_tables.keys() == fresh_tables.keys()
+    for name in fresh_tables:
+        assert updated_tables[name] == fresh_tables[name], name
+
+    with (
+        np.load(updated / STAT_MATRIX_FILENAME) as updated_matrix,
+        np.load(fresh / STAT_MATRIX_FILENAME) as fresh_matrix,
+    ):
+        for name in fresh_matrix.files:
+            np.testing.assert_array_equal(updated_matrix[name], fresh_matrix[name])
+    assert (updated / SNAPSHOT_FILENAME).read_bytes() == (
+        fresh / SNAPSHOT_FILENAME
+    ).read_bytes()
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from wakfu_items_api.streaming import CHUNK_SIZE, iter_json_array, stream_json_file
+
+FORMAT_VERSION = 1
+"""Version of the archive layout, bumped on incompatible changes."""
+
+MANIFEST_NAME = "manifest.json"
+"""Name of the archive member describing the other ones."""
+
+COMPRESSIONS = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+"""Supported compression methods of the archive members."""
+
+DEFAULT_COMPRESSION = "lzma"
+"""
+Compression of the archive members. LZMA is the smallest, and decompressing
+it is still much faster than decoding the JSON.
+"""
+
+
+def archive_path(directory: str | Path, version: str) -> Path:
+    """Path of the archive of a version in a directory."""
+    return Path(directory) / f"wakfu_{version}.zip"
+
+
+class ArchiveWriter:
+    """
+    Writes the categories of a game version into a single compressed archive:
+    one compact JSON member per category and a manifest holding the size,
+    number of elements and SHA-256 checksum of each of them.
+
+    Members can be added from several threads. The archive is only visible
+    at `path` once closed.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        version: str,
+        compression: str = DEFAULT_COMPRESSION,
+    ):
+        if compression not in COMPRESSIONS:
+            msg = f"Unknown compression {compression!r}, expected one of {tuple(COMPRESSIONS)}."
+            raise ValueError(msg)
+        self.path = Path(path)
+        self.version = version
+        self.compression = compression
+        self.members: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._temporary_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._zip = zipfile.ZipFile(
+            self._temporary_path, "w", compression=COMPRESSIONS[compression]
+        )
+
+    def add(self, category: str, elements: Iterable[Any]) -> dict:
+        """
+        Writes the elements of a category, encoded one at a time so that a
+        streamed category is never held in memory. Returns its manifest entry.
+        """
+        name = f"{category}.json"
+        checksum, size, count = hashlib.sha256(), 0, 0
+        with self._lock:
+            if category in self.members:
+                raise ValueError(f"Category {category} is already in the archive.")
+            with self._zip.open(name, "w", force_zip64=True) as member:
+
+                def write(text: str) -> None:
+                    nonlocal size
+                    data = text.encode("utf-8")
+                    checksum.update(data)
+                    member.write(data)
+                    size += len(data)
+
+                write("[")
+                for element in elements:
+                    if count:
+                        write(",")
+                    write(
+                        json.dumps(element, ensure_ascii=False, separators=(",", ":"))
+                    )
+                    count += 1
+                write("]")
+            entry = {
+                "name": name,
+                "size": size,
+                "count": count,
+                "sha256": checksum.hexdigest(),
+            }
+            self.members[category] = entry
+        return entry
+
+    def close(self) -> None:
+        """Writes the manifest and moves the archive to its final path."""
+        manifest = {
+            "format": FORMAT_VERSION,
+            "version": self.version,
+            "compression": self.compression,
+            "members": self.members,
+        }
+        self._zip.writestr(MANIFEST_NAME, json.dumps(manifest, indent=4))
+        self._zip.close()
+        os.replace(self._temporary_path, self.path)
+
+    def abort(self) -> None:
+        """Discards the archive being written."""
+        self._zip.close()
+        self._temporary_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class Archive:
+    """
+    Reads an archive written by `ArchiveWriter`. The elements of a category
+    are streamed straight out of its compressed member, and its checksum is
+    verified once the member has been read entirely.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        try:
+            manifest = json.loads(self._zip.read(MANIFEST_NAME))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"{self.path} has no manifest.")
+        if manifest.get("format") != FORMAT_VERSION:
+            self._zip.close()
+            msg = f"Unsupported archive format {manifest.get('format')}, expected {FORMAT_VERSION}."
+            raise ValueError(msg)
+        self.version: str = manifest["version"]
+        self.members: dict[str, dict] = manifest["members"]
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self.members)
+
+    def __contains__(self, category: str) -> bool:
+        return category in self.members
+
+    def iter_chunks(
+        self, category: str, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Yields the uncompressed content of a category chunk by chunk. Raises
+        ValueError after the last chunk if it does not match the manifest.
+        """
+        entry = self.members[category]
+        checksum, size = hashlib.sha256(), 0
+        with self._zip.open(entry["name"]) as member:
+            while chunk := member.read(chunk_size):
+                checksum.update(chunk)
+                size += len(chunk)
+                yield chunk
+        if size != entry["size"] or checksum.hexdigest() != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for {category} in {self.path}.")
+
+    def stream(self, category: str) -> Iterator[Any]:
+        """Yields the elements of a category one at a time."""
+        chunks = self.iter_chunks(category)
+        yield from iter_json_array(chunks)
+        # Consume what follows the array so that the checksum is verified.
+        for _ in chunks:
+            pass
+
+    def load(self, category: str) -> list:
+        """Returns all the elements of a category."""
+        return list(self.stream(category))
+
+    def verify(self) -> None:
+        """Reads every member, raising ValueError on the first corrupted one."""
+        for category in self.members:
+            for _ in self.iter_chunks(category):
+                pass
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def archive_directory(
+    directory: str | Path,
+    version: str,
+    output_directory: str | Path | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+) -> Path:
+    """
+    Archives the `{category}_{version}.json` files extracted in a directory,
+    streaming each of them. Returns the path of the archive, written in
+    `output_directory` (default is `directory`).
+    """
+    directory = Path(directory)
+    path = archive_path(output_directory or directory, version)
+    with ArchiveWriter(path, version, compression=compression) as writer:
+        for file in sorted(directory.glob(f"*_{version}.json")):
+            category = file.name[: -len(f"_{version}.json")]
+            writer.add(category, stream_json_file(file))
+    return path
+
+
+if __name__ == "__main__":
+    # Archives extracted files and compares sizes and read times:
+    # python -m wakfu_items_api.archive path/to/directory version [compression]
+    import sys
+    import time
+
+    directory, version = Path(sys.argv[1]), sys.argv[2]
+    compression = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_COMPRESSION
+    files = sorted(directory.glob(f"*_{version}.json"))
+
+    start = time.perf_counter()
+    path = archive_directory(directory, version, compression=compression)
+    print(f"archived in {time.perf_counter() - start:.2f}s")
+    size = sum(file.stat().st_size for file in files)
+    print(f"files: {size} bytes, archive: {path.stat().st_size} bytes")
+
+    start = time.perf_counter()
+    count = sum(sum(1 for _ in stream_json_file(file)) for file in files)
+    print(f"read {count} elements from files: {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    with Archive(path) as archive:
+        count = sum(
+            sum(1 for _ in archive.stream(category)) for category in archive.categories
+        )
+    print(f"read {count} elements from archive: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+from wakfu_items_api.streaming import CHUNK_SIZE
+
+DEFAULT_CACHE_DIRECTORY = Path.home() / ".cache" / "wakfu_items_api"
+"""Default directory where downloaded files are cached."""
+
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+"""Response headers stored alongside the payload to revalidate it later."""
+
+
+class FileCache:
+    """
+    Persistent cache of the files downloaded from the Wakfu CDN, keyed by
+    `(version, category)`. Each entry is made of the raw payload and of the
+    validator headers (`ETag`, `Last-Modified`) returned with it, along with
+    the SHA-256 checksum of the payload, verified when it is loaded.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIRECTORY):
+        self.directory = Path(directory)
+
+    def payload_path(self, version: str, category: str) -> Path:
+        """Path of the cached payload for a given version and category."""
+        return self.directory / version / f"{category}.json"
+
+    def headers_path(self, version: str, category: str) -> Path:
+        """Path of the cached validator headers for a given version and category."""
+        return self.directory / version / f"{category}.headers.json"
+
+    def partial_path(self, version: str, category: str) -> Path:
+        """Path where an interrupted download is kept to be resumed, see `Download`."""
+        return self.directory / version / f".{category}.json.part"
+
+    def load(self, version: str, category: str) -> bytes | None:
+        """
+        Returns the cached payload, or None if it is not cached or does not
+        match its checksum.
+        """
+        try:
+            payload = self.payload_path(version, category).read_bytes()
+        except FileNotFoundError:
+            return None
+        checksum = self._validators(version, category).get("sha256")
+        if checksum is not None and hashlib.sha256(payload).hexdigest() != checksum:
+            return None
+        return payload
+
+    def verified_path(self, version: str, category: str) -> Path | None:
+        """
+        Same as `load`, but returns the path of the cached payload, which is
+        hashed chunk by chunk instead of being read in memory.
+        """
+        payload_path = self.payload_path(version, category)
+        digest = hashlib.sha256()
+        try:
+            with payload_path.open("rb") as file:
+                while chunk := file.read(CHUNK_SIZE):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            return None
+        checksum = self._validators(version, category).get("sha256")
+        if checksum is not None and digest.hexdigest() != checksum:
+            return None
+        return payload_path
+
+    def _validators(self, version: str, category: str) -> dict[str, str]:
+        try:
+            with self.headers_path(version, category).open("r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def conditional_headers(self, version: str, category: str) -> dict[str, str]:
+        """
+        Returns the `If-None-Match` / `If-Modified-Since` request headers built
+        from the cached validators, or an empty dict if there are none.
+        """
+        validators = self._validators(version, category)
+        headers = {}
+        if "ETag" in validators:
+            headers["If-None-Match"] = validators["ETag"]
+        if "Last-Modified" in validators:
+            headers["If-Modified-Since"] = validators["Last-Modified"]
+        return headers
+
+    def store(
+        self, version: str, category: str, payload: bytes, headers: dict[str, str]
+    ) -> None:
+        """Stores a payload and its validator headers, replacing any previous entry."""
+        payload_path = self.payload_path(version, category)
+        payload_path.parent.mkdir(parents=True, exist_ok=True)
+
+        validators = {key: headers[key] for key in VALIDATOR_HEADERS if key in headers}
+        validators["sha256"] = hashlib.sha256(payload).hexdigest()
+        _atomic_write(payload_path, payload)
+        _atomic_write(
+            self.headers_path(version, category), json.dumps(validators).encode()
+        )
+
+    def store_stream(
+        self,
+        version: str,
+        category: str,
+        chunks: Iterable[bytes],
+        headers: dict[str, str],
+    ) -> Iterator[bytes]:
+        """
+        Yields the chunks of a payload while writing them to the cache. The
+        entry is only stored once every chunk has been consumed, so `headers`
+        may be filled while the chunks are produced.
+        """
+        payload_path = self.payload_path(version, category)
+        payload_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = payload_path.with_name(f".{payload_path.name}.tmp")
+
+        checksum = hashlib.sha256()
+        with temporary_path.open("wb") as file:
+            for chunk in chunks:
+                file.write(chunk)
+                checksum.update(chunk)
+                yield chunk
+        os.replace(temporary_path, payload_path)
+
+        validators = {key: headers[key] for key in VALIDATOR_HEADERS if key in headers}
+        validators["sha256"] = checksum.hexdigest()
+        _atomic_write(
+            self.headers_path(version, category), json.dumps(validators).encode()
+        )
+
+
+def _atomic_write(path: Path, content: bytes) -> None:
+    """Writes a file through a temporary file so readers never see it half written."""
+    temporary_path = path.with_name(f".{path.name}.tmp")
+    temporary_path.write_bytes(content)
+    os.replace(temporary_path, path)
@@ -3,3 +3,18 @@ from .states import State
 from .item_types import ItemType
 from .item_properties import ItemProperty
 from .items import Item
+from .source_hashes import SourceHash
+from .texts import Text
+from .item_summary import ItemSummary
+from .item_documents import ItemDocument
+from .recipes import (
+    Blueprint,
+    Recipe,
+    RecipeCategory,
+    RecipeIngredient,
+    RecipeResult,
+)
+from .jobs_items import JobItem
+from .resources import CollectibleResource, HarvestLoot, Resource, ResourceType
+from .crafting import BillOfMaterials
+from .item_loader import load_items
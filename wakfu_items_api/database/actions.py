@@ -1,5 +1,6 @@
 from typing import Optional
 from sqlmodel import Field, Relationship, SQLModel
+from .rows import Rows, translation_row
 
 
 class Action(SQLModel, table=True):
@@ -31,6 +32,20 @@ class Action(SQLModel, table=True):
             description=action_description,
         )
 
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        description_data = data.get("description", {})
+        action_id = definition.get("id")
+
+        rows = {cls.__tablename__: [(action_id, definition.get("effect", ""))]}
+        if description_data:
+            rows[ActionDescription.__tablename__] = [
+                translation_row(action_id, description_data)
+            ]
+        return rows
+
 
 class ActionDescription(SQLModel, table=True):
     id: int = Field(primary_key=True, index=True, foreign_key="action.id")
@@ -0,0 +1,109 @@
+import math
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import Connection, delete, insert, select
+from sqlmodel import Field, SQLModel
+from .recipes import Recipe, RecipeIngredient, RecipeResult
+
+Recipes = dict[int, tuple[int, list[tuple[int, int]]]]
+"""Recipe crafting each item: quantity produced and `(item id, quantity)` ingredients."""
+
+
+class BillOfMaterials(SQLModel, table=True):
+    """
+    Raw materials (items no recipe produces) needed to craft one unit of an
+    item, every intermediate recipe being expanded. Refreshed by
+    `refresh_bill_of_materials`.
+    """
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    itemId: int
+    materialId: int
+    quantity: float
+
+
+def crafting_recipes(connection: Connection) -> Recipes:
+    """
+    Loads the recipe crafting each item. Upgrade recipes are left out, and
+    when several recipes produce an item the one with the lowest id is used.
+    """
+    ingredients = defaultdict(list)
+    for recipe_id, item_id, quantity in connection.execute(
+        select(
+            RecipeIngredient.recipeId,
+            RecipeIngredient.itemId,
+            RecipeIngredient.quantity,
+        ).order_by(RecipeIngredient.id)
+    ):
+        ingredients[recipe_id].append((item_id, quantity))
+
+    recipes = {}
+    for recipe_id, item_id, quantity in connection.execute(
+        select(
+            RecipeResult.recipeId,
+            RecipeResult.productedItemId,
+            RecipeResult.productedItemQuantity,
+        )
+        .join(Recipe, Recipe.id == RecipeResult.recipeId)
+        .where(Recipe.isUpgrade.is_(False))
+        .order_by(RecipeResult.recipeId, RecipeResult.id)
+    ):
+        if item_id not in recipes and ingredients[recipe_id]:
+            recipes[item_id] = (quantity or 1, ingredients[recipe_id])
+    return recipes
+
+
+def bill_of_materials_closure(recipes: Recipes) -> dict[int, dict[int, float]]:
+    """
+    Expands the recipes down to the raw materials needed per unit of each
+    craftable item. An ingredient leading back to an item being expanded
+    (a cycle) is counted as a raw material. The expansion of an item on a
+    cycle depends on where the cycle was cut, so it is only reused for the
+    items it does not lead back to.
+    """
+    expansions = {}
+    expanding = {}
+
+    def expand(item_id: int) -> tuple[dict[int, float], float]:
+        """
+        Materials of an item, and the depth of the shallowest item being
+        expanded its expansion led back to (infinite if none).
+        """
+        if item_id in expansions:
+            return expansions[item_id], math.inf
+        depth = len(expanding)
+        produced, ingredients = recipes[item_id]
+        expanding[item_id] = depth
+        cut = math.inf
+        materials = defaultdict(float)
+        for ingredient_id, quantity in ingredients:
+            if ingredient_id in expanding:
+                cut = min(cut, expanding[ingredient_id])
+                materials[ingredient_id] += quantity / produced
+            elif ingredient_id in recipes:
+                ingredient_materials, ingredient_cut = expand(ingredient_id)
+                cut = min(cut, ingredient_cut)
+                for material_id, material_quantity in ingredient_materials.items():
+                    materials[material_id] += quantity * material_quantity / produced
+            else:
+                materials[ingredient_id] += quantity / produced
+        del expanding[item_id]
+        materials = dict(materials)
+        if cut > depth:
+            expansions[item_id] = materials
+        return materials, cut
+
+    return {item_id: expand(item_id)[0] for item_id in recipes}
+
+
+def refresh_bill_of_materials(connection: Connection) -> None:
+    """Rebuilds the `BillOfMaterials` table from the recipes."""
+    connection.execute(delete(BillOfMaterials))
+    closure = bill_of_materials_closure(crafting_recipes(connection))
+    rows = [
+        {"itemId": item_id, "materialId": material_id, "quantity": quantity}
+        for item_id, materials in sorted(closure.items())
+        for material_id, quantity in sorted(materials.items())
+    ]
+    if rows:
+        connection.execute(insert(BillOfMaterials), rows)
@@ -0,0 +1,158 @@
+from sqlalchemy import Connection, text
+from .crafting import BillOfMaterials
+from .item_summary import ItemSummary
+from .items import (
+    BaseParameters,
+    EquipEffect,
+    EquipEffectDefinition,
+    EquipEffectDescription,
+    ItemParameters,
+    UseCriticalEffectDefinition,
+    UseCriticalEffectDescription,
+    UseCriticalEffects,
+    UseEffectDefinition,
+    UseEffectDescription,
+    UseEffects,
+)
+from .recipes import BlueprintRecipe, RecipeIngredient, RecipeResult
+from .resources import CollectibleResource, HarvestLoot
+from .source_hashes import SourceHash
+
+INDEX_PLAN = [
+    (UseEffects, ("itemdefinition_id",)),
+    (UseCriticalEffects, ("itemdefinition_id",)),
+    (EquipEffect, ("itemdefinition_id",)),
+    (UseEffectDefinition, ("effect_id",)),
+    (UseEffectDefinition, ("actionId",)),
+    (UseCriticalEffectDefinition, ("effect_id",)),
+    (UseCriticalEffectDefinition, ("actionId",)),
+    (EquipEffectDefinition, ("effect_id",)),
+    (EquipEffectDefinition, ("actionId",)),
+    (UseEffectDescription, ("textId",)),
+    (UseCriticalEffectDescription, ("textId",)),
+    (EquipEffectDescription, ("textId",)),
+    (ItemParameters, ("level",)),
+    (BaseParameters, ("itemTypeId",)),
+    (BaseParameters, ("itemSetId",)),
+    (BaseParameters, ("rarity",)),
+    (ItemSummary, ("level", "rarity")),
+    (ItemSummary, ("itemTypeId",)),
+    (ItemSummary, ("itemSetId",)),
+    (RecipeIngredient, ("recipeId",)),
+    (RecipeIngredient, ("itemId",)),
+    (RecipeResult, ("recipeId",)),
+    (RecipeResult, ("productedItemId",)),
+    (BlueprintRecipe, ("blueprint_id",)),
+    (CollectibleResource, ("resourceId",)),
+    (HarvestLoot, ("listId",)),
+    (BillOfMaterials, ("itemId",)),
+    (SourceHash, ("tablename", "element_id")),
+]
+"""
+Secondary indexes on foreign-key and filter columns. They are not declared on
+the models so that they are only built once the tables are loaded.
+"""
+
+
+def index_name(model, columns: tuple[str, ...]) -> str:
+    """Name of the index of a model over some columns."""
+    return f"ix_{model.__tablename__}_{'_'.join(columns)}"
+
+
+def create_indexes(connection: Connection) -> None:
+    """Creates the indexes of `INDEX_PLAN` that do not exist yet."""
+    quote = connection.dialect.identifier_preparer.quote
+    for model, columns in INDEX_PLAN:
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS {quote(index_name(model, columns))} "
+                f"ON {quote(model.__tablename__)} "
+                f"({', '.join(quote(column) for column in columns)})"
+            )
+        )
+    connection.execute(text("ANALYZE"))
+
+
+def drop_indexes(connection: Connection) -> None:
+    """Drops the indexes of `INDEX_PLAN`."""
+    quote = connection.dialect.identifier_preparer.quote
+    for model, columns in INDEX_PLAN:
+        connection.execute(
+            text(f"DROP INDEX IF EXISTS {quote(index_name(model, columns))}")
+        )
+
+
+if __name__ == "__main__":
+    # Latency of common lookups without and with the secondary indexes, on a
+    # copy of a generated database: python -m ... path/to/database.db
+    import shutil
+    import sys
+    import tempfile
+    import time
+    from pathlib import Path
+    from sqlmodel import create_engine
+
+    LOOKUPS = {
+        "equip effects of an item": (
+            "SELECT definition.* FROM equipeffect AS effect "
+            "JOIN equipeffectdefinition AS definition ON definition.effect_id = effect.id "
+            "WHERE effect.itemdefinition_id = :item_id"
+        ),
+        "items giving an action": (
+            "SELECT DISTINCT effect.itemdefinition_id FROM equipeffectdefinition AS definition "
+            "JOIN equipeffect AS effect ON effect.id = definition.effect_id "
+            "WHERE definition.actionId = :action_id"
+        ),
+        "items of a type (join)": (
+            "SELECT title.id, title.fr FROM baseparameters AS base "
+            "JOIN itemtitle AS title ON title.id = base.id WHERE base.itemTypeId = :type_id"
+        ),
+        "items of a type (summary)": (
+            "SELECT id, fr FROM itemsummary WHERE itemTypeId = :type_id"
+        ),
+        "items of a level range and rarity (join)": (
+            "SELECT title.id, title.fr FROM itemparameters AS parameters "
+            "JOIN baseparameters AS base ON base.id = parameters.id "
+            "JOIN itemtitle AS title ON title.id = parameters.id "
+            "WHERE parameters.level BETWEEN :level AND :level + 10 AND base.rarity = :rarity"
+        ),
+        "items of a level range and rarity (summary)": (
+            "SELECT id, fr FROM itemsummary "
+            "WHERE level BETWEEN :level AND :level + 10 AND rarity = :rarity"
+        ),
+        "items of a set": "SELECT id FROM baseparameters WHERE itemSetId = :set_id",
+    }
+
+    def benchmark(connection: Connection) -> dict[str, float]:
+        """Mean latency in milliseconds of each lookup over a range of parameters."""
+        latencies = {}
+        for name, query in LOOKUPS.items():
+            statement = text(query)
+            start = time.perf_counter()
+            for value in range(1, 101):
+                parameters = {
+                    "item_id": value * 7,
+                    "action_id": value % 50,
+                    "type_id": value % 30,
+                    "level": value * 2,
+                    "rarity": value % 8,
+                    "set_id": value % 20,
+                }
+                connection.execute(statement, parameters).all()
+            latencies[name] = (time.perf_counter() - start) * 1000 / 100
+        return latencies
+
+    source = sys.argv[1] if len(sys.argv) > 1 else "database.db"
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "database.db"
+        shutil.copy(source, path)
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as connection:
+            drop_indexes(connection)
+            before = benchmark(connection)
+            create_indexes(connection)
+            after = benchmark(connection)
+
+    print(f"{'lookup':<45} {'before':>10} {'after':>10}")
+    for name in LOOKUPS:
+        print(f"{name:<45} {before[name]:>8.3f}ms {after[name]:>8.3f}ms")
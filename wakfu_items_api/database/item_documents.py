@@ -0,0 +1,254 @@
+import json
+import zlib
+from collections import defaultdict
+from typing import Any, Iterable
+from sqlalchemy import Connection, delete, insert, select
+from sqlmodel import Field, SQLModel
+from .items import (
+    BaseParameters,
+    EquipEffect,
+    EquipEffectDefinition,
+    EquipEffectDescription,
+    GraphicParameters,
+    Item,
+    ItemDescription,
+    ItemParameters,
+    ItemTitle,
+    UseCriticalEffectDefinition,
+    UseCriticalEffectDescription,
+    UseCriticalEffects,
+    UseEffectDefinition,
+    UseEffectDescription,
+    UseEffects,
+    UseParameters,
+)
+from .rows import chunked
+from .texts import LANGUAGES, Text
+
+ALL_LANGUAGES = "all"
+"""Language of the documents holding the texts in every language."""
+
+COMPRESSION_LEVEL = 6
+"""zlib level of the documents."""
+
+DOCUMENT_CHUNK_SIZE = 1000
+"""Number of items whose documents are built and written at once."""
+
+PARAMETERS = {
+    "baseParameters": (
+        BaseParameters.itemTypeId,
+        BaseParameters.itemSetId,
+        BaseParameters.rarity,
+        BaseParameters.bindType,
+        BaseParameters.minimumShardSlotNumber,
+        BaseParameters.maximumShardSlotNumber,
+    ),
+    "useParameters": (
+        UseParameters.useCostAp,
+        UseParameters.useCostMp,
+        UseParameters.useCostWp,
+        UseParameters.useRangeMin,
+        UseParameters.useRangeMax,
+        UseParameters.useTestFreeCell,
+        UseParameters.useTestLos,
+        UseParameters.useTestOnlyLine,
+        UseParameters.useTestNoBorderCell,
+        UseParameters.useWorldTarget,
+    ),
+    "graphicParameters": (GraphicParameters.gfxId, GraphicParameters.femaleGfxId),
+}
+"""Columns of each parameter object of an item, as in the Wakfu API."""
+
+EFFECTS = {
+    "useEffects": (UseEffects, UseEffectDefinition, UseEffectDescription),
+    "useCriticalEffects": (
+        UseCriticalEffects,
+        UseCriticalEffectDefinition,
+        UseCriticalEffectDescription,
+    ),
+    "equipEffects": (EquipEffect, EquipEffectDefinition, EquipEffectDescription),
+}
+"""Effect lists of an item, with their effect, definition and description models."""
+
+
+class ItemDocument(SQLModel, table=True):
+    """
+    Materialized document of an item: the item in the layout of the Wakfu
+    API, as compact JSON compressed with zlib, with its texts in every
+    language or in a single one. Refreshed by `refresh_item_documents`.
+    """
+
+    id: int = Field(primary_key=True)
+    language: str = Field(primary_key=True)
+    data: bytes
+
+
+def document_languages(language: str) -> tuple[str, ...]:
+    """Languages of the texts in the documents of `language`."""
+    return LANGUAGES if language == ALL_LANGUAGES else (language,)
+
+
+def _effects(
+    connection: Connection, kind: str, languages: tuple[str, ...], ids: list[int]
+) -> dict[int, list[dict[str, Any]]]:
+    """Effects of a kind of the items of `ids`, with their texts in `languages`."""
+    effect, definition, description = EFFECTS[kind]
+    rows = connection.execute(
+        select(
+            effect.itemdefinition_id,
+            definition.id,
+            definition.actionId,
+            definition.areaShape,
+            definition.areaSize,
+            definition.params,
+            description.id,
+            *(getattr(Text, language) for language in languages),
+        )
+        .join(definition, definition.effect_id == effect.id)
+        .outerjoin(description, description.id == effect.id)
+        .outerjoin(Text, Text.id == description.textId)
+        .where(effect.itemdefinition_id.in_(ids))
+        .order_by(effect.itemdefinition_id, effect.id)
+    )
+    effects = defaultdict(list)
+    for id, definition_id, action_id, shape, size, params, text, *texts in rows:
+        data = {
+            "definition": {
+                "id": definition_id,
+                "actionId": action_id,
+                "areaShape": shape,
+                "areaSize": [int(value) for value in size or []],
+                "params": [float(value) for value in params or []],
+            }
+        }
+        if text is not None:
+            data["description"] = dict(zip(languages, texts))
+        effects[id].append({"effect": data})
+    return effects
+
+
+def item_layouts(
+    connection: Connection, languages: tuple[str, ...], ids: Iterable[int]
+) -> dict[int, dict[str, Any]]:
+    """
+    Items of `ids` in the layout of the Wakfu API, with their texts in
+    `languages`, keyed by id in id order.
+    """
+    ids = list(ids)
+    columns = [column for group in PARAMETERS.values() for column in group]
+    rows = connection.execute(
+        select(
+            Item.id,
+            ItemParameters.level,
+            ItemParameters.properties,
+            ItemTitle.id,
+            ItemDescription.id,
+            *columns,
+            *(getattr(ItemTitle, language) for language in languages),
+            *(getattr(ItemDescription, language) for language in languages),
+        )
+        .join(ItemParameters, ItemParameters.id == Item.id)
+        .join(BaseParameters, BaseParameters.id == Item.id)
+        .join(UseParameters, UseParameters.id == Item.id)
+        .join(GraphicParameters, GraphicParameters.id == Item.id)
+        .outerjoin(ItemTitle, ItemTitle.id == Item.id)
+        .outerjoin(ItemDescription, ItemDescription.id == Item.id)
+        .where(Item.id.in_(ids))
+        .order_by(Item.id)
+    )
+    effects = {kind: _effects(connection, kind, languages, ids) for kind in EFFECTS}
+    items = {}
+    for id, level, properties, title, description, *values in rows:
+        parameters, values = values[: len(columns)], values[len(columns) :]
+        titles, descriptions = values[: len(languages)], values[len(languages) :]
+        item = {"id": id, "level": level}
+        start = 0
+        for name, group in PARAMETERS.items():
+            item[name] = {
+                column.key: value
+                for column, value in zip(group, parameters[start : start + len(group)])
+            }
+            start += len(group)
+        item["properties"] = [int(value) for value in properties or []]
+        data = {
+            "definition": {
+                "item": item,
+                **{kind: effects[kind].get(id, []) for kind in EFFECTS},
+            },
+        }
+        if title is not None:
+            data["title"] = dict(zip(languages, titles))
+        if description is not None:
+            data["description"] = dict(zip(languages, descriptions))
+        items[id] = data
+    return items
+
+
+def _write_documents(
+    connection: Connection, languages: tuple[str, ...], ids: Iterable[int]
+) -> int:
+    """Writes the documents of the items of `ids` in each of `languages`."""
+    written = 0
+    for chunk in chunked(ids, DOCUMENT_CHUNK_SIZE):
+        documents = [
+            {
+                "id": id,
+                "language": language,
+                "data": zlib.compress(
+                    json.dumps(
+                        item, ensure_ascii=False, separators=(",", ":")
+                    ).encode(),
+                    COMPRESSION_LEVEL,
+                ),
+            }
+            for language in languages
+            for id, item in item_layouts(
+                connection, document_languages(language), chunk
+            ).items()
+        ]
+        if documents:
+            connection.execute(insert(ItemDocument), documents)
+        written += len(documents)
+    return written
+
+
+def refresh_item_documents(
+    connection: Connection,
+    languages: tuple[str, ...] = (ALL_LANGUAGES,),
+    ids: Iterable[int] | None = None,
+) -> int:
+    """
+    Rebuilds the documents of the items of `ids`, or of every item if None,
+    in each of `languages` (`ALL_LANGUAGES` or a single language). The
+    documents of the items of `ids` that no longer exist are deleted, along
+    with those in other languages, and the documents in a language that has
+    none yet are built for every item. Returns the number of documents written.
+    """
+    unknown = set(languages) - {ALL_LANGUAGES, *LANGUAGES}
+    if unknown:
+        msg = f"Unknown languages {sorted(unknown)}, expected {ALL_LANGUAGES!r} or one of {LANGUAGES}."
+        raise ValueError(msg)
+    connection.execute(
+        delete(ItemDocument).where(ItemDocument.language.not_in(languages))
+    )
+    built = set(connection.scalars(select(ItemDocument.language).distinct()))
+
+    full = tuple(
+        language for language in languages if ids is None or language not in built
+    )
+    partial = tuple(language for language in languages if language not in full)
+    written = 0
+    if full:
+        connection.execute(delete(ItemDocument).where(ItemDocument.language.in_(full)))
+        all_ids = connection.scalars(select(Item.id).order_by(Item.id)).all()
+        written += _write_documents(connection, full, all_ids)
+    if partial:
+        ids = sorted(set(ids))
+        for chunk in chunked(ids, DOCUMENT_CHUNK_SIZE):
+            connection.execute(
+                delete(ItemDocument).where(
+                    ItemDocument.id.in_(chunk), ItemDocument.language.in_(partial)
+                )
+            )
+        written += _write_documents(connection, partial, ids)
+    return written
@@ -0,0 +1,123 @@
+from typing import Iterable
+from sqlalchemy.orm import joinedload, noload
+from sqlmodel import Session, select
+from .items import (
+    BaseParameters,
+    EquipEffect,
+    EquipEffectDescription,
+    Item,
+    ItemDefinition,
+    ItemDescription,
+    ItemParameters,
+    ItemTitle,
+    UseCriticalEffectDescription,
+    UseCriticalEffects,
+    UseEffectDescription,
+    UseEffects,
+)
+from .texts import LANGUAGES, Text
+
+EFFECTS = (
+    (ItemDefinition.useEffects, UseEffects, UseEffectDescription),
+    (
+        ItemDefinition.useCriticalEffects,
+        UseCriticalEffects,
+        UseCriticalEffectDescription,
+    ),
+    (ItemDefinition.equipEffects, EquipEffect, EquipEffectDescription),
+)
+"""Effect collections of an item definition, with their model and description model."""
+
+
+def item_graph_options(language: str | None = None, descriptions: bool = True) -> list:
+    """
+    Loader options fetching complete item graphs in a constant number of
+    queries: one for the item and its one-to-one relationships (joined), and
+    one per effect collection.
+
+    Args:
+        language: Only load the texts in this language (`fr`, `en`, `es` or `pt`).
+            Default is all of them.
+        descriptions: Load the item and effect descriptions. If False they are
+            left empty (None) without querying them.
+    """
+    if language is not None and language not in LANGUAGES:
+        msg = f"Unknown language {language!r}, expected one of {LANGUAGES}."
+        raise ValueError(msg)
+
+    def texts(loader, model):
+        if language is None:
+            return loader
+        return loader.load_only(model.id, getattr(model, language))
+
+    definition = joinedload(Item.definition)
+    options = [
+        texts(joinedload(Item.title), ItemTitle),
+        definition.joinedload(ItemDefinition.item).options(
+            joinedload(ItemParameters.baseParameters),
+            joinedload(ItemParameters.useParameters),
+            joinedload(ItemParameters.graphicParameters),
+        ),
+    ]
+    if descriptions:
+        options.append(texts(joinedload(Item.description), ItemDescription))
+    else:
+        options.append(noload(Item.description))
+
+    for relationship, model, description_model in EFFECTS:
+        effects = definition.subqueryload(relationship)
+        options.append(effects.joinedload(model.definition))
+        if descriptions:
+            options.append(
+                texts(
+                    effects.joinedload(model.description).joinedload(
+                        description_model.text
+                    ),
+                    Text,
+                )
+            )
+        else:
+            options.append(effects.noload(model.description))
+    return options
+
+
+def load_items(
+    session: Session,
+    ids: Iterable[int] | None = None,
+    item_type_id: int | None = None,
+    level_range: tuple[int | None, int | None] | None = None,
+    language: str | None = None,
+    descriptions: bool = True,
+) -> list[Item]:
+    """
+    Loads complete items, without any lazy load when walking their
+    relationships afterwards. Uses 4 queries whatever the number of items.
+
+    Args:
+        session: Database session.
+        ids: Ids of the items to load. Default is every item.
+        item_type_id: Only load the items of this type.
+        level_range: Only load the items whose level is within this inclusive
+            `(minimum, maximum)` range, None meaning no bound.
+        language: See `item_graph_options`.
+        descriptions: See `item_graph_options`.
+
+    Returns:
+        list[Item]: The items, ordered by id.
+    """
+    statement = select(Item).options(*item_graph_options(language, descriptions))
+    if ids is not None:
+        statement = statement.where(Item.id.in_(list(ids)))
+    if item_type_id is not None or level_range is not None:
+        statement = statement.join(ItemParameters, ItemParameters.id == Item.id)
+    if item_type_id is not None:
+        statement = statement.join(
+            BaseParameters, BaseParameters.id == ItemParameters.id
+        ).where(BaseParameters.itemTypeId == item_type_id)
+    if level_range is not None:
+        minimum, maximum = level_range
+        if minimum is not None:
+            statement = statement.where(ItemParameters.level >= minimum)
+        if maximum is not None:
+            statement = statement.where(ItemParameters.level <= maximum)
+    return list(session.exec(statement.order_by(Item.id)))
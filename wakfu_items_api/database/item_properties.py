@@ -1,4 +1,5 @@
 from sqlmodel import Field, SQLModel
+from .rows import Rows
 
 
 class ItemProperty(SQLModel, table=True):
@@ -9,3 +10,8 @@ class ItemProperty(SQLModel, table=True):
     @classmethod
     def from_wakfu_api(cls, data: dict) -> "ItemProperty":
         return cls.model_validate(data)
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        return {cls.__tablename__: [(data["id"], data["name"], data["description"])]}
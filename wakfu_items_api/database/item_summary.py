@@ -0,0 +1,55 @@
+from typing import Optional
+from sqlalchemy import Connection, delete, insert, select
+from sqlmodel import Field, SQLModel
+from .items import BaseParameters, Item, ItemParameters, ItemTitle
+
+
+class ItemSummary(SQLModel, table=True):
+    """
+    Denormalized summary of an item (names, level, rarity, type and set) held
+    in a single row for hot reads. Refreshed by `refresh_item_summary`.
+    """
+
+    id: int = Field(primary_key=True)
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+    level: Optional[int]
+    rarity: Optional[int]
+    itemTypeId: Optional[int]
+    itemSetId: Optional[int]
+
+
+def refresh_item_summary(connection: Connection) -> None:
+    """Rebuilds the `ItemSummary` table from the normalized tables."""
+    connection.execute(delete(ItemSummary))
+    connection.execute(
+        insert(ItemSummary).from_select(
+            [
+                "id",
+                "fr",
+                "en",
+                "es",
+                "pt",
+                "level",
+                "rarity",
+                "itemTypeId",
+                "itemSetId",
+            ],
+            select(
+                Item.id,
+                ItemTitle.fr,
+                ItemTitle.en,
+                ItemTitle.es,
+                ItemTitle.pt,
+                ItemParameters.level,
+                BaseParameters.rarity,
+                BaseParameters.itemTypeId,
+                BaseParameters.itemSetId,
+            )
+            .outerjoin(ItemTitle, ItemTitle.id == Item.id)
+            .outerjoin(ItemParameters, ItemParameters.id == Item.id)
+            .outerjoin(BaseParameters, BaseParameters.id == Item.id),
+        )
+    )
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
+from .rows import Rows, translation_row
 
 
 class ItemType(SQLModel, table=True):
@@ -37,6 +38,31 @@ class ItemType(SQLModel, table=True):
             title=item_type_title,
         )
 
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        item_type_id = definition.get("id")
+
+        rows = {
+            cls.__tablename__: [
+                (
+                    item_type_id,
+                    definition.get("parentId"),
+                    definition.get("equipmentPositions", []),
+                    definition.get("equipmentDisabledPositions", []),
+                    definition.get("isRecyclable", False),
+                    definition.get("isVisibleInAnimation", False),
+                )
+            ]
+        }
+        if title_data:
+            rows[ItemTypeTitle.__tablename__] = [
+                translation_row(item_type_id, title_data)
+            ]
+        return rows
+
 
 class ItemTypeTitle(SQLModel, table=True):
     id: int = Field(primary_key=True, index=True, foreign_key="itemtype.id")
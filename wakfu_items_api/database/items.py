@@ -1,5 +1,8 @@
+from itertools import count
 from typing import List, Optional
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel
+from .rows import Rows, merge_rows, translation_row
+from .texts import Text
 
 
 class Item(SQLModel, table=True):
@@ -17,17 +20,36 @@ class Item(SQLModel, table=True):
         definition = ItemDefinition.from_wakfu_api(id=id, data=data["definition"])
 
         title = None
-        if "title" in data:
+        if data.get("title") is not None:
             title = ItemTitle.from_wakfu_api(id=id, data=data["title"])
 
         description = None
-        if "description" in data:
+        if data.get("description") is not None:
             description = ItemDescription.from_wakfu_api(
                 id=id, data=data["description"]
             )
 
         return cls(id=id, title=title, description=description, definition=definition)
 
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        """
+        id = data["definition"]["item"]["id"]
+        rows = {cls.__tablename__: [(id,)]}
+        if data.get("title") is not None:
+            rows[ItemTitle.__tablename__] = [
+                ItemTitle.row_from_wakfu_api(id=id, data=data["title"])
+            ]
+        if data.get("description") is not None:
+            rows[ItemDescription.__tablename__] = [
+                ItemDescription.row_from_wakfu_api(id=id, data=data["description"])
+            ]
+        return merge_rows(
+            rows, ItemDefinition.rows_from_wakfu_api(id=id, data=data["definition"])
+        )
+
 
 class ItemTitle(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="item.id")
@@ -49,6 +71,13 @@ class ItemTitle(SQLModel, table=True):
             pt=data.get("pt"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return translation_row(id, data)
+
 
 class ItemDescription(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="item.id")
@@ -70,6 +99,13 @@ class ItemDescription(SQLModel, table=True):
             pt=data.get("pt"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return translation_row(id, data)
+
 
 class ItemDefinition(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="item.id")
@@ -105,6 +141,28 @@ class ItemDefinition(SQLModel, table=True):
             item=item,
         )
 
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        Effect ids are generated by the database and are given placeholders.
+        """
+        rows = {cls.__tablename__: [(id,)]}
+        placeholders = count(-1, -1)
+        for effects_cls, key in (
+            (UseEffects, "useEffects"),
+            (UseCriticalEffects, "useCriticalEffects"),
+            (EquipEffect, "equipEffects"),
+        ):
+            for effect in data.get(key, []):
+                merge_rows(
+                    rows,
+                    effects_cls.rows_from_wakfu_api(
+                        id=id, effect_id=next(placeholders), data=effect
+                    ),
+                )
+        return merge_rows(rows, ItemParameters.rows_from_wakfu_api(data=data["item"]))
+
 
 class UseEffects(SQLModel, table=True):
     id: Optional[int] = Field(primary_key=True, default=None)
@@ -125,13 +183,35 @@ class UseEffects(SQLModel, table=True):
             )
 
         description = None
-        if "description" in data["effect"]:
+        if data["effect"].get("description") is not None:
             description = UseEffectDescription.from_wakfu_api(
                 id=id, data=data["effect"].get("description")
             )
 
         return cls(itemdefinition_id=id, definition=definition, description=description)
 
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, effect_id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        `effect_id` is the placeholder of the effect id.
+        """
+        rows = {cls.__tablename__: [(effect_id, id)]}
+        if "definition" in data["effect"]:
+            rows[UseEffectDefinition.__tablename__] = [
+                UseEffectDefinition.row_from_wakfu_api(
+                    effect_id=effect_id, data=data["effect"].get("definition")
+                )
+            ]
+        if data["effect"].get("description") is not None:
+            merge_rows(
+                rows,
+                UseEffectDescription.rows_from_wakfu_api(
+                    id=effect_id, data=data["effect"].get("description")
+                ),
+            )
+        return rows
+
 
 class UseEffectDefinition(SQLModel, table=True):
     id: int = Field(primary_key=True)
@@ -155,26 +235,42 @@ class UseEffectDefinition(SQLModel, table=True):
             params=data.get("params"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, effect_id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (
+            data.get("id"),
+            effect_id,
+            data.get("actionId"),
+            data.get("areaShape"),
+            data.get("areaSize"),
+            data.get("params"),
+        )
+
 
 class UseEffectDescription(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="useeffects.id")
-    fr: Optional[str]
-    en: Optional[str]
-    es: Optional[str]
-    pt: Optional[str]
+    textId: int = Field(foreign_key="text.id")
+    text: Text = Relationship()
 
     @classmethod
     def from_wakfu_api(cls, id: int, data: dict) -> "UseEffectDescription":
         """
         Create a UseEffectDescription instance from the Wakfu API data.
+        Identical descriptions share the same `Text`.
         """
-        return cls(
-            id=id,
-            fr=data.get("fr"),
-            en=data.get("en"),
-            es=data.get("es"),
-            pt=data.get("pt"),
-        )
+        text = Text.from_wakfu_api(data)
+        return cls(id=id, textId=text.id, text=text)
+
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        """
+        text_row = Text.row_from_wakfu_api(data)
+        return {cls.__tablename__: [(id, text_row[0])], Text.__tablename__: [text_row]}
 
 
 class UseCriticalEffects(SQLModel, table=True):
@@ -196,13 +292,35 @@ class UseCriticalEffects(SQLModel, table=True):
             )
 
         description = None
-        if "description" in data["effect"]:
+        if data["effect"].get("description") is not None:
             description = UseCriticalEffectDescription.from_wakfu_api(
                 id=id, data=data["effect"].get("description")
             )
 
         return cls(itemdefinition_id=id, definition=definition, description=description)
 
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, effect_id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        `effect_id` is the placeholder of the effect id.
+        """
+        rows = {cls.__tablename__: [(effect_id, id)]}
+        if "definition" in data["effect"]:
+            rows[UseCriticalEffectDefinition.__tablename__] = [
+                UseCriticalEffectDefinition.row_from_wakfu_api(
+                    effect_id=effect_id, data=data["effect"].get("definition")
+                )
+            ]
+        if data["effect"].get("description") is not None:
+            merge_rows(
+                rows,
+                UseCriticalEffectDescription.rows_from_wakfu_api(
+                    id=effect_id, data=data["effect"].get("description")
+                ),
+            )
+        return rows
+
 
 class UseCriticalEffectDefinition(SQLModel, table=True):
     id: int = Field(primary_key=True)
@@ -226,26 +344,42 @@ class UseCriticalEffectDefinition(SQLModel, table=True):
             params=data.get("params"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, effect_id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (
+            data.get("id"),
+            effect_id,
+            data.get("actionId"),
+            data.get("areaShape"),
+            data.get("areaSize"),
+            data.get("params"),
+        )
+
 
 class UseCriticalEffectDescription(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="usecriticaleffects.id")
-    fr: Optional[str]
-    en: Optional[str]
-    es: Optional[str]
-    pt: Optional[str]
+    textId: int = Field(foreign_key="text.id")
+    text: Text = Relationship()
 
     @classmethod
     def from_wakfu_api(cls, id: int, data: dict) -> "UseCriticalEffectDescription":
         """
         Create an UseCriticalEffectDescription instance from the Wakfu API data.
+        Identical descriptions share the same `Text`.
         """
-        return cls(
-            id=id,
-            fr=data.get("fr"),
-            en=data.get("en"),
-            es=data.get("es"),
-            pt=data.get("pt"),
-        )
+        text = Text.from_wakfu_api(data)
+        return cls(id=id, textId=text.id, text=text)
+
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        """
+        text_row = Text.row_from_wakfu_api(data)
+        return {cls.__tablename__: [(id, text_row[0])], Text.__tablename__: [text_row]}
 
 
 class EquipEffect(SQLModel, table=True):
@@ -257,7 +391,7 @@ class EquipEffect(SQLModel, table=True):
     @classmethod
     def from_wakfu_api(cls, id: int, data: dict) -> "EquipEffect":
         """
-        Create a EquipEffect instance from the Wakfu API data.
+        Create an EquipEffect instance from the Wakfu API data.
         """
 
         definition = None
@@ -267,13 +401,35 @@ class EquipEffect(SQLModel, table=True):
             )
 
         description = None
-        if "description" in data["effect"]:
+        if data["effect"].get("description") is not None:
             description = EquipEffectDescription.from_wakfu_api(
                 id=id, data=data["effect"].get("description")
             )
 
         return cls(itemdefinition_id=id, definition=definition, description=description)
 
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, effect_id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        `effect_id` is the placeholder of the effect id.
+        """
+        rows = {cls.__tablename__: [(effect_id, id)]}
+        if "definition" in data["effect"]:
+            rows[EquipEffectDefinition.__tablename__] = [
+                EquipEffectDefinition.row_from_wakfu_api(
+                    effect_id=effect_id, data=data["effect"].get("definition")
+                )
+            ]
+        if data["effect"].get("description") is not None:
+            merge_rows(
+                rows,
+                EquipEffectDescription.rows_from_wakfu_api(
+                    id=effect_id, data=data["effect"].get("description")
+                ),
+            )
+        return rows
+
 
 class EquipEffectDefinition(SQLModel, table=True):
     id: int = Field(primary_key=True)
@@ -297,26 +453,42 @@ class EquipEffectDefinition(SQLModel, table=True):
             params=data.get("params"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, effect_id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (
+            data.get("id"),
+            effect_id,
+            data.get("actionId"),
+            data.get("areaShape"),
+            data.get("areaSize"),
+            data.get("params"),
+        )
+
 
 class EquipEffectDescription(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="equipeffect.id")
-    fr: Optional[str]
-    en: Optional[str]
-    es: Optional[str]
-    pt: Optional[str]
+    textId: int = Field(foreign_key="text.id")
+    text: Text = Relationship()
 
     @classmethod
     def from_wakfu_api(cls, id: int, data: dict) -> "EquipEffectDescription":
         """
         Create an EquipEffectDescription instance from the Wakfu API data.
+        Identical descriptions share the same `Text`.
         """
-        return cls(
-            id=id,
-            fr=data.get("fr"),
-            en=data.get("en"),
-            es=data.get("es"),
-            pt=data.get("pt"),
-        )
+        text = Text.from_wakfu_api(data)
+        return cls(id=id, textId=text.id, text=text)
+
+    @classmethod
+    def rows_from_wakfu_api(cls, id: int, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        """
+        text_row = Text.row_from_wakfu_api(data)
+        return {cls.__tablename__: [(id, text_row[0])], Text.__tablename__: [text_row]}
 
 
 class ItemParameters(SQLModel, table=True):
@@ -350,6 +522,27 @@ class ItemParameters(SQLModel, table=True):
             level=data.get("level"),
         )
 
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """
+        Same as `from_wakfu_api`, but builds the rows directly, without validation.
+        """
+        id = data["id"]
+        return {
+            cls.__tablename__: [(id, data.get("properties"), data.get("level"))],
+            BaseParameters.__tablename__: [
+                BaseParameters.row_from_wakfu_api(id=id, data=data["baseParameters"])
+            ],
+            UseParameters.__tablename__: [
+                UseParameters.row_from_wakfu_api(id=id, data=data["useParameters"])
+            ],
+            GraphicParameters.__tablename__: [
+                GraphicParameters.row_from_wakfu_api(
+                    id=id, data=data["graphicParameters"]
+                )
+            ],
+        }
+
 
 class BaseParameters(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="itemparameters.id")
@@ -375,6 +568,21 @@ class BaseParameters(SQLModel, table=True):
             maximumShardSlotNumber=data.get("maximumShardSlotNumber"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (
+            id,
+            data.get("itemTypeId"),
+            data.get("itemSetId"),
+            data.get("rarity"),
+            data.get("bindType"),
+            data.get("minimumShardSlotNumber"),
+            data.get("maximumShardSlotNumber"),
+        )
+
 
 class UseParameters(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="itemparameters.id")
@@ -408,6 +616,25 @@ class UseParameters(SQLModel, table=True):
             useWorldTarget=data.get("useWorldTarget"),
         )
 
+    @classmethod
+    def row_from_wakfu_api(cls, id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (
+            id,
+            data.get("useCostAp"),
+            data.get("useCostMp"),
+            data.get("useCostWp"),
+            data.get("useRangeMin"),
+            data.get("useRangeMax"),
+            data.get("useTestFreeCell"),
+            data.get("useTestLos"),
+            data.get("useTestOnlyLine"),
+            data.get("useTestNoBorderCell"),
+            data.get("useWorldTarget"),
+        )
+
 
 class GraphicParameters(SQLModel, table=True):
     id: int = Field(primary_key=True, foreign_key="itemparameters.id")
@@ -424,3 +651,10 @@ class GraphicParameters(SQLModel, table=True):
             gfxId=data.get("gfxId"),
             femaleGfxId=data.get("femaleGfxId"),
         )
+
+    @classmethod
+    def row_from_wakfu_api(cls, id: int, data: dict) -> tuple:
+        """
+        Same as `from_wakfu_api`, but builds the row directly, without validation.
+        """
+        return (id, data.get("gfxId"), data.get("femaleGfxId"))
@@ -0,0 +1,100 @@
+from typing import Optional
+from sqlmodel import Field, Relationship, SQLModel
+from .rows import Rows, translation_row
+
+
+class JobItem(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    level: int
+    rarity: int
+    itemTypeId: int
+    gfxId: int
+    femaleGfxId: int
+    title: Optional["JobItemTitle"] = Relationship()
+    description: Optional["JobItemDescription"] = Relationship()
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "JobItem":
+        definition = data.get("definition", {})
+        graphic_parameters = definition.get("graphicParameters", {})
+        title_data = data.get("title", {})
+        description_data = data.get("description", {})
+        job_item_id = definition.get("id")
+
+        job_item_title = None
+        if title_data:
+            job_item_title = JobItemTitle(
+                id=job_item_id,
+                fr=title_data.get("fr"),
+                en=title_data.get("en"),
+                es=title_data.get("es"),
+                pt=title_data.get("pt"),
+            )
+
+        job_item_description = None
+        if description_data:
+            job_item_description = JobItemDescription(
+                id=job_item_id,
+                fr=description_data.get("fr"),
+                en=description_data.get("en"),
+                es=description_data.get("es"),
+                pt=description_data.get("pt"),
+            )
+
+        return cls(
+            id=job_item_id,
+            level=definition.get("level", 0),
+            rarity=definition.get("rarity", 0),
+            itemTypeId=definition.get("itemTypeId"),
+            gfxId=graphic_parameters.get("gfxId", 0),
+            femaleGfxId=graphic_parameters.get("femaleGfxId", 0),
+            title=job_item_title,
+            description=job_item_description,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        graphic_parameters = definition.get("graphicParameters", {})
+        title_data = data.get("title", {})
+        description_data = data.get("description", {})
+        job_item_id = definition.get("id")
+
+        rows = {
+            cls.__tablename__: [
+                (
+                    job_item_id,
+                    definition.get("level", 0),
+                    definition.get("rarity", 0),
+                    definition.get("itemTypeId"),
+                    graphic_parameters.get("gfxId", 0),
+                    graphic_parameters.get("femaleGfxId", 0),
+                )
+            ]
+        }
+        if title_data:
+            rows[JobItemTitle.__tablename__] = [
+                translation_row(job_item_id, title_data)
+            ]
+        if description_data:
+            rows[JobItemDescription.__tablename__] = [
+                translation_row(job_item_id, description_data)
+            ]
+        return rows
+
+
+class JobItemTitle(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True, foreign_key="jobitem.id")
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+
+
+class JobItemDescription(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True, foreign_key="jobitem.id")
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
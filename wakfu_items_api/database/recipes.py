@@ -0,0 +1,234 @@
+from typing import List, Optional
+from sqlmodel import Field, Relationship, SQLModel
+from .rows import Rows, translation_row
+
+RECIPE_SLOTS = 100
+"""
+Upper bound on the number of ingredients (or results) of a recipe. The API
+gives them no id, so theirs is `recipeId * RECIPE_SLOTS + order`.
+"""
+
+
+def slot_id(recipe_id: int, order: int) -> int:
+    """
+    Id of the ingredient (or result) of a recipe at `order`. Raises ValueError
+    if the order does not fit in `RECIPE_SLOTS`, as its id would collide with
+    that of another ingredient.
+    """
+    if not 0 <= order < RECIPE_SLOTS:
+        msg = (
+            f"Order {order} of recipe {recipe_id} is out of range, "
+            f"expected 0 to {RECIPE_SLOTS - 1}."
+        )
+        raise ValueError(msg)
+    return recipe_id * RECIPE_SLOTS + order
+
+
+class RecipeCategory(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    isArchive: bool
+    isNoCraft: bool
+    isHidden: bool
+    xpFactor: int
+    isInnate: bool
+    title: Optional["RecipeCategoryTitle"] = Relationship()
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "RecipeCategory":
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        category_id = definition.get("id")
+
+        category_title = None
+        if title_data:
+            category_title = RecipeCategoryTitle(
+                id=category_id,
+                fr=title_data.get("fr"),
+                en=title_data.get("en"),
+                es=title_data.get("es"),
+                pt=title_data.get("pt"),
+            )
+
+        return cls(
+            id=category_id,
+            isArchive=definition.get("isArchive", False),
+            isNoCraft=definition.get("isNoCraft", False),
+            isHidden=definition.get("isHidden", False),
+            xpFactor=definition.get("xpFactor", 0),
+            isInnate=definition.get("isInnate", False),
+            title=category_title,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        category_id = definition.get("id")
+
+        rows = {
+            cls.__tablename__: [
+                (
+                    category_id,
+                    definition.get("isArchive", False),
+                    definition.get("isNoCraft", False),
+                    definition.get("isHidden", False),
+                    definition.get("xpFactor", 0),
+                    definition.get("isInnate", False),
+                )
+            ]
+        }
+        if title_data:
+            rows[RecipeCategoryTitle.__tablename__] = [
+                translation_row(category_id, title_data)
+            ]
+        return rows
+
+
+class RecipeCategoryTitle(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True, foreign_key="recipecategory.id")
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+
+
+class Recipe(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    categoryId: int
+    level: int
+    xpRatio: int
+    isUpgrade: bool
+    upgradeItemId: int
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "Recipe":
+        return cls(
+            id=data["id"],
+            categoryId=data.get("categoryId"),
+            level=data.get("level", 0),
+            xpRatio=data.get("xpRatio", 0),
+            isUpgrade=data.get("isUpgrade", False),
+            upgradeItemId=data.get("upgradeItemId", 0),
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        return {
+            cls.__tablename__: [
+                (
+                    data["id"],
+                    data.get("categoryId"),
+                    data.get("level", 0),
+                    data.get("xpRatio", 0),
+                    data.get("isUpgrade", False),
+                    data.get("upgradeItemId", 0),
+                )
+            ]
+        }
+
+
+class RecipeIngredient(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    recipeId: int
+    itemId: int
+    quantity: int
+    ingredientOrder: int
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "RecipeIngredient":
+        order = data["ingredientOrder"]
+        return cls(
+            id=slot_id(data["recipeId"], order),
+            recipeId=data["recipeId"],
+            itemId=data["itemId"],
+            quantity=data.get("quantity", 1),
+            ingredientOrder=order,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        order = data["ingredientOrder"]
+        return {
+            cls.__tablename__: [
+                (
+                    slot_id(data["recipeId"], order),
+                    data["recipeId"],
+                    data["itemId"],
+                    data.get("quantity", 1),
+                    order,
+                )
+            ]
+        }
+
+
+class RecipeResult(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    recipeId: int
+    productedItemId: int
+    productedItemQuantity: int
+    productOrder: int
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "RecipeResult":
+        order = data["productOrder"]
+        return cls(
+            id=slot_id(data["recipeId"], order),
+            recipeId=data["recipeId"],
+            productedItemId=data["productedItemId"],
+            productedItemQuantity=data.get("productedItemQuantity", 1),
+            productOrder=order,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        order = data["productOrder"]
+        return {
+            cls.__tablename__: [
+                (
+                    slot_id(data["recipeId"], order),
+                    data["recipeId"],
+                    data["productedItemId"],
+                    data.get("productedItemQuantity", 1),
+                    order,
+                )
+            ]
+        }
+
+
+class Blueprint(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    recipes: List["BlueprintRecipe"] = Relationship()
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "Blueprint":
+        blueprint_id = data["blueprintId"]
+        return cls(
+            id=blueprint_id,
+            recipes=[
+                BlueprintRecipe(blueprint_id=blueprint_id, recipeId=recipe_id)
+                for recipe_id in data.get("recipeId", [])
+            ],
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        blueprint_id = data["blueprintId"]
+        rows = {cls.__tablename__: [(blueprint_id,)]}
+        recipe_ids = data.get("recipeId", [])
+        if recipe_ids:
+            rows[BlueprintRecipe.__tablename__] = [
+                (-index, blueprint_id, recipe_id)
+                for index, recipe_id in enumerate(recipe_ids, start=1)
+            ]
+        return rows
+
+
+class BlueprintRecipe(SQLModel, table=True):
+    id: Optional[int] = Field(primary_key=True, default=None)
+    blueprint_id: int = Field(foreign_key="blueprint.id")
+    recipeId: int
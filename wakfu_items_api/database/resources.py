@@ -0,0 +1,207 @@
+from typing import Optional
+from sqlmodel import Field, Relationship, SQLModel
+from .rows import Rows, translation_row
+
+
+class ResourceType(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    affectWakfu: bool
+    title: Optional["ResourceTypeTitle"] = Relationship()
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "ResourceType":
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        resource_type_id = definition.get("id")
+
+        resource_type_title = None
+        if title_data:
+            resource_type_title = ResourceTypeTitle(
+                id=resource_type_id,
+                fr=title_data.get("fr"),
+                en=title_data.get("en"),
+                es=title_data.get("es"),
+                pt=title_data.get("pt"),
+            )
+
+        return cls(
+            id=resource_type_id,
+            affectWakfu=definition.get("affectWakfu", False),
+            title=resource_type_title,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        resource_type_id = definition.get("id")
+
+        rows = {
+            cls.__tablename__: [
+                (resource_type_id, definition.get("affectWakfu", False))
+            ]
+        }
+        if title_data:
+            rows[ResourceTypeTitle.__tablename__] = [
+                translation_row(resource_type_id, title_data)
+            ]
+        return rows
+
+
+class ResourceTypeTitle(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True, foreign_key="resourcetype.id")
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+
+
+class Resource(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    resourceType: int
+    isBlocking: bool
+    idealRainRangeMin: int
+    idealRainRangeMax: int
+    iconGfxId: int
+    lastEvolutionStep: int
+    usableByHeroes: bool
+    title: Optional["ResourceTitle"] = Relationship()
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "Resource":
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        resource_id = definition.get("id")
+
+        resource_title = None
+        if title_data:
+            resource_title = ResourceTitle(
+                id=resource_id,
+                fr=title_data.get("fr"),
+                en=title_data.get("en"),
+                es=title_data.get("es"),
+                pt=title_data.get("pt"),
+            )
+
+        return cls(
+            id=resource_id,
+            resourceType=definition.get("resourceType"),
+            isBlocking=definition.get("isBlocking", False),
+            idealRainRangeMin=definition.get("idealRainRangeMin", 0),
+            idealRainRangeMax=definition.get("idealRainRangeMax", 0),
+            iconGfxId=definition.get("iconGfxId", 0),
+            lastEvolutionStep=definition.get("lastEvolutionStep", 0),
+            usableByHeroes=definition.get("usableByHeroes", False),
+            title=resource_title,
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        definition = data.get("definition", {})
+        title_data = data.get("title", {})
+        resource_id = definition.get("id")
+
+        rows = {
+            cls.__tablename__: [
+                (
+                    resource_id,
+                    definition.get("resourceType"),
+                    definition.get("isBlocking", False),
+                    definition.get("idealRainRangeMin", 0),
+                    definition.get("idealRainRangeMax", 0),
+                    definition.get("iconGfxId", 0),
+                    definition.get("lastEvolutionStep", 0),
+                    definition.get("usableByHeroes", False),
+                )
+            ]
+        }
+        if title_data:
+            rows[ResourceTitle.__tablename__] = [
+                translation_row(resource_id, title_data)
+            ]
+        return rows
+
+
+class ResourceTitle(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True, foreign_key="resource.id")
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+
+
+class CollectibleResource(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    skillId: int
+    resourceId: int
+    resourceIndex: int
+    resourceNextIndex: int
+    skillLevelRequired: int
+    collectItemId: int
+    collectLootListId: int
+    duration: int
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "CollectibleResource":
+        return cls(
+            id=data["id"],
+            skillId=data.get("skillId"),
+            resourceId=data.get("resourceId"),
+            resourceIndex=data.get("resourceIndex", 0),
+            resourceNextIndex=data.get("resourceNextIndex", 0),
+            skillLevelRequired=data.get("skillLevelRequired", 0),
+            collectItemId=data.get("collectItemId", 0),
+            collectLootListId=data.get("collectLootListId", 0),
+            duration=data.get("duration", 0),
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        return {
+            cls.__tablename__: [
+                (
+                    data["id"],
+                    data.get("skillId"),
+                    data.get("resourceId"),
+                    data.get("resourceIndex", 0),
+                    data.get("resourceNextIndex", 0),
+                    data.get("skillLevelRequired", 0),
+                    data.get("collectItemId", 0),
+                    data.get("collectLootListId", 0),
+                    data.get("duration", 0),
+                )
+            ]
+        }
+
+
+class HarvestLoot(SQLModel, table=True):
+    id: int = Field(primary_key=True, index=True)
+    listId: int
+    itemId: int
+    dropRate: float
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "HarvestLoot":
+        return cls(
+            id=data["id"],
+            listId=data.get("listId", 0),
+            itemId=data.get("itemId"),
+            dropRate=data.get("dropRate", 0.0),
+        )
+
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        return {
+            cls.__tablename__: [
+                (
+                    data["id"],
+                    data.get("listId", 0),
+                    data.get("itemId"),
+                    data.get("dropRate", 0.0),
+                )
+            ]
+        }
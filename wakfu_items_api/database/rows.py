@@ -0,0 +1,284 @@
+from collections import defaultdict
+from itertools import count, islice
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import Connection, Engine, Table, delete, inspect, insert, select
+from sqlalchemy.orm import RelationshipDirection
+from sqlmodel import SQLModel
+
+from wakfu_items_api.profiling import IngestProfile
+
+from .source_hashes import SourceHash
+from .texts import Text
+
+Rows = dict[str, list[tuple]]
+"""
+Rows of an element, keyed by table name. Each row is a tuple of values in the
+order of the table columns, the `id` column first. Keys generated by the
+database (e.g. effect ids) are replaced by negative placeholders, unique
+within the element, which are also used by the rows referencing them.
+"""
+
+SHARED_TABLES = {Text.__tablename__}
+"""
+Tables whose rows are keyed by their content and shared between elements:
+a row already written is skipped instead of making its element a duplicate.
+"""
+
+DELETE_CHUNK_SIZE = 500
+"""Number of keys per `IN` clause when deleting rows."""
+
+
+def chunked(elements: Iterable, size: int) -> Iterator[list]:
+    """Groups elements into lists of `size` elements (the last one may be shorter)."""
+    elements = iter(elements)
+    while chunk := list(islice(elements, size)):
+        yield chunk
+
+
+def rows_from_instance(instance: SQLModel) -> Rows:
+    """
+    Converts an object built by `from_wakfu_api` and the objects it cascades
+    to into rows. Foreign keys are filled from the relationships, as the
+    session would do when flushing the objects. Objects of `SHARED_TABLES`
+    referenced by a many-to-one relationship are converted too.
+    """
+    rows = defaultdict(list)
+    placeholders = count(-1, -1)
+
+    def visit(instance: SQLModel, overrides: dict[str, Any]) -> None:
+        mapper = inspect(instance).mapper
+        table = mapper.local_table
+        values = {column.key: getattr(instance, column.key) for column in table.columns}
+        values.update(overrides)
+        (primary_key,) = table.primary_key.columns
+        if values[primary_key.key] is None:
+            values[primary_key.key] = next(placeholders)
+        rows[table.name].append(tuple(values[column.key] for column in table.columns))
+
+        for relationship in mapper.relationships:
+            if relationship.direction is RelationshipDirection.MANYTOONE:
+                shared = getattr(instance, relationship.key)
+                if shared is not None and relationship.target.name in SHARED_TABLES:
+                    visit(shared, {})
+                continue
+            children = getattr(instance, relationship.key)
+            if children is None:
+                continue
+            if not relationship.uselist:
+                children = [children]
+            child_overrides = {
+                remote.key: values[local.key]
+                for local, remote in relationship.local_remote_pairs
+            }
+            for child in children:
+                visit(child, child_overrides)
+
+    visit(instance, {})
+    return dict(rows)
+
+
+def translation_row(id: int, data: dict) -> tuple:
+    """Row of a table holding the fr/en/es/pt translations of a text."""
+    return (id, data.get("fr"), data.get("en"), data.get("es"), data.get("pt"))
+
+
+def merge_rows(rows: Rows, other: Rows) -> Rows:
+    """Appends the rows of `other` to `rows` and returns `rows`."""
+    for name, table_rows in other.items():
+        rows.setdefault(name, []).extend(table_rows)
+    return rows
+
+
+def add_source_hash(cls: type[SQLModel], rows: Rows, data: dict) -> Rows:
+    """Adds to the rows of an element the `SourceHash` row of its raw data."""
+    placeholder = min(
+        (row[0] for table_rows in rows.values() for row in table_rows), default=0
+    )
+    element_id = rows[cls.__tablename__][0][0]
+    rows[SourceHash.__tablename__] = [
+        (
+            min(placeholder, 0) - 1,
+            cls.__tablename__,
+            element_id,
+            SourceHash.hash_element(data),
+        )
+    ]
+    return rows
+
+
+def transform(
+    cls: type[SQLModel], elements: Iterable[dict], validate: bool = False
+) -> list[Rows]:
+    """
+    Converts raw Wakfu API elements into rows, including their `SourceHash`.
+    By default rows are built directly by `cls.rows_from_wakfu_api`; with
+    `validate`, they go through the models built by `cls.from_wakfu_api`.
+    """
+    transformed = []
+    for element in elements:
+        if validate:
+            rows = rows_from_instance(cls.from_wakfu_api(element))
+        else:
+            rows = cls.rows_from_wakfu_api(element)
+        transformed.append(add_source_hash(cls, rows, element))
+    return transformed
+
+
+def delete_elements(
+    connection: Connection, cls: type[SQLModel], ids: Iterable[int]
+) -> set[tuple[str, int]]:
+    """
+    Deletes top-level elements and every row they own, following the same
+    relationships as `rows_from_instance`, along with their `SourceHash`.
+    Returns the `(table, primary key)` pairs of the deleted rows.
+    """
+    removed = set()
+
+    def visit(mapper, column, keys: set) -> None:
+        table = mapper.local_table
+        rows = [
+            row
+            for chunk in chunked(keys, DELETE_CHUNK_SIZE)
+            for row in connection.execute(select(table).where(column.in_(chunk)))
+            .mappings()
+            .all()
+        ]
+        if not rows:
+            return
+        removed.update((table.name, row["id"]) for row in rows)
+
+        for relationship in mapper.relationships:
+            if relationship.direction is RelationshipDirection.MANYTOONE:
+                continue
+            for local, remote in relationship.local_remote_pairs:
+                visit(relationship.mapper, remote, {row[local.key] for row in rows})
+
+        for chunk in chunked([row["id"] for row in rows], DELETE_CHUNK_SIZE):
+            connection.execute(delete(table).where(table.c.id.in_(chunk)))
+
+    ids = set(ids)
+    visit(inspect(cls), cls.__table__.c.id, ids)
+    for chunk in chunked(ids, DELETE_CHUNK_SIZE):
+        connection.execute(
+            delete(SourceHash).where(
+                SourceHash.tablename == cls.__tablename__,
+                SourceHash.element_id.in_(chunk),
+            )
+        )
+    return removed
+
+
+class RowWriter:
+    """
+    Writes rows to the database in batches, one transaction per batch.
+
+    Elements sharing a primary key with an element already written (or with
+    a row already in the database) are skipped as a whole, except for rows of
+    `SHARED_TABLES` which are only written once. Placeholder keys are
+    replaced by ids following the ones already in the database. The inserts
+    and commits are timed, and the rows written counted, in `profile`.
+    """
+
+    def __init__(
+        self, engine: Engine, batch_size: int, profile: IngestProfile | None = None
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.profile = profile if profile is not None else IngestProfile()
+        self.tables = {table.name: table for table in SQLModel.metadata.sorted_tables}
+        self.primary_indices = {
+            name: list(table.columns).index(table.c.id)
+            for name, table in self.tables.items()
+        }
+        self.key_indices = {
+            name: [
+                index
+                for index, column in enumerate(table.columns)
+                if column.primary_key or column.foreign_keys
+            ]
+            for name, table in self.tables.items()
+        }
+        self.seen_keys = set()
+        self.next_ids = {}
+        with engine.connect() as connection:
+            for name, table in self.tables.items():
+                keys = connection.scalars(select(table.c.id)).all()
+                self.seen_keys.update((name, key) for key in keys)
+                self.next_ids[name] = max(keys, default=0) + 1
+        self.buffer = defaultdict(list)
+        self.buffered = 0
+
+    def add(self, rows: Rows) -> bool:
+        """
+        Buffers the rows of an element, writing the buffer once it holds
+        `batch_size` elements. Returns False if the element is a duplicate.
+        """
+        keys = {
+            (name, row[self.primary_indices[name]])
+            for name, table_rows in rows.items()
+            for row in table_rows
+            if row[self.primary_indices[name]] >= 0 and name not in SHARED_TABLES
+        }
+        if not keys.isdisjoint(self.seen_keys):
+            return False
+        self.seen_keys |= keys
+        for name in SHARED_TABLES.intersection(rows):
+            rows[name] = self._unseen(name, rows[name])
+
+        mapping = {}
+        for name in self.tables:
+            for row in rows.get(name, ()):
+                key = row[self.primary_indices[name]]
+                if key < 0 and key not in mapping:
+                    mapping[key] = self.next_ids[name]
+                    self.next_ids[name] += 1
+        for name, table_rows in rows.items():
+            if mapping:
+                table_rows = [self._resolve(name, row, mapping) for row in table_rows]
+            self.buffer[name].extend(table_rows)
+
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+        return True
+
+    def _unseen(self, name: str, rows: list[tuple]) -> list[tuple]:
+        """Keeps the rows of a shared table not written yet, once each."""
+        unseen = []
+        for row in rows:
+            key = (name, row[self.primary_indices[name]])
+            if key not in self.seen_keys:
+                self.seen_keys.add(key)
+                unseen.append(row)
+        return unseen
+
+    def _resolve(self, name: str, row: tuple, mapping: dict[int, int]) -> tuple:
+        """Replaces the placeholder keys of a row by their ids."""
+        row = list(row)
+        for index in self.key_indices[name]:
+            if row[index] is not None and row[index] < 0:
+                row[index] = mapping[row[index]]
+        return tuple(row)
+
+    def flush(self) -> None:
+        """Writes the buffered rows in a single transaction."""
+        if not self.buffered:
+            return
+        with self.engine.connect() as connection:
+            with self.profile.stage("insert"):
+                for name, table in self.tables.items():
+                    if self.buffer[name]:
+                        connection.execute(
+                            insert(table), self._as_dicts(table, self.buffer[name])
+                        )
+                        self.profile.count_rows(name, len(self.buffer[name]))
+            with self.profile.stage("commit"):
+                connection.commit()
+        self.buffer.clear()
+        self.buffered = 0
+
+    @staticmethod
+    def _as_dicts(table: Table, rows: list[tuple]) -> list[dict[str, Any]]:
+        keys = [column.key for column in table.columns]
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,21 @@
+import hashlib
+import json
+from typing import Optional
+from sqlmodel import Field, SQLModel
+
+
+class SourceHash(SQLModel, table=True):
+    """Hash of the raw Wakfu API element a top-level row was built from."""
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    tablename: str = Field(index=True)
+    element_id: int
+    hash: str
+
+    @staticmethod
+    def hash_element(data: dict) -> str:
+        """Hashes a raw element independently of the order of its keys."""
+        content = json.dumps(
+            data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
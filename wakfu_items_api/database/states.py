@@ -1,5 +1,6 @@
 from typing import Optional
 from sqlmodel import Field, Relationship, SQLModel
+from .rows import Rows, translation_row
 
 
 class State(SQLModel, table=True):
@@ -39,6 +40,22 @@ class State(SQLModel, table=True):
             description=state_description,
         )
 
+    @classmethod
+    def rows_from_wakfu_api(cls, data: dict) -> Rows:
+        """Same as `from_wakfu_api`, but builds the rows directly, without validation."""
+        state_id = data.get("definition").get("id")
+        title_data = data.get("title", {})
+        description_data = data.get("description", {})
+
+        rows = {cls.__tablename__: [(state_id,)]}
+        if title_data:
+            rows[StateTitle.__tablename__] = [translation_row(state_id, title_data)]
+        if description_data:
+            rows[StateDescription.__tablename__] = [
+                translation_row(state_id, description_data)
+            ]
+        return rows
+
 
 class StateTitle(SQLModel, table=True):
     id: int = Field(primary_key=True, index=True, foreign_key="state.id")
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Optional
+from sqlalchemy import Connection, delete, select
+from sqlmodel import Field, SQLModel
+
+LANGUAGES = ("fr", "en", "es", "pt")
+"""Languages of the translated texts, the columns of `Text`."""
+
+
+class Text(SQLModel, table=True):
+    """
+    Translations of a text, stored once and shared by every row using it.
+    Its id is derived from its content, see `Text.key`.
+    """
+
+    id: int = Field(primary_key=True)
+    fr: Optional[str]
+    en: Optional[str]
+    es: Optional[str]
+    pt: Optional[str]
+
+    @staticmethod
+    def key(data: dict) -> int:
+        """Id of a text: a non-negative 63-bit hash of its translations."""
+        content = json.dumps(
+            [data.get("fr"), data.get("en"), data.get("es"), data.get("pt")],
+            ensure_ascii=False,
+        )
+        digest = hashlib.blake2b(content.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") >> 1
+
+    @classmethod
+    def from_wakfu_api(cls, data: dict) -> "Text":
+        return cls(
+            id=cls.key(data),
+            fr=data.get("fr"),
+            en=data.get("en"),
+            es=data.get("es"),
+            pt=data.get("pt"),
+        )
+
+    @classmethod
+    def row_from_wakfu_api(cls, data: dict) -> tuple:
+        """Same as `from_wakfu_api`, but builds the row directly, without validation."""
+        return (
+            cls.key(data),
+            data.get("fr"),
+            data.get("en"),
+            data.get("es"),
+            data.get("pt"),
+        )
+
+
+def delete_unused_texts(connection: Connection) -> set[tuple[str, int]]:
+    """
+    Deletes the texts no row references anymore. Returns the `(table, primary
+    key)` pairs of the deleted rows.
+    """
+    conditions = [
+        Text.id.not_in(select(column))
+        for table in SQLModel.metadata.sorted_tables
+        for column in table.columns
+        for foreign_key in column.foreign_keys
+        if foreign_key.column.table is Text.__table__
+    ]
+    unused = connection.scalars(select(Text.id).where(*conditions)).all()
+    connection.execute(delete(Text).where(*conditions))
+    return {(Text.__tablename__, id) for id in unused}
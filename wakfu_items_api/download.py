@@ -0,0 +1,314 @@
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator
+import requests
+from urllib3.exceptions import HTTPError
+from wakfu_items_api.streaming import CHUNK_SIZE
+
+try:
+    import brotli
+except ImportError:  # Optional, see the `brotli` extra.
+    brotli = None
+
+ACCEPT_ENCODING = "br, gzip" if brotli is not None else "gzip"
+"""Transfer encodings negotiated with the CDN, brotli when it can be decoded."""
+
+RESUME_RETRIES = 5
+"""Number of times an interrupted body is resumed before giving up."""
+
+RESUME_BACKOFF = 0.5
+"""Seconds waited before the first resumption, doubled at each attempt."""
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+
+class DownloadError(requests.RequestException):
+    """The body could not be downloaded completely."""
+
+
+class _Interrupted(DownloadError):
+    """The body ended early, the download can be resumed."""
+
+
+RESUMABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    HTTPError,
+    _Interrupted,
+)
+"""Errors after which an interrupted download is resumed."""
+
+
+class _Decoder:
+    """Incremental decoder of a content encoding."""
+
+    def __init__(self, encoding: str):
+        encoding = encoding.strip().lower()
+        self._process = self._flush = None
+        if encoding in ("gzip", "x-gzip"):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._process, self._flush = decompressor.decompress, decompressor.flush
+        elif encoding == "deflate":
+            decompressor = zlib.decompressobj()
+            self._process, self._flush = decompressor.decompress, decompressor.flush
+        elif encoding == "br" and brotli is not None:
+            self._process = brotli.Decompressor().process
+        elif encoding not in ("", "identity"):
+            raise DownloadError(f"Unsupported content encoding {encoding!r}.")
+
+    def decode(self, chunk: bytes) -> bytes:
+        return self._process(chunk) if self._process is not None else chunk
+
+    def flush(self) -> bytes:
+        return self._flush() if self._flush is not None else b""
+
+
+class Download:
+    """
+    Downloads a URL, yielding the decoded body chunk by chunk.
+
+    The body is requested with a compressed transfer encoding (see
+    `ACCEPT_ENCODING`) and read still encoded, so that an interrupted
+    transfer is resumed with a `Range` request from the last byte received,
+    validated with `If-Range`, up to `retries` times. With a `partial_path`,
+    the encoded bytes are also kept on disk until the download completes,
+    so that a later download of the same URL resumes where this one stopped.
+
+    `headers` holds the response headers once iteration has started,
+    `status_code` is 304 (and nothing is yielded) when the request headers
+    make the response conditional and the body did not change, and
+    `sha256` is the checksum of the decoded body yielded so far.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        session: requests.Session | None = None,
+        partial_path: str | Path | None = None,
+        headers: dict[str, str] | None = None,
+        retries: int = RESUME_RETRIES,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.url = url
+        self.session = session
+        self.partial_path = Path(partial_path) if partial_path is not None else None
+        self.request_headers = headers or {}
+        self.retries = retries
+        self.chunk_size = chunk_size
+        self.headers: dict[str, str] = {}
+        self.status_code: int | None = None
+        self.checksum = hashlib.sha256()
+        self._state: dict = {}
+        self._received = 0  # Encoded bytes received, including a previous download.
+        self._decoded = 0  # Encoded bytes decoded and yielded.
+        self._decoder: _Decoder | None = None
+        self._partial = None
+
+    @property
+    def sha256(self) -> str:
+        return self.checksum.hexdigest()
+
+    @property
+    def _state_path(self) -> Path:
+        return self.partial_path.with_name(f"{self.partial_path.name}.json")
+
+    def _resume_state(self) -> None:
+        """Picks up a previous partial download of the URL, if any."""
+        if self.partial_path is None:
+            return
+        try:
+            with self._state_path.open("r") as file:
+                state = json.load(file)
+            size = self.partial_path.stat().st_size
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if state.get("url") == self.url and state.get("validator"):
+            self._state, self._received = state, size
+
+    def _restart(self, response: requests.Response) -> None:
+        """Starts over from the beginning of a full response."""
+        length = response.headers.get("Content-Length")
+        validator = response.headers.get("ETag", response.headers.get("Last-Modified"))
+        self._state = {
+            "url": self.url,
+            "validator": validator,
+            "encoding": response.headers.get("Content-Encoding", ""),
+            "length": int(length) if length else None,
+        }
+        self._received = 0
+        self._discard_partial()
+        if self.partial_path is not None and validator:
+            self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+            self._state_path.write_text(json.dumps(self._state))
+
+    def _discard_partial(self) -> None:
+        if self._partial is not None:
+            self._partial.close()
+            self._partial = None
+        if self.partial_path is not None:
+            self.partial_path.unlink(missing_ok=True)
+            self._state_path.unlink(missing_ok=True)
+
+    def _complete(self) -> bool:
+        length = self._state.get("length")
+        return length is not None and self._received >= length
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._resume_state()
+        attempt = 0
+        try:
+            while not self._complete():
+                try:
+                    if not (yield from self._request()):
+                        break
+                except RESUMABLE_ERRORS as error:
+                    attempt += 1
+                    if attempt > self.retries:
+                        msg = f"Download of {self.url} failed after {attempt} attempts: {error}"
+                        raise DownloadError(msg) from error
+                    time.sleep(RESUME_BACKOFF * 2 ** (attempt - 1))
+            if self.status_code == 304:
+                return
+            if self._decoder is None:
+                # The whole body was left on disk by a previous download.
+                self.status_code = 200
+                self._decoder = _Decoder(self._state.get("encoding", ""))
+            yield from self._replay()
+            yield from self._decode(None)
+        finally:
+            if self._partial is not None:
+                self._partial.close()
+                self._partial = None
+        self._discard_partial()
+
+    def _request(self) -> Iterator[bytes]:
+        """
+        Requests the rest of the body and yields it decoded. Returns False if
+        there is nothing more to request: the body did not change (304), or
+        it ended without a length to check it against.
+        """
+        headers = {"Accept-Encoding": ACCEPT_ENCODING, **self.request_headers}
+        if self._received:
+            headers["Range"] = f"bytes={self._received}-"
+            headers["If-Range"] = self._state["validator"]
+        response = (self.session or requests).get(
+            self.url, headers=headers, stream=True
+        )
+        with response:
+            if response.status_code == 304:
+                self.status_code = 304
+                self.headers.update(response.headers)
+                return False
+            if response.status_code == 416 and self._received and not self._decoded:
+                # The partial body left on disk is stale.
+                self._discard_partial()
+                self._state, self._received = {}, 0
+                return True
+            response.raise_for_status()
+
+            skip = 0
+            match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+            if response.status_code == 206 and match:
+                if int(match.group(1)) != self._received:
+                    raise DownloadError(f"Unexpected range from {self.url}.")
+            elif not self._received:
+                self._restart(response)
+            elif response.headers.get(
+                "ETag", response.headers.get("Last-Modified")
+            ) == self._state.get("validator"):
+                # The range was ignored but the body is the same: skip what was received.
+                skip = self._received
+            elif not self._decoded:
+                self._restart(response)
+            else:
+                raise DownloadError(f"{self.url} changed while downloading.")
+
+            if not self.headers:
+                self.headers.update(response.headers)
+                self.status_code = 200
+            if self._decoder is None:
+                self._decoder = _Decoder(self._state.get("encoding", ""))
+            if self._partial is None and self.partial_path is not None:
+                self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+                self._partial = self.partial_path.open("a+b")
+            yield from self._replay()
+
+            for chunk in response.raw.stream(self.chunk_size, decode_content=False):
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                    if not chunk:
+                        continue
+                if self._partial is not None:
+                    self._partial.write(chunk)
+                    self._partial.flush()
+                self._received += len(chunk)
+                self._decoded = self._received
+                yield from self._decode(chunk)
+
+        if self._state.get("length") is None:
+            return False
+        if not self._complete():
+            raise _Interrupted(f"Incomplete body from {self.url}.")
+        return True
+
+    def _replay(self) -> Iterator[bytes]:
+        """Decodes the bytes received by a previous download and left on disk."""
+        if self._decoded >= self._received:
+            return
+        with self.partial_path.open("rb") as file:
+            file.seek(self._decoded)
+            while self._decoded < self._received:
+                chunk = file.read(min(self.chunk_size, self._received - self._decoded))
+                self._decoded += len(chunk)
+                yield from self._decode(chunk)
+
+    def _decode(self, chunk: bytes | None) -> Iterator[bytes]:
+        """Decodes a chunk (flushes the decoder if None) and updates the checksum."""
+        data = (
+            self._decoder.decode(chunk) if chunk is not None else self._decoder.flush()
+        )
+        if data:
+            self.checksum.update(data)
+            yield data
+
+
+def download(
+    url: str,
+    path: str | Path,
+    session: requests.Session | None = None,
+    expected_sha256: str | None = None,
+    retries: int = RESUME_RETRIES,
+) -> Download:
+    """
+    Downloads a URL to a file through `Download`, resuming a previous partial
+    download of it. The decoded body is written to a temporary file that is
+    only moved to `path` once complete, and if it matches `expected_sha256`
+    when given (otherwise DownloadError is raised).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f".{path.name}.tmp")
+    body = Download(
+        url,
+        session=session,
+        partial_path=path.with_name(f".{path.name}.part"),
+        retries=retries,
+    )
+    try:
+        with temporary_path.open("wb") as file:
+            for chunk in body:
+                file.write(chunk)
+        if expected_sha256 is not None and body.sha256 != expected_sha256:
+            raise DownloadError(f"Checksum mismatch for {url}.")
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+    os.replace(temporary_path, path)
+    return body
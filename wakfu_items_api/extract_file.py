@@ -1,20 +1,85 @@
+import itertools
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from wakfu_items_api.cache import FileCache
+from wakfu_items_api.download import Download
 from wakfu_items_api.version import get_current_version
 from wakfu_items_api.categories import Categories
+from wakfu_items_api.streaming import iter_file_chunks, iter_json_array
+from typing import Any, Iterator
 from urllib.parse import urljoin
 
 BASE_URL = "https://wakfu.cdn.ankama.com/gamedata/"
 
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+"""HTTP statuses considered transient and retried."""
 
-def extract_file(category: Categories):
-    version = get_current_version()
+
+def create_session(
+    pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5
+) -> requests.Session:
+    """
+    Creates an HTTP session whose connections are pooled and reused between
+    requests. Connection errors and transient statuses are retried `retries`
+    times, waiting `backoff_factor * 2 ** attempt` seconds between attempts.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def extract_file(
+    category: Categories,
+    version: str | None = None,
+    cache: FileCache | None = None,
+    revalidate: bool = False,
+    session: requests.Session | None = None,
+):
+    """
+    Downloads a category file of a game version, by default the current one.
+
+    When a cache is given, a cached file is returned without any network
+    traffic. With `revalidate`, a conditional request is sent instead and the
+    cached file is only downloaded again if the CDN reports it has changed.
+    Requests go through `session` when given, see `create_session`. The body
+    is transferred compressed, and an interrupted transfer is resumed, from
+    where a previous run stopped when a cache is given (see `Download`).
+    """
+    if version is None:
+        version = get_current_version()
     url = urljoin(BASE_URL, f"{version}/{category}.json")
 
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        headers, partial_path = {}, None
+        if cache is not None:
+            cached = cache.load(version, category)
+            if cached is not None:
+                if not revalidate:
+                    return json.loads(cached)
+                headers = cache.conditional_headers(version, category)
+            partial_path = cache.partial_path(version, category)
+
+        body = Download(
+            url, session=session, partial_path=partial_path, headers=headers
+        )
+        payload = b"".join(body)
+        if body.status_code == 304:
+            return json.loads(cached)
+        data = json.loads(payload)
+        if cache is not None:
+            cache.store(version, category, payload, body.headers)
         return data
     except requests.RequestException as e:
         msg = f"Error fetching version: {e}"
@@ -30,6 +95,78 @@ def extract_file(category: Categories):
         raise SystemExit(msg)
 
 
+def stream_file_chunks(
+    category: Categories,
+    version: str | None = None,
+    cache: FileCache | None = None,
+    session: requests.Session | None = None,
+    revalidate: bool = False,
+) -> Iterator[bytes]:
+    """
+    Yields the content of a category file chunk by chunk as it is read from
+    the cache or downloaded (and then stored in the cache once complete). A
+    cached file not matching its checksum is downloaded again. With
+    `revalidate`, a cached file is only read once a conditional request has
+    confirmed it did not change, see `extract_file`.
+    """
+    if version is None:
+        version = get_current_version()
+    url = urljoin(BASE_URL, f"{version}/{category}.json")
+
+    try:
+        headers, payload_path, partial_path = {}, None, None
+        if cache is not None:
+            payload_path = cache.verified_path(version, category)
+            if payload_path is not None:
+                if not revalidate:
+                    yield from iter_file_chunks(payload_path)
+                    return
+                headers = cache.conditional_headers(version, category)
+            partial_path = cache.partial_path(version, category)
+
+        body = Download(
+            url, session=session, partial_path=partial_path, headers=headers
+        )
+        chunks = iter(body)
+        first = next(chunks, None)
+        if body.status_code == 304:
+            yield from iter_file_chunks(payload_path)
+            return
+        if first is not None:
+            chunks = itertools.chain([first], chunks)
+        if cache is not None:
+            chunks = cache.store_stream(version, category, chunks, body.headers)
+        yield from chunks
+    except requests.RequestException as e:
+        msg = f"Error fetching version: {e}"
+        raise SystemExit(msg)
+
+
+def stream_file(
+    category: Categories,
+    version: str | None = None,
+    cache: FileCache | None = None,
+    session: requests.Session | None = None,
+    revalidate: bool = False,
+) -> Iterator[Any]:
+    """
+    Same as `extract_file`, but yields the elements of the category one at a
+    time as the file is read from the cache or downloaded, instead of
+    decoding the whole file in memory.
+    """
+    chunks = stream_file_chunks(
+        category, version=version, cache=cache, session=session, revalidate=revalidate
+    )
+    try:
+        yield from iter_json_array(chunks)
+        # Consume what follows the array so that the cache entry is completed.
+        for _ in chunks:
+            pass
+    except json.JSONDecodeError:
+        msg = "Error decoding JSON response."
+        raise SystemExit(msg)
+
+
 if __name__ == "__main__":
     # Example usage
     category = Categories.items
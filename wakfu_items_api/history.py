@@ -0,0 +1,451 @@
+import hashlib
+import json
+import re
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+from sqlalchemy import Engine, Index, and_, bindparam, insert, or_, select, update
+from sqlalchemy.orm import registry
+from sqlmodel import Field, SQLModel, create_engine
+
+HISTORY_FILENAME = "history.db"
+"""Name of the multi-version database, kept apart from the per-version ones."""
+
+EFFECT_LISTS = ("equipEffects", "useEffects", "useCriticalEffects")
+"""Lists of effects of an item definition, compared effect by effect."""
+
+COMPRESSION_LEVEL = 6
+"""zlib level of the stored contents."""
+
+
+class HistoryModel(SQLModel, registry=registry()):
+    """
+    Base of the tables of the multi-version database. They have their own
+    metadata, so that they are not created in the per-version databases.
+    """
+
+
+class Version(HistoryModel, table=True):
+    """A recorded game version. Ordinals follow the order of the versions."""
+
+    __tablename__ = "history_version"
+
+    ordinal: int = Field(primary_key=True)
+    version: str = Field(unique=True)
+
+
+class Content(HistoryModel, table=True):
+    """
+    A distinct raw element, stored once however many elements and versions
+    share it: its canonical JSON compressed with zlib, keyed by its hash.
+    """
+
+    __tablename__ = "history_content"
+
+    hash: str = Field(primary_key=True)
+    data: bytes
+
+
+class ElementVersion(HistoryModel, table=True):
+    """
+    The content of an element during a range of versions: from the version
+    of ordinal `valid_from` included, to `valid_to` excluded (or up to the
+    latest version if None).
+    """
+
+    __tablename__ = "history_element"
+    __table_args__ = (
+        Index("ix_history_element_key", "category", "element_id", "valid_from"),
+        Index("ix_history_element_from", "category", "valid_from"),
+        Index("ix_history_element_to", "category", "valid_to"),
+    )
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    category: str
+    element_id: int
+    hash: str = Field(foreign_key="history_content.hash")
+    valid_from: int = Field(foreign_key="history_version.ordinal")
+    valid_to: Optional[int] = Field(default=None, foreign_key="history_version.ordinal")
+
+
+class Change(NamedTuple):
+    """An element added, removed or changed between two versions."""
+
+    category: str
+    element_id: int
+    status: str
+    before: dict | None
+    after: dict | None
+
+
+class EffectChange(NamedTuple):
+    """An effect of an item added, removed or changed between two versions."""
+
+    item_id: int
+    effects: str
+    effect_id: int
+    status: str
+    before: dict | None
+    after: dict | None
+
+
+def version_key(version: str) -> tuple:
+    """Sort key of a version, comparing its numeric parts as numbers."""
+    return tuple(
+        (0, int(part)) if part.isdigit() else (1, part)
+        for part in re.split(r"[.\-]", version)
+    )
+
+
+def canonical(data: Any) -> bytes:
+    """
+    Canonical JSON of a raw element, independent of the order of its keys.
+    Its hash is the one of `SourceHash.hash_element`.
+    """
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def content_hash(content: bytes) -> str:
+    """Hash of the canonical JSON of an element."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def element_id(cls: type[SQLModel], data: dict) -> int:
+    """Id of the top-level row a raw element is converted into."""
+    return cls.rows_from_wakfu_api(data)[cls.__tablename__][0][0]
+
+
+class History:
+    """
+    Multi-version database: every element of every recorded version, stored
+    once per distinct content with the range of versions it is valid in,
+    instead of a full database per version.
+
+    Versions are recorded in increasing order by `record`. `as_of` reads the
+    elements of a category as they were in a version, `diff` lists what
+    changed between two versions (`effect_changes` breaking the items down
+    to their effects), and `element_history` the successive contents of an
+    element. Elements are the raw Wakfu API elements, keyed by category and
+    by the id of the row they are converted into.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        HistoryModel.metadata.create_all(engine)
+
+    @classmethod
+    def open(cls, path: str | Path = HISTORY_FILENAME) -> "History":
+        """Opens (or creates) a SQLite history file."""
+        return cls(create_engine(f"sqlite:///{path}"))
+
+    def versions(self) -> list[str]:
+        """Recorded versions, oldest first."""
+        with self.engine.connect() as connection:
+            return list(
+                connection.scalars(select(Version.version).order_by(Version.ordinal))
+            )
+
+    def _ordinal(self, connection, version: str) -> int:
+        ordinal = connection.scalar(
+            select(Version.ordinal).where(Version.version == version)
+        )
+        if ordinal is None:
+            raise ValueError(f"Version {version} is not recorded.")
+        return ordinal
+
+    def record(
+        self,
+        version: str,
+        categories: dict[str, Iterable[dict]],
+        classes: dict[str, type[SQLModel]],
+    ) -> dict[str, Counter]:
+        """
+        Records a version from the elements of each category, converted into
+        rows by the model of `classes` to find their id. Only elements whose
+        content changed since the previous version are written, and
+        elements missing from the version are closed. Elements sharing an id
+        with one already seen in the category are skipped. Returns the number
+        of elements added, changed, removed and unchanged per category.
+
+        Raises ValueError if the version is already recorded or is older
+        than the latest recorded one.
+        """
+        counts = defaultdict(Counter)
+        with self.engine.begin() as connection:
+            latest = connection.execute(
+                select(Version.ordinal, Version.version)
+                .order_by(Version.ordinal.desc())
+                .limit(1)
+            ).first()
+            if latest is not None:
+                if connection.scalar(
+                    select(Version.ordinal).where(Version.version == version)
+                ):
+                    raise ValueError(f"Version {version} is already recorded.")
+                if version_key(version) < version_key(latest.version):
+                    msg = f"Version {version} is older than the latest recorded one, {latest.version}."
+                    raise ValueError(msg)
+            ordinal = latest.ordinal + 1 if latest is not None else 1
+            connection.execute(insert(Version).values(ordinal=ordinal, version=version))
+
+            current = {}
+            for id, category, element, hash in connection.execute(
+                select(
+                    ElementVersion.id,
+                    ElementVersion.category,
+                    ElementVersion.element_id,
+                    ElementVersion.hash,
+                ).where(ElementVersion.valid_to.is_(None))
+            ):
+                current[category, element] = (id, hash)
+            known = set(connection.scalars(select(Content.hash)))
+
+            closed, opened, contents = [], [], []
+            for category, elements in categories.items():
+                cls = classes[category]
+                seen = set()
+                for data in elements:
+                    key = (category, element_id(cls, data))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    content = canonical(data)
+                    hash = content_hash(content)
+                    previous = current.pop(key, None)
+                    if previous is not None and previous[1] == hash:
+                        counts[category]["unchanged"] += 1
+                        continue
+                    if previous is not None:
+                        closed.append(previous[0])
+                    counts[category]["added" if previous is None else "changed"] += 1
+                    opened.append(
+                        {
+                            "category": category,
+                            "element_id": key[1],
+                            "hash": hash,
+                            "valid_from": ordinal,
+                        }
+                    )
+                    if hash not in known:
+                        known.add(hash)
+                        contents.append(
+                            {
+                                "hash": hash,
+                                "data": zlib.compress(content, COMPRESSION_LEVEL),
+                            }
+                        )
+
+            # Elements left were not in this version.
+            for (category, _), (id, _) in current.items():
+                closed.append(id)
+                counts[category]["removed"] += 1
+
+            if contents:
+                connection.execute(insert(Content), contents)
+            if closed:
+                connection.execute(
+                    update(ElementVersion)
+                    .where(ElementVersion.id == bindparam("closed_id"))
+                    .values(valid_to=ordinal),
+                    [{"closed_id": id} for id in closed],
+                )
+            if opened:
+                connection.execute(insert(ElementVersion), opened)
+        return counts
+
+    @staticmethod
+    def _valid_at(ordinal: int):
+        return and_(
+            ElementVersion.valid_from <= ordinal,
+            or_(ElementVersion.valid_to.is_(None), ElementVersion.valid_to > ordinal),
+        )
+
+    def as_of(
+        self, version: str, category: str, ids: Iterable[int] | None = None
+    ) -> dict[int, dict]:
+        """
+        Returns the elements of a category (or only those of `ids`) as they
+        were in a version, keyed by id.
+        """
+        with self.engine.connect() as connection:
+            ordinal = self._ordinal(connection, version)
+            query = (
+                select(ElementVersion.element_id, Content.data)
+                .join(Content, Content.hash == ElementVersion.hash)
+                .where(ElementVersion.category == category, self._valid_at(ordinal))
+            )
+            if ids is not None:
+                query = query.where(ElementVersion.element_id.in_(list(ids)))
+            return {
+                element: json.loads(zlib.decompress(data))
+                for element, data in connection.execute(query)
+            }
+
+    def diff(
+        self, old: str, new: str, categories: Iterable[str] | None = None
+    ) -> Iterator[Change]:
+        """
+        Yields the elements added, removed or changed from version `old` to
+        version `new` (which may be older), in the given categories or in all
+        of them. Only the ranges starting or ending between the two versions
+        are read, so the cost depends on the number of changes, not on the
+        number of elements.
+        """
+        with self.engine.connect() as connection:
+            start = self._ordinal(connection, old)
+            end = self._ordinal(connection, new)
+            reverse = start > end
+            if reverse:
+                start, end = end, start
+            condition = True
+            if categories is not None:
+                condition = ElementVersion.category.in_(list(categories))
+
+            # Contents valid in the older version that ended before the newer one.
+            before = {
+                (category, element): (hash, data)
+                for category, element, hash, data in connection.execute(
+                    select(
+                        ElementVersion.category,
+                        ElementVersion.element_id,
+                        ElementVersion.hash,
+                        Content.data,
+                    )
+                    .join(Content, Content.hash == ElementVersion.hash)
+                    .where(
+                        condition,
+                        ElementVersion.valid_to > start,
+                        ElementVersion.valid_to <= end,
+                        ElementVersion.valid_from <= start,
+                    )
+                )
+            }
+            # Contents valid in the newer version that started after the older one.
+            after = {
+                (category, element): (hash, data)
+                for category, element, hash, data in connection.execute(
+                    select(
+                        ElementVersion.category,
+                        ElementVersion.element_id,
+                        ElementVersion.hash,
+                        Content.data,
+                    )
+                    .join(Content, Content.hash == ElementVersion.hash)
+                    .where(
+                        condition,
+                        ElementVersion.valid_from > start,
+                        ElementVersion.valid_from <= end,
+                        self._valid_at(end),
+                    )
+                )
+            }
+
+        if reverse:
+            before, after = after, before
+        for key in sorted(before.keys() | after.keys()):
+            old_content, new_content = before.get(key), after.get(key)
+            if old_content is None:
+                status = "added"
+            elif new_content is None:
+                status = "removed"
+            elif old_content[0] == new_content[0]:
+                # Changed and changed back in between.
+                continue
+            else:
+                status = "changed"
+            yield Change(
+                key[0],
+                key[1],
+                status,
+                json.loads(zlib.decompress(old_content[1])) if old_content else None,
+                json.loads(zlib.decompress(new_content[1])) if new_content else None,
+            )
+
+    def element_history(
+        self, category: str, id: int
+    ) -> list[tuple[str, str | None, dict]]:
+        """
+        Returns the successive contents of an element: the first version of
+        each, the version it was replaced or removed in (None if it is still
+        valid in the latest version) and the element itself.
+        """
+        with self.engine.connect() as connection:
+            names = {
+                ordinal: version
+                for ordinal, version in connection.execute(
+                    select(Version.ordinal, Version.version)
+                )
+            }
+            return [
+                (
+                    names[valid_from],
+                    names.get(valid_to),
+                    json.loads(zlib.decompress(data)),
+                )
+                for valid_from, valid_to, data in connection.execute(
+                    select(
+                        ElementVersion.valid_from, ElementVersion.valid_to, Content.data
+                    )
+                    .join(Content, Content.hash == ElementVersion.hash)
+                    .where(
+                        ElementVersion.category == category,
+                        ElementVersion.element_id == id,
+                    )
+                    .order_by(ElementVersion.valid_from)
+                )
+            ]
+
+
+def effect_changes(change: Change) -> list[EffectChange]:
+    """
+    Breaks the change of an item down to its effects, matched by their id in
+    each list of `EFFECT_LISTS`.
+    """
+
+    def effects(item: dict | None, name: str) -> dict[int, dict]:
+        if item is None:
+            return {}
+        return {
+            effect["effect"]["definition"]["id"]: effect["effect"]
+            for effect in item.get("definition", {}).get(name, [])
+        }
+
+    changes = []
+    for name in EFFECT_LISTS:
+        before, after = effects(change.before, name), effects(change.after, name)
+        for id in sorted(before.keys() | after.keys()):
+            old, new = before.get(id), after.get(id)
+            if old == new:
+                continue
+            status = "added" if old is None else "removed" if new is None else "changed"
+            changes.append(EffectChange(change.element_id, name, id, status, old, new))
+    return changes
+
+
+def changed_fields(before: Any, after: Any, path: str = "") -> dict[str, tuple]:
+    """
+    Returns the leaves that differ between two JSON values, keyed by their
+    path (e.g. `definition.item.level`), with their old and new values.
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        fields = {}
+        for key in before.keys() | after.keys():
+            fields.update(
+                changed_fields(
+                    before.get(key), after.get(key), f"{path}.{key}" if path else key
+                )
+            )
+        return fields
+    if (
+        isinstance(before, list)
+        and isinstance(after, list)
+        and len(before) == len(after)
+    ):
+        fields = {}
+        for index, (old, new) in enumerate(zip(before, after)):
+            fields.update(changed_fields(old, new, f"{path}[{index}]"))
+        return fields
+    return {} if before == after else {path: (before, after)}
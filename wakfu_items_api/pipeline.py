@@ -0,0 +1,259 @@
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, Iterator
+
+QUEUE_SIZE = 8
+"""Default number of items held by the queue between two stages."""
+
+POLL_INTERVAL = 0.1
+"""Seconds between two checks of whether the pipeline was closed, while blocked."""
+
+_DONE = object()
+
+
+class _Failed:
+    """Carries the error of a stage down to the stages that follow it."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Closed(Exception):
+    """The pipeline was closed while a stage was still running."""
+
+
+class Stage:
+    """
+    Times a stage of a pipeline: the time it spent waiting for an item from
+    the previous stage, waiting for room in the queue of the next stage, and
+    busy in between, also broken down by the tag of the items it produced.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.waiting_input = 0.0
+        self.waiting_output = 0.0
+        self.busy_by_tag: Counter = Counter()
+        self.start: float | None = None
+        self.end: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.start is None:
+            return 0.0
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def busy(self) -> float:
+        return max(0.0, self.elapsed - self.waiting_input - self.waiting_output)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        """Returns the times of the stage, its share of `elapsed` being busy."""
+        return {
+            "items": self.items,
+            "busy": self.busy,
+            "waiting_input": self.waiting_input,
+            "waiting_output": self.waiting_output,
+            "utilization": self.busy / elapsed if elapsed else 0.0,
+            "busy_by_tag": dict(self.busy_by_tag),
+        }
+
+
+class Pipeline:
+    """
+    Runs stages concurrently, each in its own thread, connected by queues of
+    at most `maxsize` items: a stage runs ahead of the next one until the
+    queue between them is full, then blocks until the next one catches up,
+    so that memory stays bounded whatever the speed of each stage. Items go
+    through the stages in order.
+
+    The first stage produces the items of `source`. Each stage added by
+    `then` is a function taking the iterator of the items of the previous
+    stage and returning an iterable of its own items. Iterating the pipeline
+    yields the items of the last stage in the calling thread, which is timed
+    as the `sink` stage. An error in a stage is raised in the calling thread,
+    and closing the pipeline (or leaving its context) stops every stage.
+    With `tag`, a function returning the tag of an item (e.g. the category
+    it belongs to), the time each stage (but the sink) was busy producing an
+    item is also added up per tag.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: Iterable,
+        sink: str = "sink",
+        maxsize: int = QUEUE_SIZE,
+        tag: Callable[[Any], str] | None = None,
+    ):
+        self.maxsize = maxsize
+        self.tag = tag
+        self.stages = [Stage(name)]
+        self._functions: list[Callable[[Iterator], Iterable]] = [lambda _: source]
+        self._sink = Stage(sink)
+        self._closed = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._start: float | None = None
+        self._end: float | None = None
+
+    def then(self, name: str, function: Callable[[Iterator], Iterable]) -> "Pipeline":
+        """Adds a stage transforming the items of the previous one."""
+        if self._threads:
+            raise RuntimeError("Stages cannot be added to a running pipeline.")
+        self.stages.append(Stage(name))
+        self._functions.append(function)
+        return self
+
+    def _put(self, stage: Stage, output: queue.Queue, item: Any) -> None:
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    output.put(item, timeout=POLL_INTERVAL)
+                    return
+                except queue.Full:
+                    if self._closed.is_set():
+                        raise _Closed
+        finally:
+            stage.waiting_output += time.perf_counter() - start
+
+    def _get(self, stage: Stage, input: queue.Queue) -> Iterator:
+        """Yields the items of the previous stage, raising its error if it failed."""
+        while True:
+            start = time.perf_counter()
+            try:
+                while True:
+                    try:
+                        item = input.get(timeout=POLL_INTERVAL)
+                        break
+                    except queue.Empty:
+                        if self._closed.is_set():
+                            raise _Closed
+            finally:
+                stage.waiting_input += time.perf_counter() - start
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+
+    def _run(
+        self,
+        stage: Stage,
+        function: Callable[[Iterator], Iterable],
+        input: queue.Queue | None,
+        output: queue.Queue,
+    ) -> None:
+        stage.start = time.perf_counter()
+        items = None
+        try:
+            items = iter(function(self._get(stage, input) if input else iter(())))
+            start, waited = time.perf_counter(), stage.waiting_input
+            for item in items:
+                stage.items += 1
+                if self.tag is not None:
+                    busy = time.perf_counter() - start - (stage.waiting_input - waited)
+                    stage.busy_by_tag[self.tag(item)] += busy
+                self._put(stage, output, item)
+                start, waited = time.perf_counter(), stage.waiting_input
+            self._put(stage, output, _DONE)
+        except _Closed:
+            pass
+        except BaseException as error:
+            try:
+                self._put(stage, output, _Failed(error))
+            except _Closed:
+                pass
+        finally:
+            if hasattr(items, "close"):
+                items.close()
+            stage.end = time.perf_counter()
+
+    def __iter__(self) -> Iterator:
+        if self._threads:
+            raise RuntimeError("A pipeline can only be run once.")
+        self._start = self._sink.start = time.perf_counter()
+        input = None
+        for stage, function in zip(self.stages, self._functions):
+            output = queue.Queue(maxsize=self.maxsize)
+            thread = threading.Thread(
+                target=self._run,
+                args=(stage, function, input, output),
+                name=f"pipeline-{stage.name}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+            input = output
+        try:
+            for item in self._get(self._sink, input):
+                self._sink.items += 1
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops the stages still running and waits for their threads."""
+        self._closed.set()
+        for thread in self._threads:
+            thread.join()
+        if self._start is not None and self._end is None:
+            self._end = self._sink.end = time.perf_counter()
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def elapsed(self) -> float:
+        if self._start is None:
+            return 0.0
+        return (self._end or time.perf_counter()) - self._start
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns the elapsed time and, per stage, the number of items it
+        produced and the time it spent busy (in total and per tag) or waiting.
+        The busiest stage bounds the elapsed time of the whole pipeline.
+        """
+        elapsed = self.elapsed
+        return {
+            "elapsed": elapsed,
+            "stages": {
+                stage.name: stage.report(elapsed)
+                for stage in [*self.stages, self._sink]
+            },
+        }
+
+    def summary(self) -> str:
+        """One line describing how busy each stage was."""
+        report = self.report()
+        stages = ", ".join(
+            f"{name} {stage['busy']:.2f}s ({stage['utilization']:.0%})"
+            for name, stage in report["stages"].items()
+        )
+        return f"Pipeline ran in {report['elapsed']:.2f}s, busy: {stages}."
+
+
+if __name__ == "__main__":
+    # Three stages sleeping 10, 30 and 20ms per item: the pipeline takes
+    # about as long as the slowest one instead of the sum of the three.
+    def sleep(duration: float) -> Callable[[Iterator], Iterator]:
+        def stage(items: Iterator) -> Iterator:
+            for item in items:
+                time.sleep(duration)
+                yield item
+
+        return stage
+
+    with Pipeline("read", sleep(0.01)(iter(range(50))), sink="write") as pipeline:
+        pipeline.then("transform", sleep(0.03))
+        for _ in pipeline:
+            time.sleep(0.02)
+    print(pipeline.summary())
+    print("sequential would take about 3.00s")
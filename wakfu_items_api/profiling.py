@@ -0,0 +1,156 @@
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory() -> dict[str, int]:
+    """
+    Peak resident memory in KB of this process and of its terminated
+    children (e.g. the transformation workers), empty where unavailable.
+    """
+    if resource is None:
+        return {}
+    # ru_maxrss is in bytes on macOS and in KB elsewhere.
+    unit = 1024 if sys.platform == "darwin" else 1
+    return {
+        "self_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // unit,
+        "children_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // unit,
+    }
+
+
+class IngestProfile:
+    """
+    Times the stages of a database build per category, counts what went
+    through them and samples the peak memory after each category.
+
+    Stages nest: the time of a stage excludes the stages run within it, so
+    that e.g. reading the elements is not counted again in transforming
+    them when the transformation pulls the elements itself. Keyword
+    arguments describe the run (version, options...) in the report. When
+    stages run concurrently (see `Pipeline`), only the consuming thread is
+    timed per category, and the busy time of the other stages is attributed
+    to the categories from the report of the pipeline, see `record_pipeline`.
+    """
+
+    def __init__(self, **metadata: Any):
+        self.metadata = metadata
+        self.categories: dict[str, dict[str, Any]] = {}
+        self.stages: Counter = Counter()
+        self.pipeline: dict[str, Any] = {}
+        self._category: str | None = None
+        self._stack: list[list] = []
+        self._start = time.perf_counter()
+
+    def _record(self, category: str | None = None) -> dict[str, Any]:
+        """Measures of `category`, by default of the current one."""
+        return self.categories.setdefault(
+            category or self._category,
+            {"seconds": Counter(), "counts": Counter(), "rows": Counter()},
+        )
+
+    @contextmanager
+    def category(self, name: str) -> Iterator[None]:
+        """Attributes the stages and counts within to a category."""
+        self._category = name
+        self._record()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self._record()
+            record["elapsed"] = time.perf_counter() - start
+            record["memory"] = peak_memory()
+            self._category = None
+
+    def _push(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _pop(self) -> None:
+        name, start, nested = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._category is None:
+            self.stages[name] += elapsed - nested
+        else:
+            self._record()["seconds"][name] += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times the code within as a stage."""
+        self._push(name)
+        try:
+            yield
+        finally:
+            self._pop()
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Yields the items of an iterable, timing their production as a stage."""
+        iterator = iter(iterable)
+        while True:
+            self._push(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._pop()
+            yield item
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Adds to a counter of the current category."""
+        self._record()["counts"][name] += value
+
+    def count_rows(self, table: str, value: int) -> None:
+        """Adds to the number of rows written to a table in the current category."""
+        self._record()["rows"][table] += value
+
+    def record_pipeline(self, report: dict[str, Any]) -> None:
+        """
+        Records the report of the pipeline the stages ran in, adding the time
+        each stage was busy per tag to the category of that name.
+        """
+        self.pipeline = report
+        for name, stage in report["stages"].items():
+            for category, seconds in stage.get("busy_by_tag", {}).items():
+                self._record(category)["seconds"][name] += seconds
+
+    def report(self) -> dict[str, Any]:
+        """Returns the measures as a JSON serializable dict."""
+        categories = {}
+        for name, record in self.categories.items():
+            if name is None:
+                continue
+            seconds = dict(record["seconds"])
+            categories[name] = {
+                "elapsed": record.get("elapsed", sum(seconds.values())),
+                "seconds": seconds,
+                "counts": dict(record["counts"]),
+                "rows": dict(record["rows"]),
+                "memory": record.get("memory", {}),
+            }
+        totals = Counter()
+        for record in categories.values():
+            totals.update(record["seconds"])
+        return {
+            "metadata": self.metadata,
+            "elapsed": time.perf_counter() - self._start,
+            "memory": peak_memory(),
+            "stages": {**totals, **self.stages},
+            "pipeline": self.pipeline,
+            "categories": categories,
+        }
+
+    def write(self, path: str | Path) -> None:
+        """Writes the report as JSON."""
+        with Path(path).open("w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=4)
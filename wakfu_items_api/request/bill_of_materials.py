@@ -0,0 +1,16 @@
+from sqlmodel import Session, select
+from wakfu_items_api.database.crafting import BillOfMaterials
+
+
+def bill_of_materials(session: Session, item_id: int) -> dict[int, float]:
+    """
+    Raw materials needed to craft one unit of an item, keyed by item id, in a
+    single indexed lookup. Empty if the item cannot be crafted.
+    """
+    return dict(
+        session.exec(
+            select(BillOfMaterials.materialId, BillOfMaterials.quantity).where(
+                BillOfMaterials.itemId == item_id
+            )
+        ).all()
+    )
@@ -0,0 +1,432 @@
+import heapq
+import time
+from itertools import product
+from typing import NamedTuple
+import numpy as np
+from sqlalchemy import Engine
+from sqlmodel import select
+from wakfu_items_api.database.item_types import ItemType
+from wakfu_items_api.request.item_catalog import ItemCatalog
+from wakfu_items_api.request.stat_matrix import StatMatrix
+
+RARITY_LIMITS = {5: 1, 7: 1}
+"""Maximum number of equipped items of a rarity (relic and epic)."""
+
+TIME_CHECK_INTERVAL = 1024
+"""Number of explored nodes between two checks of the time budget."""
+
+Usage = tuple[int, ...]
+"""Number of equipped items of each rarity of `RARITY_LIMITS`."""
+
+Placement = tuple[float, tuple[tuple[str, int], ...]]
+"""Score and `(position, item id)` pairs of a build or of a part of it."""
+
+
+class Build(NamedTuple):
+    """Equipment set found by the optimizer, `items` mapping positions to item ids."""
+
+    score: float
+    items: dict[str, int]
+
+
+class OptimizerResult(NamedTuple):
+    """Best builds, best first. `exact` is False if the time budget ran out."""
+
+    builds: list[Build]
+    exact: bool
+
+
+class _Candidate(NamedTuple):
+    score: float
+    id: int
+    positions: frozenset[str]
+    disabled: frozenset[str]
+    limited: int | None
+    """Index of the item rarity in `RARITY_LIMITS`, if it is limited."""
+
+
+class BuildOptimizer:
+    """
+    Finds the equipment sets maximizing a weighted sum of stats.
+
+    Each item can be equipped in one of the `equipmentPositions` of its type
+    and leaves the `equipmentDisabledPositions` of its type empty. An item is
+    equipped at most once (e.g. two different rings) and `RARITY_LIMITS`
+    bounds the number of relic and epic items.
+
+    The search is exact:
+
+    - items are pruned to the few best of each group of interchangeable
+      items (same positions, disabled positions and rarity limit);
+    - positions are split into independent slots (e.g. the two rings, or
+      the two weapons as a two-handed weapon disables the second one), and
+      a branch-and-bound finds the best fillings of each slot for every
+      count of relic and epic items;
+    - the fillings of the slots are merged into the best builds under the
+      rarity limits.
+
+        optimizer = BuildOptimizer.from_database(engine, "database.stats.npz")
+        result = optimizer.optimize({20: 1.0, 31: 100.0}, level=200, k=5)
+    """
+
+    def __init__(
+        self,
+        catalog: ItemCatalog,
+        matrix: StatMatrix,
+        item_types: dict[int, tuple[list[str], list[str]]],
+    ):
+        self.catalog = catalog
+        self.matrix = matrix
+        self.item_types = item_types
+        self.matrix_rows = np.minimum(
+            np.searchsorted(matrix.item_ids, catalog.ids), len(matrix.item_ids) - 1
+        )
+        self.in_matrix = matrix.item_ids[self.matrix_rows] == catalog.ids
+
+    @classmethod
+    def from_database(
+        cls, engine: Engine, matrix_path: str | None = None
+    ) -> "BuildOptimizer":
+        """
+        Loads the catalog and the item types from the database. The stat
+        matrix is loaded from `matrix_path`, or built if it is not given.
+        """
+        if matrix_path is None:
+            matrix = StatMatrix.from_database(engine)
+        else:
+            matrix = StatMatrix.load(matrix_path)
+        with engine.connect() as connection:
+            item_types = {
+                id: (positions or [], disabled or [])
+                for id, positions, disabled in connection.execute(
+                    select(
+                        ItemType.id,
+                        ItemType.equipmentPositions,
+                        ItemType.equipmentDisabledPositions,
+                    )
+                )
+            }
+        return cls(ItemCatalog.from_database(engine), matrix, item_types)
+
+    def optimize(
+        self,
+        weights: dict[int, float],
+        level: int,
+        k: int = 1,
+        time_budget: float | None = None,
+        mask: np.ndarray | None = None,
+    ) -> OptimizerResult:
+        """
+        Searches the `k` best builds.
+
+        Args:
+            weights: Weight of each stat, keyed by action id.
+            level: Maximum level of the items.
+            k: Number of builds to return.
+            time_budget: Maximum search time in seconds. Default is no limit.
+            mask: Boolean mask over the catalog items allowed in the builds
+                (see `ItemCatalog.mask`). Default is every item.
+
+        Returns:
+            OptimizerResult: The builds, best first. Items adding nothing
+            to the score are left out, so positions may be missing.
+        """
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        candidates = self._candidates(weights, level, k, mask)
+        exact = True
+        builds = {(0,) * len(RARITY_LIMITS): [(0.0, ())]}
+        for slot in _slots(candidates):
+            search = _Search(slot, candidates, k, deadline)
+            search.run()
+            exact &= not search.timed_out
+            builds = _merge(builds, search.placements(), k)
+
+        best = heapq.nlargest(
+            k, (build for usage in builds.values() for build in usage)
+        )
+        return OptimizerResult(
+            [Build(score, dict(sorted(items))) for score, items in best], exact
+        )
+
+    def _candidates(
+        self, weights: dict[int, float], level: int, k: int, mask: np.ndarray | None
+    ) -> dict[str, list[_Candidate]]:
+        """
+        Selects the items worth trying at each position, best first. Items
+        sharing positions, disabled positions and rarity limit are
+        interchangeable, so only the best `k + capacity - 1` of each group can
+        appear in the `k` best builds.
+        """
+        scores = self.matrix.scores(weights)[self.matrix_rows]
+        allowed = self.in_matrix & (scores > 0) & (self.catalog["level"] <= level)
+        if mask is not None:
+            allowed &= mask
+
+        limited = {rarity: index for index, rarity in enumerate(RARITY_LIMITS)}
+        groups = {}
+        for index in np.flatnonzero(allowed):
+            positions, disabled = self.item_types.get(
+                int(self.catalog["itemTypeId"][index]), ([], [])
+            )
+            if not positions:
+                continue
+            key = (
+                frozenset(positions),
+                frozenset(disabled),
+                limited.get(int(self.catalog["rarity"][index])),
+            )
+            groups.setdefault(key, []).append(
+                _Candidate(float(scores[index]), int(self.catalog.ids[index]), *key)
+            )
+
+        candidates = {}
+        for (positions, _, _), group in groups.items():
+            best = heapq.nlargest(k + len(positions) - 1, group)
+            for position in positions:
+                candidates.setdefault(position, []).extend(best)
+        for position_candidates in candidates.values():
+            position_candidates.sort(reverse=True)
+        return candidates
+
+
+def _slots(candidates: dict[str, list[_Candidate]]) -> list[list[str]]:
+    """
+    Splits the positions into slots, i.e. the smallest groups of positions
+    no item links to another group.
+    """
+    slots = {position: {position} for position in candidates}
+    for position_candidates in candidates.values():
+        for candidate in position_candidates:
+            linked = set().union(
+                *(
+                    slots.setdefault(position, {position})
+                    for position in candidate.positions | candidate.disabled
+                )
+            )
+            for position in linked:
+                slots[position] = linked
+    unique = {id(slot): slot for slot in slots.values()}
+    return sorted(sorted(slot) for slot in unique.values())
+
+
+def _merge(
+    first: dict[Usage, list[Placement]], second: dict[Usage, list[Placement]], k: int
+) -> dict[Usage, list[Placement]]:
+    """
+    Combines the best placements of two sets of slots into the `k` best
+    placements of their union, for each usage within `RARITY_LIMITS`.
+    """
+    merged = {}
+    for (first_usage, first_placements), (second_usage, second_placements) in product(
+        first.items(), second.items()
+    ):
+        usage = tuple(a + b for a, b in zip(first_usage, second_usage))
+        if any(count > limit for count, limit in zip(usage, RARITY_LIMITS.values())):
+            continue
+        merged.setdefault(usage, []).extend(
+            _best_sums(first_placements, second_placements, k)
+        )
+    return {
+        usage: heapq.nlargest(k, placements) for usage, placements in merged.items()
+    }
+
+
+def _best_sums(
+    first: list[Placement], second: list[Placement], k: int
+) -> list[Placement]:
+    """`k` best pairs of placements of two lists sorted best first."""
+    best = []
+    heap = [(-(first[0][0] + second[0][0]), 0, 0)]
+    seen = {(0, 0)}
+    while heap and len(best) < k:
+        _, i, j = heapq.heappop(heap)
+        best.append((first[i][0] + second[j][0], first[i][1] + second[j][1]))
+        for next_i, next_j in ((i + 1, j), (i, j + 1)):
+            if (
+                next_i < len(first)
+                and next_j < len(second)
+                and (next_i, next_j) not in seen
+            ):
+                seen.add((next_i, next_j))
+                heapq.heappush(
+                    heap, (-(first[next_i][0] + second[next_j][0]), next_i, next_j)
+                )
+    return best
+
+
+class _Search:
+    """
+    Depth-first branch-and-bound over the positions of a slot, keeping the
+    `k` best placements for each usage of the limited rarities.
+    """
+
+    def __init__(
+        self,
+        positions: list[str],
+        candidates: dict[str, list[_Candidate]],
+        k: int,
+        deadline: float | None,
+    ):
+        self.positions = positions
+        self.candidates = [candidates.get(position, []) for position in positions]
+        self.k = k
+        self.deadline = deadline
+        self.usages = list(
+            product(*(range(limit + 1) for limit in RARITY_LIMITS.values()))
+        )
+        self.heaps = {usage: [] for usage in self.usages}
+        self.item_sets = set()
+        self.chosen = [None] * len(positions)
+        self.used = [0] * len(RARITY_LIMITS)
+        self.nodes = 0
+        self.timed_out = False
+
+        best = [
+            max((c.score for c in position if c.limited is None), default=0.0)
+            for position in self.candidates
+        ]
+        self.suffix = [sum(best[depth:]) for depth in range(len(positions) + 1)]
+        # Extra score each limited rarity can add at the remaining positions.
+        self.gains = [
+            [
+                sorted(
+                    (
+                        max(
+                            (c.score for c in self.candidates[d] if c.limited == index),
+                            default=0.0,
+                        )
+                        - best[d]
+                        for d in range(depth, len(positions))
+                    ),
+                    reverse=True,
+                )
+                for depth in range(len(positions) + 1)
+            ]
+            for index in range(len(RARITY_LIMITS))
+        ]
+
+    def run(self) -> None:
+        self._visit(0, 0.0, frozenset())
+
+    def placements(self) -> dict[Usage, list[Placement]]:
+        """Best placements found for each usage, best first."""
+        placements = {
+            usage: [(score, items) for score, _, items in sorted(heap, reverse=True)]
+            for usage, heap in self.heaps.items()
+            if heap
+        }
+        # The empty placement may be missing if the time budget ran out.
+        return placements or {self.usages[0]: [(0.0, ())]}
+
+    def _bound(self, depth: int) -> float:
+        """Upper bound of the score of the positions from `depth` onwards."""
+        bound = self.suffix[depth]
+        for index, limit in enumerate(RARITY_LIMITS.values()):
+            for gain in self.gains[index][depth][: limit - self.used[index]]:
+                if gain <= 0:
+                    break
+                bound += gain
+        return bound
+
+    def _threshold(self) -> float:
+        """Score to beat for a placement extending the current one to be kept."""
+        threshold = np.inf
+        for usage in self.usages:
+            if all(count >= used for count, used in zip(usage, self.used)):
+                heap = self.heaps[usage]
+                if len(heap) < self.k:
+                    return -np.inf
+                threshold = min(threshold, heap[0][0])
+        return threshold
+
+    def _visit(self, depth: int, score: float, blocked: frozenset[str]) -> None:
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0:
+            self.timed_out = time.monotonic() > self.deadline
+        if self.timed_out:
+            return
+        if depth == len(self.positions):
+            self._record(score)
+            return
+
+        threshold = self._threshold()
+        if self.positions[depth] not in blocked:
+            rest = self._bound(depth + 1)
+            for candidate in self.candidates[depth]:
+                if score + candidate.score + rest <= threshold:
+                    break
+                if not self._allowed(depth, candidate):
+                    continue
+                if candidate.limited is not None:
+                    self.used[candidate.limited] += 1
+                if score + candidate.score + self._bound(depth + 1) > self._threshold():
+                    self.chosen[depth] = candidate
+                    self._visit(
+                        depth + 1, score + candidate.score, blocked | candidate.disabled
+                    )
+                    self.chosen[depth] = None
+                if candidate.limited is not None:
+                    self.used[candidate.limited] -= 1
+
+        if score + self._bound(depth + 1) > self._threshold():
+            self._visit(depth + 1, score, blocked)
+
+    def _allowed(self, depth: int, candidate: _Candidate) -> bool:
+        if candidate.limited is not None and (
+            self.used[candidate.limited]
+            >= list(RARITY_LIMITS.values())[candidate.limited]
+        ):
+            return False
+        for previous, other in enumerate(self.chosen[:depth]):
+            if other is None:
+                continue
+            if self.positions[previous] in candidate.disabled:
+                return False
+            # Interchangeable positions (e.g. rings) hold increasing ids,
+            # which equips an item at most once and skips mirrored builds.
+            if (
+                other.positions == candidate.positions
+                and self.positions[previous] in candidate.positions
+                and other.id >= candidate.id
+            ):
+                return False
+        return True
+
+    def _record(self, score: float) -> None:
+        """Keeps the current placement if it is among the best, once per item set."""
+        items = tuple(
+            (position, candidate.id)
+            for position, candidate in zip(self.positions, self.chosen)
+            if candidate is not None
+        )
+        item_set = frozenset(id for _, id in items)
+        if item_set in self.item_sets:
+            return
+        heap = self.heaps[tuple(self.used)]
+        if len(heap) == self.k:
+            if score <= heap[0][0]:
+                return
+            _, _, removed = heapq.heappop(heap)
+            self.item_sets.discard(frozenset(id for _, id in removed))
+        heapq.heappush(heap, (score, self.nodes, items))
+        self.item_sets.add(item_set)
+
+
+if __name__ == "__main__":
+    # Optimizes the sum of every stat: python -m ... path/to/database.db level
+    import sys
+    from sqlmodel import create_engine
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "database.db"
+    level = int(sys.argv[2]) if len(sys.argv) > 2 else 230
+    engine = create_engine(f"sqlite:///{path}")
+    optimizer = BuildOptimizer.from_database(engine)
+    weights = {int(action_id): 1.0 for action_id in optimizer.matrix.action_ids}
+    for k in (1, 10, 100, 1000):
+        start = time.perf_counter()
+        result = optimizer.optimize(weights, level, k=k)
+        elapsed = time.perf_counter() - start
+        print(
+            f"k={k}: best {result.builds[0].score:.1f}, "
+            f"worst {result.builds[-1].score:.1f} in {elapsed:.3f}s"
+        )
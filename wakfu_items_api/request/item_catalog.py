@@ -0,0 +1,142 @@
+from typing import Any
+import numpy as np
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+from wakfu_items_api.database.item_loader import item_graph_options
+from wakfu_items_api.database.items import (
+    BaseParameters,
+    Item,
+    ItemParameters,
+    UseParameters,
+)
+
+CATALOG_COLUMNS = {
+    "level": (ItemParameters.level, np.int16),
+    "itemTypeId": (BaseParameters.itemTypeId, np.int32),
+    "itemSetId": (BaseParameters.itemSetId, np.int32),
+    "rarity": (BaseParameters.rarity, np.int8),
+    "bindType": (BaseParameters.bindType, np.int8),
+    "minimumShardSlotNumber": (BaseParameters.minimumShardSlotNumber, np.int8),
+    "maximumShardSlotNumber": (BaseParameters.maximumShardSlotNumber, np.int8),
+    "useCostAp": (UseParameters.useCostAp, np.int16),
+    "useCostMp": (UseParameters.useCostMp, np.int16),
+    "useCostWp": (UseParameters.useCostWp, np.int16),
+    "useRangeMin": (UseParameters.useRangeMin, np.int16),
+    "useRangeMax": (UseParameters.useRangeMax, np.int16),
+    "useTestFreeCell": (UseParameters.useTestFreeCell, np.bool_),
+    "useTestLos": (UseParameters.useTestLos, np.bool_),
+    "useTestOnlyLine": (UseParameters.useTestOnlyLine, np.bool_),
+    "useTestNoBorderCell": (UseParameters.useTestNoBorderCell, np.bool_),
+    "useWorldTarget": (UseParameters.useWorldTarget, np.int32),
+}
+"""Scalar columns loaded in the catalog, with the NumPy type used to store them."""
+
+HYDRATE_CHUNK_SIZE = 500
+"""Number of ids per query when hydrating items."""
+
+
+class ItemCatalog:
+    """
+    Scalar columns of `ItemParameters`, `BaseParameters` and `UseParameters`
+    held in contiguous NumPy arrays, one value per item, sorted by item id.
+
+    Filters are vectorized boolean masks over these arrays, e.g.:
+
+        catalog = ItemCatalog.from_database(engine)
+        mask = (catalog["level"] >= 200) & (catalog["rarity"] == 5)
+        ids = catalog.ids_where(mask)
+
+    Full items are only loaded from the database on demand, see `items`.
+    """
+
+    def __init__(self, ids: np.ndarray, columns: dict[str, np.ndarray]):
+        self.ids = ids
+        self.columns = columns
+
+    @classmethod
+    def from_database(cls, engine: Engine) -> "ItemCatalog":
+        """Loads the catalog with a single query."""
+        statement = (
+            select(
+                ItemParameters.id,
+                *(column for column, _ in CATALOG_COLUMNS.values()),
+            )
+            .join(BaseParameters, BaseParameters.id == ItemParameters.id)
+            .join(UseParameters, UseParameters.id == ItemParameters.id)
+            .order_by(ItemParameters.id)
+        )
+        with engine.connect() as connection:
+            rows = connection.execute(statement).all()
+
+        values = list(zip(*rows)) or [()] * (len(CATALOG_COLUMNS) + 1)
+        ids = np.array(values[0], dtype=np.int64)
+        columns = {
+            name: np.array(column_values, dtype=dtype)
+            for (name, (_, dtype)), column_values in zip(
+                CATALOG_COLUMNS.items(), values[1:]
+            )
+        }
+        return cls(ids, columns)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def ids_where(self, mask: np.ndarray) -> np.ndarray:
+        """Returns the ids of the items selected by a boolean mask."""
+        return self.ids[mask]
+
+    def mask(self, **filters: Any) -> np.ndarray:
+        """
+        Builds the boolean mask of the items matching every filter. A filter
+        value is either a scalar (equality), a `(minimum, maximum)` tuple
+        (inclusive range, None for no bound) or a list/set/array of values.
+
+            catalog.mask(level=(100, 200), rarity=[4, 5], itemTypeId=134)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in filters.items():
+            column = self.columns[name]
+            if isinstance(value, tuple):
+                minimum, maximum = value
+                if minimum is not None:
+                    mask &= column >= minimum
+                if maximum is not None:
+                    mask &= column <= maximum
+            elif isinstance(value, (list, set, frozenset, np.ndarray)):
+                mask &= np.isin(column, np.fromiter(value, dtype=column.dtype))
+            else:
+                mask &= column == value
+        return mask
+
+    def filter(self, **filters: Any) -> np.ndarray:
+        """Returns the ids of the items matching every filter, see `mask`."""
+        return self.ids_where(self.mask(**filters))
+
+    def positions(self, ids: np.ndarray) -> np.ndarray:
+        """Returns the positions of item ids in the catalog arrays."""
+        positions = np.searchsorted(self.ids, ids)
+        if np.any(positions >= len(self.ids)) or np.any(self.ids[positions] != ids):
+            raise KeyError("Some ids are not in the catalog.")
+        return positions
+
+    def items(self, session: Session, ids: np.ndarray) -> list[Item]:
+        """
+        Loads the full items of the given ids, in the same order, with their
+        whole graph (see `item_graph_options`).
+        """
+        ids = [int(id) for id in ids]
+        items = {}
+        for start in range(0, len(ids), HYDRATE_CHUNK_SIZE):
+            chunk = ids[start : start + HYDRATE_CHUNK_SIZE]
+            items.update(
+                (item.id, item)
+                for item in session.exec(
+                    select(Item)
+                    .options(*item_graph_options())
+                    .where(Item.id.in_(chunk))
+                )
+            )
+        return [items[id] for id in ids]
@@ -0,0 +1,78 @@
+import json
+import zlib
+from typing import Any, Iterator
+from sqlalchemy import Connection, select, text
+from sqlmodel import Session
+from wakfu_items_api.database.item_documents import ALL_LANGUAGES, ItemDocument
+
+DOCUMENT_QUERY = text(
+    f"SELECT data FROM {ItemDocument.__tablename__} "
+    "WHERE id = :id AND language = :language"
+)
+
+
+def item_document_json(
+    session: Session, id: int, language: str = ALL_LANGUAGES
+) -> bytes | None:
+    """
+    Document of an item as JSON, in a single primary-key lookup. None if the
+    item (or its document in `language`) does not exist.
+    """
+    data = (
+        session.connection()
+        .execute(DOCUMENT_QUERY, {"id": id, "language": language})
+        .scalar()
+    )
+    return None if data is None else zlib.decompress(data)
+
+
+def item_document(
+    session: Session, id: int, language: str = ALL_LANGUAGES
+) -> dict[str, Any] | None:
+    """Item in the layout of the Wakfu API, read from its document."""
+    data = item_document_json(session, id, language)
+    return None if data is None else json.loads(data)
+
+
+def iter_item_documents(
+    connection: Connection, language: str = ALL_LANGUAGES
+) -> Iterator[tuple[int, bytes]]:
+    """Yields the id and the JSON document of every item in `language`, in id order."""
+    rows = connection.execute(
+        select(ItemDocument.id, ItemDocument.data)
+        .where(ItemDocument.language == language)
+        .order_by(ItemDocument.id)
+    )
+    for id, data in rows:
+        yield id, zlib.decompress(data)
+
+
+if __name__ == "__main__":
+    # Lookup benchmark against the normalized tables:
+    # python -m ... path/to/database.db
+    import statistics
+    import sys
+    import time
+    from sqlmodel import create_engine
+    from wakfu_items_api.database.item_loader import load_items
+
+    engine = create_engine(
+        f"sqlite:///{sys.argv[1] if len(sys.argv) > 1 else 'database.db'}"
+    )
+    with Session(engine) as session:
+        ids = session.connection().scalars(select(ItemDocument.id).distinct()).all()
+        for name, read in (
+            ("document", lambda id: item_document(session, id)),
+            ("load_items", lambda id: load_items(session, ids=[id])),
+        ):
+            latencies = []
+            for id in ids[:1000]:
+                start = time.perf_counter()
+                read(id)
+                latencies.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+            latencies.sort()
+            print(
+                f"{name}: mean {statistics.fmean(latencies):.3f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95)]:.3f} ms"
+            )
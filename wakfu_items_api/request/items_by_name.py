@@ -1 +1,116 @@
-from sqlmodel import SQLModel
+import re
+from typing import NamedTuple
+from sqlalchemy import Connection, text
+from sqlmodel import Session
+from wakfu_items_api.database.items import ItemTitle
+from wakfu_items_api.database.texts import LANGUAGES
+
+NAME_INDEX = "itemtitle_fts"
+"""Full-text index over the item titles."""
+
+SEARCH_QUERY = text(
+    f"SELECT title.id, title.fr, title.en, title.es, title.pt "
+    f"FROM {NAME_INDEX} JOIN {ItemTitle.__tablename__} AS title "
+    f"ON title.id = {NAME_INDEX}.rowid "
+    f"WHERE {NAME_INDEX} MATCH :expression ORDER BY rank LIMIT :limit"
+)
+
+
+class ItemName(NamedTuple):
+    """Id and titles of an item found by name."""
+
+    id: int
+    fr: str | None
+    en: str | None
+    es: str | None
+    pt: str | None
+
+
+def create_items_name_index(connection: Connection) -> None:
+    """
+    Creates (or rebuilds) the full-text index over the item titles. Case and
+    accents are ignored, so that "epee" matches "Épée".
+    """
+    connection.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {NAME_INDEX} USING fts5("
+            f"{', '.join(LANGUAGES)}, content='{ItemTitle.__tablename__}', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+    )
+    connection.execute(
+        text(f"INSERT INTO {NAME_INDEX}({NAME_INDEX}) VALUES('rebuild')")
+    )
+
+
+def match_expression(query: str, languages: tuple[str, ...]) -> str | None:
+    """
+    Builds the full-text query matching titles in which every word of `query`
+    starts a word, all the words being in the same language.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    terms = " AND ".join(f'"{word}"*' for word in words)
+    return " OR ".join(f"{language} : ({terms})" for language in languages)
+
+
+def items_by_name(
+    session: Session, query: str, language: str | None = None, limit: int = 10
+) -> list[ItemName]:
+    """
+    Searches items by name, best matches first.
+
+    Args:
+        session: Session on a database generated with its name index.
+        query: Words (or beginnings of words) of the name, case and accents are ignored.
+        language: Language to search in (`fr`, `en`, `es` or `pt`). Default is all of them.
+        limit: Maximum number of results.
+
+    Returns:
+        list[ItemName]: Ids and titles of the matching items.
+    """
+    if language is not None and language not in LANGUAGES:
+        msg = f"Unknown language {language!r}, expected one of {LANGUAGES}."
+        raise ValueError(msg)
+    expression = match_expression(query, LANGUAGES if language is None else (language,))
+    if expression is None:
+        return []
+
+    rows = session.connection().execute(
+        SEARCH_QUERY, {"expression": expression, "limit": limit}
+    )
+    return [ItemName._make(row) for row in rows]
+
+
+if __name__ == "__main__":
+    # Latency benchmark over every item title: python -m ... path/to/database.db
+    import statistics
+    import sys
+    import time
+    from sqlmodel import create_engine, select
+
+    engine = create_engine(
+        f"sqlite:///{sys.argv[1] if len(sys.argv) > 1 else 'database.db'}"
+    )
+    with Session(engine) as session:
+        titles = session.exec(select(ItemTitle.fr, ItemTitle.en)).all()
+        queries = [
+            title[:length]
+            for row in titles
+            for title in row
+            if title
+            for length in (3, 6)
+        ]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            items_by_name(session, query)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(f"{len(queries)} queries over {len(titles)} items")
+    print(f"mean: {statistics.fmean(latencies):.3f} ms")
+    print(f"p50: {latencies[len(latencies) // 2]:.3f} ms")
+    print(f"p95: {latencies[int(len(latencies) * 0.95)]:.3f} ms")
+    print(f"max: {latencies[-1]:.3f} ms")
@@ -0,0 +1,132 @@
+from pathlib import Path
+import numpy as np
+from sqlalchemy import Engine
+from sqlmodel import select
+from wakfu_items_api.database.items import (
+    EquipEffect,
+    EquipEffectDefinition,
+    ItemParameters,
+)
+
+STAT_MATRIX_FILENAME = "database.stats.npz"
+"""Name of the stat matrix file written next to the database."""
+
+
+def effect_value(params: list[float], level: int) -> float:
+    """
+    Value of an effect for an item level: the first parameter is the base
+    value and the second one the increment per level.
+    """
+    if not params:
+        return 0.0
+    if len(params) == 1:
+        return params[0]
+    return params[0] + params[1] * level
+
+
+class StatMatrix:
+    """
+    Dense (item x action) matrix of the stats given by the equip effects of
+    every item, evaluated at the item level. Rows follow `item_ids` (sorted,
+    same order as `ItemCatalog`) and columns follow `action_ids` (sorted).
+    Several effects of the same action on an item are summed.
+
+        matrix = StatMatrix.load("database.stats.npz")
+        best = matrix.item_ids[np.argsort(-matrix.column(20))[:10]]
+    """
+
+    def __init__(
+        self, item_ids: np.ndarray, action_ids: np.ndarray, values: np.ndarray
+    ):
+        self.item_ids = item_ids
+        self.action_ids = action_ids
+        self.values = values
+
+    @classmethod
+    def from_database(cls, engine: Engine) -> "StatMatrix":
+        """Decodes every equip effect once and builds the matrix."""
+        with engine.connect() as connection:
+            item_ids = np.array(
+                connection.scalars(
+                    select(ItemParameters.id).order_by(ItemParameters.id)
+                ).all(),
+                dtype=np.int64,
+            )
+            effects = connection.execute(
+                select(
+                    EquipEffect.itemdefinition_id,
+                    EquipEffectDefinition.actionId,
+                    EquipEffectDefinition.params,
+                    ItemParameters.level,
+                )
+                .join(
+                    EquipEffectDefinition,
+                    EquipEffectDefinition.effect_id == EquipEffect.id,
+                )
+                .join(
+                    ItemParameters, ItemParameters.id == EquipEffect.itemdefinition_id
+                )
+            ).all()
+
+        effect_items = np.array(
+            [item_id for item_id, _, _, _ in effects], dtype=np.int64
+        )
+        effect_actions = np.array(
+            [action_id for _, action_id, _, _ in effects], dtype=np.int64
+        )
+        effect_values = np.array(
+            [effect_value(params, level) for _, _, params, level in effects],
+            dtype=np.float32,
+        )
+
+        action_ids = np.unique(effect_actions)
+        values = np.zeros((len(item_ids), len(action_ids)), dtype=np.float32)
+        np.add.at(
+            values,
+            (
+                np.searchsorted(item_ids, effect_items),
+                np.searchsorted(action_ids, effect_actions),
+            ),
+            effect_values,
+        )
+        return cls(item_ids, action_ids, values)
+
+    def save(self, path: str | Path) -> None:
+        """Saves the matrix to a `.npz` file."""
+        np.savez(
+            path, item_ids=self.item_ids, action_ids=self.action_ids, values=self.values
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StatMatrix":
+        """Loads a matrix saved by `save`."""
+        with np.load(path) as data:
+            return cls(data["item_ids"], data["action_ids"], data["values"])
+
+    def column(self, action_id: int) -> np.ndarray:
+        """Values of an action for every item (zeros if no item gives it)."""
+        position = np.searchsorted(self.action_ids, action_id)
+        if position == len(self.action_ids) or self.action_ids[position] != action_id:
+            return np.zeros(len(self.item_ids), dtype=self.values.dtype)
+        return self.values[:, position]
+
+    def row(self, item_id: int) -> np.ndarray:
+        """Values of every action for an item."""
+        position = np.searchsorted(self.item_ids, item_id)
+        if position == len(self.item_ids) or self.item_ids[position] != item_id:
+            raise KeyError(f"Item {item_id} is not in the stat matrix.")
+        return self.values[position]
+
+    def stat(self, item_id: int, action_id: int) -> float:
+        """Value of an action for an item."""
+        position = np.searchsorted(self.action_ids, action_id)
+        if position == len(self.action_ids) or self.action_ids[position] != action_id:
+            return 0.0
+        return float(self.row(item_id)[position])
+
+    def scores(self, weights: dict[int, float]) -> np.ndarray:
+        """Weighted sum of stats per item, weights being keyed by action id."""
+        scores = np.zeros(len(self.item_ids), dtype=np.float64)
+        for action_id, weight in weights.items():
+            scores += weight * self.column(action_id)
+        return scores
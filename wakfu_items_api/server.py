@@ -0,0 +1,388 @@
+import hashlib
+import json
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import parse_qs, urlsplit
+from sqlalchemy import Engine, create_engine, event, func, select, text
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session
+from wakfu_items_api.database.item_summary import ItemSummary
+from wakfu_items_api.database.texts import LANGUAGES
+from wakfu_items_api.request.item_document import iter_item_documents
+from wakfu_items_api.database.item_documents import ALL_LANGUAGES
+from wakfu_items_api.request.items_by_name import NAME_INDEX, items_by_name
+from wakfu_items_api.snapshot import SNAPSHOT_FILENAME, Snapshot
+
+DATABASE_FILENAME = "database.db"
+"""Name of the database served, next to its snapshot."""
+
+POOL_SIZE = 8
+"""Number of read-only connections kept open to the database."""
+
+PAGE_SIZE = 50
+"""Default number of items of a page of `/items`."""
+
+MAX_PAGE_SIZE = 500
+"""Maximum number of items of a page of `/items`, or of ids of a batch."""
+
+SEARCH_LIMIT = 10
+"""Default number of items found by `/items/search`."""
+
+RESPONSE_CACHE_SIZE = 4096
+"""Number of responses to searches and filters kept in memory."""
+
+FILTERS = {
+    "itemTypeId": ItemSummary.itemTypeId,
+    "itemSetId": ItemSummary.itemSetId,
+    "rarity": ItemSummary.rarity,
+}
+"""Query parameters of `/items` filtering on a column, each taking a list of values."""
+
+
+class APIError(Exception):
+    """Error answered to a request, with its HTTP status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _integer(value: str, name: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer.") from None
+
+
+def _integers(values: Iterable[str], name: str) -> tuple[int, ...]:
+    """Integers of repeated or comma-separated query parameters."""
+    return tuple(
+        _integer(value, name)
+        for parameter in values
+        for value in parameter.split(",")
+        if value
+    )
+
+
+def _limit(value: str | None, default: int) -> int:
+    if value is None:
+        return default
+    limit = _integer(value, "limit")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise APIError(
+            HTTPStatus.BAD_REQUEST, f"limit must be between 1 and {MAX_PAGE_SIZE}."
+        )
+    return limit
+
+
+def connect_read_only(path: str | Path, pool_size: int = POOL_SIZE) -> Engine:
+    """
+    Engine over a pool of read-only connections to a SQLite database, shared
+    by the threads serving the requests.
+    """
+    engine = create_engine(
+        f"sqlite:///file:{Path(path).resolve()}?mode=ro&uri=true",
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=-1,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _query_only(connection, _) -> None:
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    return engine
+
+
+class ItemsAPI:
+    """
+    Read-only API over a generated database and its snapshot (see
+    `generate_database`), answering with JSON bytes:
+
+        GET /version
+        GET /items/{id}
+        GET /items?ids=1,2,3
+        GET /items?itemTypeId=&itemSetId=&rarity=&minLevel=&maxLevel=&after=&limit=
+        GET /items/search?q=&language=&limit=
+
+    The items, in the layout of the Wakfu API, are loaded once at startup
+    from their documents (see `refresh_item_documents`) when the database
+    has them in the languages served, else serialized from the snapshot, so
+    that serving them only concatenates bytes. Pages
+    of `/items` are keyset-paginated on the id: `next` is the `after` of the
+    following page. Filters and searches run on the item summary table and
+    the name index over a pool of read-only connections, their responses
+    being cached since the database does not change while served.
+
+    Every response carries the same ETag, derived from the version and the
+    files served, so that a client revalidates with `If-None-Match` and gets
+    a `304` until another version (or build) of the database is served.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        languages: tuple[str, ...] | None = None,
+        pool_size: int = POOL_SIZE,
+    ):
+        directory = Path(directory)
+        database_path = directory / DATABASE_FILENAME
+        snapshot_path = directory / SNAPSHOT_FILENAME
+        if not database_path.exists():
+            raise FileNotFoundError(f"No database found in {directory}.")
+        if not snapshot_path.exists():
+            msg = f"No snapshot found in {directory}, generate the database with it."
+            raise FileNotFoundError(msg)
+
+        self.engine = connect_read_only(database_path, pool_size)
+        snapshot = Snapshot(snapshot_path)
+        try:
+            languages = languages or snapshot.languages
+            missing = set(languages) - set(snapshot.languages)
+            if missing:
+                msg = f"Languages {sorted(missing)} are not in the snapshot."
+                raise ValueError(msg)
+            self.version = snapshot.version
+            self.languages = languages
+            self.items = self._load_documents(languages)
+            if len(self.items) != len(snapshot):
+                self.items = {
+                    int(id): json.dumps(
+                        snapshot.item(int(id), languages),
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    ).encode()
+                    for id in snapshot.ids
+                }
+        finally:
+            snapshot.close()
+
+        fingerprint = hashlib.blake2b(self.version.encode(), digest_size=8)
+        for path in (database_path, snapshot_path):
+            stat = path.stat()
+            fingerprint.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        fingerprint.update(",".join(languages).encode())
+        self.etag = f'"{self.version}-{fingerprint.hexdigest()}"'
+
+        with self.engine.connect() as connection:
+            summaries = connection.execute(select(func.count(ItemSummary.id))).scalar()
+            name_index = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                {"name": NAME_INDEX},
+            ).first()
+        if summaries != len(self.items):
+            msg = "The item summary is not up to date, generate it with the database."
+            raise ValueError(msg)
+        if name_index is None:
+            raise ValueError("The database has no name index.")
+        self.version_response = json.dumps(
+            {"version": self.version, "languages": languages, "count": len(self.items)}
+        ).encode()
+        self._search = lru_cache(maxsize=RESPONSE_CACHE_SIZE)(self._search)
+        self._page = lru_cache(maxsize=RESPONSE_CACHE_SIZE)(self._page)
+
+    def _load_documents(self, languages: tuple[str, ...]) -> dict[int, bytes]:
+        """Documents of the items with their texts in `languages`, if any."""
+        if set(languages) == set(LANGUAGES):
+            language = ALL_LANGUAGES
+        elif len(languages) == 1:
+            language = languages[0]
+        else:
+            return {}
+        with self.engine.connect() as connection:
+            return dict(iter_item_documents(connection, language))
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    def get(self, path: str, query: dict[str, list[str]]) -> bytes:
+        """Body of the response to a GET request, raises `APIError` otherwise."""
+        parts = path.strip("/").split("/")
+        if parts == ["version"]:
+            return self.version_response
+        if parts == ["items"]:
+            if "ids" in query:
+                return self.batch(_integers(query["ids"], "ids"))
+            return self.page(query)
+        if parts == ["items", "search"]:
+            if not query.get("q"):
+                raise APIError(HTTPStatus.BAD_REQUEST, "q is required.")
+            language = query.get("language", [None])[0]
+            if language is not None and language not in self.languages:
+                raise APIError(
+                    HTTPStatus.BAD_REQUEST, f"Unknown language {language!r}."
+                )
+            limit = _limit(query.get("limit", [None])[0], SEARCH_LIMIT)
+            return self._search(query["q"][0], language, limit)
+        if len(parts) == 2 and parts[0] == "items":
+            item = self.items.get(_integer(parts[1], "id"))
+            if item is None:
+                raise APIError(HTTPStatus.NOT_FOUND, f"Item {parts[1]} not found.")
+            return item
+        raise APIError(HTTPStatus.NOT_FOUND, f"Unknown path {path}.")
+
+    def batch(self, ids: tuple[int, ...]) -> bytes:
+        """Items of some ids in the order requested, the unknown ids being skipped."""
+        if len(ids) > MAX_PAGE_SIZE:
+            msg = f"At most {MAX_PAGE_SIZE} ids can be requested at once."
+            raise APIError(HTTPStatus.BAD_REQUEST, msg)
+        items = self.items
+        return b"[" + b",".join(items[id] for id in ids if id in items) + b"]"
+
+    def page(self, query: dict[str, list[str]]) -> bytes:
+        """Page of the items matching the filters of the query, in id order."""
+        filters = tuple(
+            (name, tuple(sorted(set(_integers(query[name], name)))))
+            for name in FILTERS
+            if name in query
+        )
+        levels = tuple(
+            _integer(query[name][0], name) if name in query else None
+            for name in ("minLevel", "maxLevel")
+        )
+        after = _integer(query["after"][0], "after") if "after" in query else None
+        return self._page(
+            filters, levels, after, _limit(query.get("limit", [None])[0], PAGE_SIZE)
+        )
+
+    def _page(
+        self,
+        filters: tuple[tuple[str, tuple[int, ...]], ...],
+        levels: tuple[int | None, int | None],
+        after: int | None,
+        limit: int,
+    ) -> bytes:
+        statement = select(ItemSummary.id).order_by(ItemSummary.id).limit(limit + 1)
+        for name, values in filters:
+            statement = statement.where(FILTERS[name].in_(values))
+        minimum, maximum = levels
+        if minimum is not None:
+            statement = statement.where(ItemSummary.level >= minimum)
+        if maximum is not None:
+            statement = statement.where(ItemSummary.level <= maximum)
+        if after is not None:
+            statement = statement.where(ItemSummary.id > after)
+        with self.engine.connect() as connection:
+            ids = connection.execute(statement).scalars().all()
+        cursor = ids[limit - 1] if len(ids) > limit else None
+        items = b",".join(self.items[id] for id in ids[:limit])
+        return b'{"items":[' + items + b'],"next":' + json.dumps(cursor).encode() + b"}"
+
+    def _search(self, query: str, language: str | None, limit: int) -> bytes:
+        with Session(self.engine) as session:
+            names = items_by_name(session, query, language=language, limit=limit)
+        return json.dumps(
+            [name._asdict() for name in names], ensure_ascii=False
+        ).encode()
+
+
+class ItemsRequestHandler(BaseHTTPRequestHandler):
+    """Answers the requests of `ItemsAPI` over HTTP/1.1, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "wakfu-items-api"
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024  # Headers and body are sent at once on flush.
+    api: ItemsAPI
+    verbose: bool = False
+
+    def do_GET(self) -> None:
+        self._respond(head=False)
+
+    def do_HEAD(self) -> None:
+        self._respond(head=True)
+
+    def _respond(self, head: bool) -> None:
+        api = self.api
+        url = urlsplit(self.path)
+        try:
+            status, body = HTTPStatus.OK, api.get(url.path, parse_qs(url.query))
+        except APIError as error:
+            status, body = error.status, json.dumps({"error": str(error)}).encode()
+        # Only an existing resource can be unchanged: errors are answered first.
+        if status == HTTPStatus.OK and self._not_modified(api.etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", api.etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == HTTPStatus.OK:
+            self.send_header("ETag", api.etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if header is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        return "*" in tags or etag in tags
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class ItemsServer(ThreadingHTTPServer):
+    """Threaded HTTP server of an `ItemsAPI`, one thread per connection."""
+
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], api: ItemsAPI, verbose: bool = False):
+        handler = type(
+            "Handler", (ItemsRequestHandler,), {"api": api, "verbose": verbose}
+        )
+        super().__init__(address, handler)
+        self.api = api
+
+
+if __name__ == "__main__":
+    # Throughput benchmark over keep-alive connections:
+    # python -m ... path/to/database/directory [clients] [seconds]
+    import http.client
+    import random
+    import sys
+    import threading
+    import time
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    start = time.perf_counter()
+    api = ItemsAPI(directory)
+    print(f"startup: {time.perf_counter() - start:.2f} s, {len(api.items)} items")
+    server = ItemsServer(("127.0.0.1", 0), api)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ids = list(api.items)
+    counts = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(index: int) -> None:
+        connection = http.client.HTTPConnection(*server.server_address)
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            connection.request("GET", f"/items/{rng.choice(ids)}")
+            connection.getresponse().read()
+            counts[index] += 1
+        connection.close()
+
+    threads = [
+        threading.Thread(target=client, args=(index,)) for index in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+    print(f"{sum(counts) / duration:.0f} requests/s over {clients} connections")
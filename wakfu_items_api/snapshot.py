@@ -0,0 +1,427 @@
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable
+import numpy as np
+from sqlalchemy import Connection, Engine, select
+from wakfu_items_api.database.item_documents import EFFECTS
+from wakfu_items_api.database.item_documents import PARAMETERS as ITEM_PARAMETERS
+from wakfu_items_api.database.items import (
+    BaseParameters,
+    Item,
+    ItemDescription,
+    ItemParameters,
+    ItemTitle,
+    GraphicParameters,
+    UseParameters,
+)
+from wakfu_items_api.database.texts import LANGUAGES, Text
+from wakfu_items_api.request.item_catalog import CATALOG_COLUMNS
+
+SNAPSHOT_FILENAME = "database.snapshot"
+"""Name of the snapshot file written next to the database."""
+
+MAGIC = b"WAKFSNAP"
+"""First bytes of a snapshot file."""
+
+FORMAT_VERSION = 1
+"""Version of the snapshot layout, bumped on incompatible changes."""
+
+ALIGNMENT = 64
+"""Alignment in bytes of each array in the file."""
+
+COLUMNS = {
+    **CATALOG_COLUMNS,
+    "gfxId": (GraphicParameters.gfxId, np.int32),
+    "femaleGfxId": (GraphicParameters.femaleGfxId, np.int32),
+}
+"""Fixed-width columns of the items, with the NumPy type used to store them."""
+
+PARAMETERS = {
+    name: tuple(column.key for column in columns)
+    for name, columns in ITEM_PARAMETERS.items()
+}
+"""Columns of each parameter object of an item, as in the Wakfu API."""
+
+
+def _string_pool(values: Iterable[str | None]) -> dict[str, np.ndarray]:
+    """UTF-8 strings concatenated in a pool, indexed by offsets."""
+    encoded = [None if value is None else value.encode() for value in values]
+    lengths = [0 if value is None else len(value) for value in encoded]
+    return {
+        "offsets": np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))),
+        "present": np.array([value is not None for value in encoded], dtype=np.bool_),
+        "data": np.frombuffer(
+            b"".join(value for value in encoded if value), dtype=np.uint8
+        ),
+    }
+
+
+def _ragged(lists: Iterable[list | None], dtype: type) -> dict[str, np.ndarray]:
+    """Variable-length lists concatenated in an array, indexed by offsets."""
+    lists = [value or [] for value in lists]
+    return {
+        "offsets": np.concatenate(
+            ([0], np.cumsum([len(value) for value in lists], dtype=np.int64))
+        ),
+        "values": np.array(
+            [element for value in lists for element in value], dtype=dtype
+        ),
+    }
+
+
+def _translations(
+    prefix: str, rows: list, start: int, languages: tuple[str, ...]
+) -> dict[str, np.ndarray]:
+    """String pools of the columns of each language found from `start` in rows."""
+    arrays = {}
+    for index, language in enumerate(languages):
+        pool = _string_pool(row[start + index] for row in rows)
+        arrays.update(
+            (f"{prefix}.{language}.{name}", array) for name, array in pool.items()
+        )
+    return arrays
+
+
+def snapshot_arrays(
+    connection: Connection,
+    languages: tuple[str, ...] = LANGUAGES,
+    ids: Iterable[int] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Arrays of a snapshot of the items (only of those of `ids` if given), with
+    their texts in `languages`.
+
+    Items are stored in id order as fixed-width columns, strings as UTF-8
+    pools and effects as flat arrays, lists being indexed by offsets. A dense
+    table maps item ids to rows for O(1) lookups.
+    """
+    arrays = {}
+    query = (
+        select(
+            Item.id,
+            ItemParameters.properties,
+            *(column for column, _ in COLUMNS.values()),
+            *(getattr(ItemTitle, language) for language in languages),
+            *(getattr(ItemDescription, language) for language in languages),
+            ItemTitle.id,
+            ItemDescription.id,
+        )
+        .join(ItemParameters, ItemParameters.id == Item.id)
+        .join(BaseParameters, BaseParameters.id == Item.id)
+        .join(UseParameters, UseParameters.id == Item.id)
+        .join(GraphicParameters, GraphicParameters.id == Item.id)
+        .outerjoin(ItemTitle, ItemTitle.id == Item.id)
+        .outerjoin(ItemDescription, ItemDescription.id == Item.id)
+        .order_by(Item.id)
+    )
+    if ids is not None:
+        ids = list(ids)
+        query = query.where(Item.id.in_(ids))
+    items = connection.execute(query).all()
+    item_ids = np.array([row[0] for row in items], dtype=np.int64)
+    arrays["ids"] = item_ids
+    index = np.full(int(item_ids.max(initial=-1)) + 1, -1, dtype=np.int32)
+    index[item_ids] = np.arange(len(item_ids), dtype=np.int32)
+    arrays["index"] = index
+    arrays.update(
+        (f"properties.{name}", array)
+        for name, array in _ragged((row[1] for row in items), np.int32).items()
+    )
+    for position, (name, (_, dtype)) in enumerate(COLUMNS.items(), start=2):
+        arrays[name] = np.array([row[position] for row in items], dtype=dtype)
+    start = 2 + len(COLUMNS)
+    arrays.update(_translations("title", items, start, languages))
+    arrays.update(
+        _translations("description", items, start + len(languages), languages)
+    )
+    arrays["title.exists"] = np.array(
+        [row[-2] is not None for row in items], dtype=np.bool_
+    )
+    arrays["description.exists"] = np.array(
+        [row[-1] is not None for row in items], dtype=np.bool_
+    )
+
+    for kind, (effect, definition, description) in EFFECTS.items():
+        query = (
+            select(
+                effect.itemdefinition_id,
+                definition.id,
+                definition.actionId,
+                definition.areaShape,
+                definition.areaSize,
+                definition.params,
+                *(getattr(Text, language) for language in languages),
+                description.id,
+            )
+            .join(definition, definition.effect_id == effect.id)
+            .outerjoin(description, description.id == effect.id)
+            .outerjoin(Text, Text.id == description.textId)
+            .order_by(effect.itemdefinition_id, effect.id)
+        )
+        if ids is not None:
+            query = query.where(effect.itemdefinition_id.in_(ids))
+        effects = connection.execute(query).all()
+        owners = np.array([row[0] for row in effects], dtype=np.int64)
+        arrays[f"{kind}.offsets"] = np.searchsorted(
+            owners, np.concatenate((item_ids, [np.iinfo(np.int64).max]))
+        ).astype(np.int64)
+        arrays[f"{kind}.definitionId"] = np.array(
+            [row[1] for row in effects], dtype=np.int64
+        )
+        arrays[f"{kind}.actionId"] = np.array(
+            [row[2] for row in effects], dtype=np.int32
+        )
+        arrays[f"{kind}.areaShape"] = np.array(
+            [row[3] for row in effects], dtype=np.int32
+        )
+        for field, position, dtype in (
+            ("areaSize", 4, np.int32),
+            ("params", 5, np.float64),
+        ):
+            ragged = _ragged((row[position] for row in effects), dtype)
+            arrays.update(
+                (f"{kind}.{field}.{name}", array) for name, array in ragged.items()
+            )
+        arrays.update(_translations(f"{kind}.description", effects, 6, languages))
+        arrays[f"{kind}.description.exists"] = np.array(
+            [row[-1] is not None for row in effects], dtype=np.bool_
+        )
+    return arrays
+
+
+def export_snapshot(
+    engine: Engine,
+    path: str | Path,
+    version: str,
+    languages: tuple[str, ...] = LANGUAGES,
+) -> None:
+    """
+    Writes a binary snapshot of the items, to be memory-mapped by `Snapshot`.
+    Only the texts in `languages` are exported, e.g. `("fr",)` for a service
+    running in a single language. See `snapshot_arrays` for the layout.
+    """
+    with engine.connect() as connection:
+        arrays = snapshot_arrays(connection, languages)
+    _write(Path(path), version, languages, arrays)
+
+
+def _write(
+    path: Path, version: str, languages: tuple[str, ...], arrays: dict[str, np.ndarray]
+) -> None:
+    """
+    Writes the arrays after a header made of `MAGIC`, the format version, the
+    header length and a JSON table of contents, through a temporary file.
+    """
+    contents = {}
+    offset = 0
+    for name, array in arrays.items():
+        contents[name] = [array.dtype.str, list(array.shape), offset]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps(
+        {
+            "version": version,
+            "languages": list(languages),
+            "count": len(arrays["ids"]),
+            "arrays": contents,
+        }
+    ).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temporary_path = path.with_name(f".{path.name}.tmp")
+    with temporary_path.open("wb") as file:
+        file.write(MAGIC)
+        file.write(np.array([FORMAT_VERSION, len(header)], dtype="<u4").tobytes())
+        file.write(header)
+        for name, array in arrays.items():
+            file.seek(data_start + contents[name][2])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(data_start + offset)
+    os.replace(temporary_path, path)
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot written by `export_snapshot`. The file is
+    memory-mapped: arrays are zero-copy views over it, so the processes
+    reading the same snapshot share its pages.
+
+        snapshot = Snapshot("database.snapshot")
+        snapshot.title(2021, "en")
+        snapshot.item(2021)
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[: len(MAGIC)] != MAGIC:
+            msg = f"{path} is not a snapshot file."
+            raise ValueError(msg)
+        format_version, header_length = np.frombuffer(
+            self.buffer, dtype="<u4", count=2, offset=len(MAGIC)
+        ).tolist()
+        if format_version != FORMAT_VERSION:
+            msg = (
+                f"Unsupported snapshot format {format_version}, "
+                f"expected {FORMAT_VERSION}."
+            )
+            raise ValueError(msg)
+        header_start = len(MAGIC) + 8
+        header = json.loads(self.buffer[header_start : header_start + header_length])
+        data_start = -(-(header_start + header_length) // ALIGNMENT) * ALIGNMENT
+
+        self.version = header["version"]
+        self.languages = tuple(header["languages"])
+        self.arrays = {
+            name: np.ndarray(
+                shape,
+                dtype=np.dtype(dtype),
+                buffer=self.buffer,
+                offset=data_start + offset,
+            )
+            for name, (dtype, shape, offset) in header["arrays"].items()
+        }
+        self.ids = self.arrays["ids"]
+        self._index = self.arrays["index"]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict[str, np.ndarray],
+        languages: tuple[str, ...],
+        version: str | None = None,
+    ) -> "Snapshot":
+        """View of arrays held in memory, as returned by `snapshot_arrays`."""
+        snapshot = cls.__new__(cls)
+        snapshot.buffer = None
+        snapshot.version = version
+        snapshot.languages = tuple(languages)
+        snapshot.arrays = dict(arrays)
+        snapshot.ids = snapshot.arrays["ids"]
+        snapshot._index = snapshot.arrays["index"]
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: int) -> bool:
+        return 0 <= id < len(self._index) and self._index[id] >= 0
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Column of `COLUMNS`, in id order."""
+        return self.arrays[column]
+
+    def row(self, id: int) -> int:
+        """Row of an item in the columns."""
+        if id not in self:
+            raise KeyError(f"Item {id} is not in the snapshot.")
+        return int(self._index[id])
+
+    def _string(self, prefix: str, row: int) -> str | None:
+        if not self.arrays[f"{prefix}.present"][row]:
+            return None
+        offsets = self.arrays[f"{prefix}.offsets"]
+        data = self.arrays[f"{prefix}.data"]
+        return bytes(data[offsets[row] : offsets[row + 1]]).decode()
+
+    def _list(self, prefix: str, row: int) -> list:
+        offsets = self.arrays[f"{prefix}.offsets"]
+        return self.arrays[f"{prefix}.values"][offsets[row] : offsets[row + 1]].tolist()
+
+    def _translations(
+        self, prefix: str, row: int, languages: tuple[str, ...]
+    ) -> dict[str, str | None]:
+        return {
+            language: self._string(f"{prefix}.{language}", row)
+            for language in languages
+        }
+
+    def title(self, id: int, language: str = "fr") -> str | None:
+        """Title of an item in a language."""
+        return self._string(f"title.{language}", self.row(id))
+
+    def description(self, id: int, language: str = "fr") -> str | None:
+        """Description of an item in a language."""
+        return self._string(f"description.{language}", self.row(id))
+
+    def effects(
+        self,
+        id: int,
+        kind: str = "equipEffects",
+        languages: tuple[str, ...] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Effects of an item (`useEffects`, `useCriticalEffects` or `equipEffects`)."""
+        languages = languages or self.languages
+        offsets = self.arrays[f"{kind}.offsets"]
+        row = self.row(id)
+        effects = []
+        for effect in range(offsets[row], offsets[row + 1]):
+            data = {
+                "definition": {
+                    "id": int(self.arrays[f"{kind}.definitionId"][effect]),
+                    "actionId": int(self.arrays[f"{kind}.actionId"][effect]),
+                    "areaShape": int(self.arrays[f"{kind}.areaShape"][effect]),
+                    "areaSize": self._list(f"{kind}.areaSize", effect),
+                    "params": self._list(f"{kind}.params", effect),
+                }
+            }
+            if self.arrays[f"{kind}.description.exists"][effect]:
+                data["description"] = self._translations(
+                    f"{kind}.description", effect, languages
+                )
+            effects.append({"effect": data})
+        return effects
+
+    def item(self, id: int, languages: tuple[str, ...] | None = None) -> dict[str, Any]:
+        """
+        Item in the layout of the Wakfu API, with its texts in `languages`.
+        Default is every language of the snapshot.
+        """
+        languages = languages or self.languages
+        row = self.row(id)
+        item = {
+            "id": id,
+            "level": int(self.arrays["level"][row]),
+            **{
+                name: {column: self.arrays[column][row].item() for column in columns}
+                for name, columns in PARAMETERS.items()
+            },
+            "properties": self._list("properties", row),
+        }
+        data = {
+            "definition": {
+                "item": item,
+                **{kind: self.effects(id, kind, languages) for kind in EFFECTS},
+            },
+        }
+        if self.arrays["title.exists"][row]:
+            data["title"] = self._translations("title", row, languages)
+        if self.arrays["description.exists"][row]:
+            data["description"] = self._translations("description", row, languages)
+        return data
+
+    def close(self) -> None:
+        """Releases the mapping; arrays must not be used afterwards. Idempotent."""
+        if self.ids is None:
+            return
+        self.arrays.clear()
+        self.ids = self._index = None
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+
+if __name__ == "__main__":
+    # Cold start and lookup benchmark: python -m ... path/to/database.snapshot
+    import sys
+    import time
+
+    start = time.perf_counter()
+    snapshot = Snapshot(sys.argv[1] if len(sys.argv) > 1 else SNAPSHOT_FILENAME)
+    print(f"open: {(time.perf_counter() - start) * 1000:.2f} ms")
+    start = time.perf_counter()
+    for id in snapshot.ids:
+        snapshot.item(int(id))
+    elapsed = time.perf_counter() - start
+    print(f"{len(snapshot)} items: {elapsed / len(snapshot) * 1e6:.1f} us per item")
@@ -0,0 +1,99 @@
+import codecs
+import json
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 16
+"""Number of bytes read at once from a file or an HTTP body."""
+
+_WHITESPACE = " \t\n\r"
+
+_NUMBER = "0123456789+-.eE"
+
+
+def _truncated(element: Any, rest: str) -> bool:
+    """Whether a number decoded from a buffer may continue past it, e.g. `1.` or `1e`."""
+    return (
+        isinstance(element, (int, float))
+        and not isinstance(element, bool)
+        and all(character in _NUMBER for character in rest)
+    )
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yields the elements of a JSON array one at a time from a stream of UTF-8
+    encoded chunks, so that only the element being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer, position, exhausted = "", 0, False
+
+    def fill() -> bool:
+        """Appends the next chunk to the buffer. Returns False at end of stream."""
+        nonlocal buffer, position, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[position:] + utf8.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + utf8.decode(chunk)
+        position = 0
+        return not exhausted
+
+    def skip(characters: str) -> str:
+        """Skips the given characters and returns the next one ("" at end of stream)."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
+
+    if skip(_WHITESPACE) != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, position)
+    position += 1
+    if skip(_WHITESPACE) == "]":
+        return
+
+    while True:
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                fill()
+                continue
+            # A value touching the end of the buffer, or a number followed by
+            # what could be its continuation, may be truncated.
+            if exhausted or not (
+                end == len(buffer) or _truncated(element, buffer[end:])
+            ):
+                break
+            fill()
+        position = end
+        yield element
+
+        separator = skip(_WHITESPACE)
+        if separator == "]":
+            return
+        if separator != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+        position += 1
+        skip(_WHITESPACE)
+
+
+def iter_file_chunks(path: str | Path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yields the content of a file chunk by chunk."""
+    with Path(path).open("rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def stream_json_file(path: str | Path) -> Iterator[Any]:
+    """Yields the elements of a JSON array stored in a file one at a time."""
+    return iter_json_array(iter_file_chunks(path))
@@ -0,0 +1,388 @@
+import json
+import random
+from pathlib import Path
+from typing import Any
+from wakfu_items_api.categories import Categories
+from wakfu_items_api.database.texts import LANGUAGES
+
+POSITIONS = (
+    "HEAD",
+    "NECK",
+    "CHEST",
+    "LEFT_HAND",
+    "RIGHT_HAND",
+    "BACK",
+    "SHOULDERS",
+    "BELT",
+    "LEGS",
+    "FIRST_WEAPON",
+    "SECOND_WEAPON",
+    "ACCESSORY",
+    "PET",
+    "MOUNT",
+)
+"""Equipment positions of the item types."""
+
+WORDS = (
+    "Épée",
+    "Cape",
+    "Amulette",
+    "Bottes",
+    "Anneau",
+    "Bouclier",
+    "Ceinture",
+    "Coiffe",
+    "Dofus",
+    "Bâton",
+    "Dague",
+    "Arc",
+    "royale",
+    "du Bouftou",
+    "ancestrale",
+    "de Sadida",
+    "du Tofu",
+    "glacée",
+    "écarlate",
+    "d'Ogrest",
+)
+"""Words the synthetic names are made of."""
+
+ACTIONS = 250
+"""Number of actions (effect types)."""
+
+ITEM_TYPES = 200
+"""Number of item types, the first ones being equipment types."""
+
+EFFECT_DESCRIPTIONS = 400
+"""Number of distinct effect description templates, shared between effects."""
+
+
+class SyntheticData:
+    """
+    Deterministic generator of Wakfu API payloads with the layout of the CDN
+    files, for every category of `Categories`. The size of the other
+    categories scales with the number of items.
+
+    Args:
+        items: Number of items.
+        equip_effects: Inclusive range of the number of equip effects per item.
+        use_effects: Inclusive range of the number of use effects (and of
+            critical use effects) per item.
+        description_rate: Share of the effects having a description.
+        seed: Seed of the random generator.
+    """
+
+    def __init__(
+        self,
+        items: int = 8000,
+        equip_effects: tuple[int, int] = (0, 10),
+        use_effects: tuple[int, int] = (0, 2),
+        description_rate: float = 0.3,
+        seed: int = 0,
+    ):
+        self.items = items
+        self.equip_effects = equip_effects
+        self.use_effects = use_effects
+        self.description_rate = description_rate
+        self.seed = seed
+
+    def generate(self) -> dict[str, list[Any]]:
+        """Returns the payload of every category, keyed by category name."""
+        rng = random.Random(self.seed)
+        self._effect_id = 0
+        self._effect_descriptions = [
+            self._translation(rng, f"[#1] effet {index}", words=2)
+            for index in range(EFFECT_DESCRIPTIONS)
+        ]
+        item_types = self._item_types(rng)
+        recipes, ingredients, results = self._recipes(rng)
+        resources = self._resources(rng)
+        return {
+            Categories.actions: self._actions(rng),
+            Categories.itemTypes: item_types,
+            Categories.equipmentItemTypes: [
+                item_type
+                for item_type in item_types
+                if item_type["definition"]["equipmentPositions"]
+            ],
+            Categories.itemProperties: [
+                {"id": id, "name": f"PROPERTY_{id}", "description": f"Propriété {id}"}
+                for id in range(1, 30)
+            ],
+            Categories.states: self._states(rng),
+            Categories.items: [self._item(rng, id) for id in range(1, self.items + 1)],
+            Categories.recipeCategories: self._recipe_categories(rng),
+            Categories.recipes: recipes,
+            Categories.recipeIngredients: ingredients,
+            Categories.recipeResults: results,
+            Categories.blueprints: [
+                {
+                    "blueprintId": 20000 + id,
+                    "recipeId": rng.sample(
+                        range(1, len(recipes) + 1), min(3, len(recipes))
+                    ),
+                }
+                for id in range(max(1, len(recipes) // 20))
+            ],
+            Categories.jobsItems: self._jobs_items(rng),
+            **resources,
+        }
+
+    def write(self, directory: str | Path, version: str) -> dict[str, Path]:
+        """
+        Writes the payloads as `{category}_{version}.json` files, as extracted
+        by `extract_all_files`. Returns their paths keyed by category.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for category, data in self.generate().items():
+            paths[category] = directory / f"{category}_{version}.json"
+            with paths[category].open("w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False)
+        return paths
+
+    @staticmethod
+    def _translation(rng: random.Random, prefix: str = "", words: int = 3) -> dict:
+        name = " ".join(rng.choice(WORDS) for _ in range(words))
+        return {language: f"{prefix} {name} ({language})" for language in LANGUAGES}
+
+    def _actions(self, rng: random.Random) -> list[dict]:
+        return [
+            {
+                "definition": {"id": id, "effect": f"Action {id}"},
+                "description": self._translation(rng, "[#1]", words=1),
+            }
+            for id in range(1, ACTIONS + 1)
+        ]
+
+    def _item_types(self, rng: random.Random) -> list[dict]:
+        item_types = []
+        for id in range(1, ITEM_TYPES + 1):
+            positions, disabled = [], []
+            if id <= len(POSITIONS):
+                positions = [POSITIONS[id - 1]]
+            elif id <= 2 * len(POSITIONS) and rng.random() < 0.5:
+                positions = ["FIRST_WEAPON"]
+                disabled = ["SECOND_WEAPON"]
+            item_types.append(
+                {
+                    "definition": {
+                        "id": id,
+                        "parentId": None if id < 10 else rng.randint(1, 9),
+                        "equipmentPositions": positions,
+                        "equipmentDisabledPositions": disabled,
+                        "isRecyclable": rng.random() < 0.5,
+                        "isVisibleInAnimation": bool(positions),
+                    },
+                    "title": self._translation(rng, words=1),
+                }
+            )
+        return item_types
+
+    def _states(self, rng: random.Random) -> list[dict]:
+        return [
+            {
+                "definition": {"id": id},
+                "title": self._translation(rng, "État"),
+                "description": self._translation(rng, "[#1]", words=6),
+            }
+            for id in range(1, max(2, self.items // 20))
+        ]
+
+    def _effects(self, rng: random.Random, counts: tuple[int, int]) -> list[dict]:
+        effects = []
+        for _ in range(rng.randint(*counts)):
+            self._effect_id += 1
+            effect = {
+                "definition": {
+                    "id": self._effect_id,
+                    "actionId": rng.randint(1, ACTIONS),
+                    "areaShape": 32767,
+                    "areaSize": [],
+                    "params": [
+                        float(rng.randint(1, 100)),
+                        round(rng.random(), 3),
+                        0.0,
+                        0.0,
+                    ],
+                }
+            }
+            if rng.random() < self.description_rate:
+                effect["description"] = rng.choice(self._effect_descriptions)
+            effects.append({"effect": effect})
+        return effects
+
+    def _item(self, rng: random.Random, id: int) -> dict:
+        item = {
+            "definition": {
+                "item": {
+                    "id": id,
+                    "level": rng.randint(1, 230),
+                    "baseParameters": {
+                        "itemTypeId": rng.randint(1, ITEM_TYPES),
+                        "itemSetId": rng.randint(0, self.items // 10),
+                        "rarity": rng.choice((0, 1, 2, 3, 4, 4, 5, 6, 7)),
+                        "bindType": rng.randint(0, 2),
+                        "minimumShardSlotNumber": 1,
+                        "maximumShardSlotNumber": 4,
+                    },
+                    "useParameters": {
+                        "useCostAp": rng.randint(0, 6),
+                        "useCostMp": 0,
+                        "useCostWp": 0,
+                        "useRangeMin": 0,
+                        "useRangeMax": rng.randint(0, 5),
+                        "useTestFreeCell": False,
+                        "useTestLos": rng.random() < 0.5,
+                        "useTestOnlyLine": False,
+                        "useTestNoBorderCell": False,
+                        "useWorldTarget": 0,
+                    },
+                    "graphicParameters": {"gfxId": id * 10, "femaleGfxId": id * 10},
+                    "properties": rng.sample(range(1, 30), rng.choice((0, 0, 0, 1))),
+                },
+                "useEffects": self._effects(rng, self.use_effects),
+                "useCriticalEffects": self._effects(rng, self.use_effects),
+                "equipEffects": self._effects(rng, self.equip_effects),
+            },
+            "title": self._translation(rng),
+        }
+        if rng.random() < 0.7:
+            item["description"] = self._translation(rng, words=12)
+        return item
+
+    def _recipe_categories(self, rng: random.Random) -> list[dict]:
+        return [
+            {
+                "definition": {
+                    "id": id,
+                    "isArchive": False,
+                    "isNoCraft": False,
+                    "isHidden": False,
+                    "xpFactor": 1,
+                    "isInnate": id == 1,
+                },
+                "title": self._translation(rng, "Métier", words=1),
+            }
+            for id in range(1, 16)
+        ]
+
+    def _recipes(self, rng: random.Random) -> tuple[list, list, list]:
+        """Recipes of a third of the items, from lower ids so that there is no cycle."""
+        recipes, ingredients, results = [], [], []
+        for item_id in rng.sample(range(2, self.items + 1), (self.items - 1) // 3):
+            recipe_id = len(recipes) + 1
+            recipes.append(
+                {
+                    "id": recipe_id,
+                    "categoryId": rng.randint(1, 15),
+                    "level": rng.randint(0, 230),
+                    "xpRatio": 100,
+                    "isUpgrade": False,
+                    "upgradeItemId": 0,
+                }
+            )
+            for order, ingredient in enumerate(
+                rng.sample(range(1, item_id), min(item_id - 1, rng.randint(1, 6)))
+            ):
+                ingredients.append(
+                    {
+                        "recipeId": recipe_id,
+                        "itemId": ingredient,
+                        "quantity": rng.randint(1, 20),
+                        "ingredientOrder": order,
+                    }
+                )
+            results.append(
+                {
+                    "recipeId": recipe_id,
+                    "productedItemId": item_id,
+                    "productedItemQuantity": rng.choice((1, 1, 1, 5)),
+                    "productOrder": 0,
+                }
+            )
+        return recipes, ingredients, results
+
+    def _jobs_items(self, rng: random.Random) -> list[dict]:
+        jobs_items = []
+        for id in range(1, self.items // 2 + 1):
+            job_item = {
+                "definition": {
+                    "id": id,
+                    "level": rng.randint(0, 230),
+                    "rarity": rng.randint(0, 5),
+                    "itemTypeId": rng.randint(1, ITEM_TYPES),
+                    "graphicParameters": {"gfxId": id, "femaleGfxId": id},
+                },
+                "title": self._translation(rng),
+            }
+            if rng.random() < 0.5:
+                job_item["description"] = self._translation(rng, words=8)
+            jobs_items.append(job_item)
+        return jobs_items
+
+    def _resources(self, rng: random.Random) -> dict[str, list[dict]]:
+        resource_types = [
+            {
+                "definition": {"id": id, "affectWakfu": id % 2 == 0},
+                "title": self._translation(rng, words=1),
+            }
+            for id in range(1, 9)
+        ]
+        resources = [
+            {
+                "definition": {
+                    "id": id,
+                    "resourceType": rng.randint(1, 8),
+                    "isBlocking": rng.random() < 0.5,
+                    "idealRainRangeMin": 0,
+                    "idealRainRangeMax": 10,
+                    "iconGfxId": id,
+                    "lastEvolutionStep": 4,
+                    "usableByHeroes": True,
+                },
+                "title": self._translation(rng, words=2),
+            }
+            for id in range(1, max(2, self.items // 20))
+        ]
+        collectible_resources = [
+            {
+                "id": id,
+                "skillId": rng.randint(60, 80),
+                "resourceId": rng.randint(1, len(resources)),
+                "resourceIndex": 0,
+                "resourceNextIndex": 1,
+                "skillLevelRequired": rng.randint(0, 230),
+                "collectItemId": rng.randint(1, self.items),
+                "collectLootListId": id,
+                "duration": 3000,
+            }
+            for id in range(1, len(resources) * 2)
+        ]
+        harvest_loots = [
+            {
+                "id": id,
+                "listId": rng.randint(1, len(collectible_resources)),
+                "itemId": rng.randint(1, self.items),
+                "dropRate": round(rng.random(), 3),
+            }
+            for id in range(1, len(collectible_resources) * 2)
+        ]
+        return {
+            Categories.resourceTypes: resource_types,
+            Categories.resources: resources,
+            Categories.collectibleResources: collectible_resources,
+            Categories.harvestLoots: harvest_loots,
+        }
+
+
+if __name__ == "__main__":
+    # Writes a synthetic data set: python -m ... path/to/directory [items] [version]
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    version = sys.argv[3] if len(sys.argv) > 3 else "0.0.0"
+    for category, path in SyntheticData(items=items).write(directory, version).items():
+        print(f"{category}: {path} ({path.stat().st_size} bytes)")
@@ -1,11 +1,18 @@
 import json
+import os
+import time
+from pathlib import Path
 import requests
+from wakfu_items_api.cache import DEFAULT_CACHE_DIRECTORY
 
 
 VERSION_ADRESS = "https://wakfu.cdn.ankama.com/gamedata/config.json"
 
+DEFAULT_VERSION_TTL = 3600
+"""Number of seconds during which a resolved version is reused from the disk cache."""
 
-def get_current_version() -> str:
+
+def fetch_current_version() -> str:
     """
     Fetches the current version of the game from the specified URL.
 
@@ -31,6 +38,80 @@ def get_current_version() -> str:
         raise SystemExit(msg)
 
 
+class VersionResolver:
+    """
+    Resolves the current version of the game.
+
+    The version is fetched at most once per process and is shared between
+    processes through a file in the cache directory, reused for `ttl` seconds.
+    A `pinned` version is returned as is, and in `offline` mode the last
+    version found in the cache directory is used whatever its age.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_VERSION_TTL,
+        cache_directory: str | Path = DEFAULT_CACHE_DIRECTORY,
+        pinned: str | None = None,
+        offline: bool = False,
+    ):
+        self.ttl = ttl
+        self.cache_path = Path(cache_directory) / "version.json"
+        self.pinned = pinned
+        self.offline = offline
+        self._version = None
+
+    def resolve(self) -> str:
+        """Returns the version of the game, fetching it only when needed."""
+        if self.pinned is not None:
+            return self.pinned
+        if self._version is None:
+            self._version = self._load() or self._fetch()
+        return self._version
+
+    def _load(self) -> str | None:
+        """Returns the version stored in the cache directory if it is still fresh."""
+        try:
+            with self.cache_path.open("r") as file:
+                cached = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cached = None
+
+        if self.offline:
+            if cached is None:
+                msg = f"No cached version found in {self.cache_path} (offline mode)."
+                raise SystemExit(msg)
+            return cached["version"]
+        if cached is None or time.time() - cached["fetched_at"] > self.ttl:
+            return None
+        return cached["version"]
+
+    def _fetch(self) -> str:
+        """Fetches the version and stores it in the cache directory."""
+        version = fetch_current_version()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.cache_path.with_name(f".{self.cache_path.name}.tmp")
+        with temporary_path.open("w") as file:
+            json.dump({"version": version, "fetched_at": time.time()}, file)
+        os.replace(temporary_path, self.cache_path)
+        return version
+
+
+DEFAULT_RESOLVER = VersionResolver()
+"""Resolver shared by the whole process."""
+
+
+def get_current_version() -> str:
+    """
+    Returns the current version of the game. The version is fetched at most
+    once per process, see `VersionResolver`.
+
+    Returns:
+        str: The current version of the game.
+    """
+    return DEFAULT_RESOLVER.resolve()
+
+
 if __name__ == "__main__":
     current_version = get_current_version()
     print(f"Current version: {current_version}")